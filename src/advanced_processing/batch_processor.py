@@ -8,13 +8,19 @@ import time
 import uuid
 import threading
 import queue
-from typing import List, Dict, Any, Optional, Union, Tuple, Callable, Generator
+import itertools
+from typing import List, Dict, Any, Optional, Union, Tuple, Callable, Generator, Iterable
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
 import multiprocessing
 from tqdm import tqdm
 import traceback
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 class BatchProcessor:
     """
     Advanced batch processing system for handling large volumes of data
@@ -108,6 +114,73 @@ class BatchProcessor:
         
         return job_id
     
+    def process_iterable(self, items: Iterable[Any], processor_func: Callable,
+                         job_name: str = None, use_tqdm: bool = True,
+                         chunk_size: int = None, **processor_kwargs) -> str:
+        """
+        Process any iterable of items in batches with parallel execution.
+        
+        Items are grouped into lists as they are read, so no DataFrame or other
+        full copy of the input is built. Chunks are read as workers free up,
+        with at most twice max_workers of them in flight, so a generator is
+        consumed as it is processed. Each chunk passed to processor_func is
+        a plain list of items.
+        
+        Args:
+            items (Iterable[Any]): Items to process, e.g. a list of dicts or a generator
+            processor_func (Callable): Function to process each chunk
+            job_name (str, optional): Name for this batch job
+            use_tqdm (bool): Whether to display progress bar
+            chunk_size (int, optional): Size of chunks, defaults to the processor's chunk size
+            **processor_kwargs: Additional arguments to pass to processor_func
+            
+        Returns:
+            str: Job ID for tracking the processing
+        """
+        if job_name is None:
+            job_name = f"iter_job_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        
+        if chunk_size is None:
+            chunk_size = self.chunk_size
+            
+        job_id = str(uuid.uuid4())
+        
+        # Total is only known up front for sized inputs; otherwise it is set
+        # once all chunks have been submitted
+        total_chunks = -(-len(items) // chunk_size) if hasattr(items, '__len__') else 0
+        
+        # Set up job tracking
+        with self._job_lock:
+            self.jobs[job_id] = {
+                'name': job_name,
+                'status': 'running',
+                'created_at': datetime.now().isoformat(),
+                'completed_chunks': 0,
+                'total_chunks': total_chunks,
+                'errors': [],
+                'results': [],
+                'progress': 0.0,
+                'processor': processor_func.__name__
+            }
+        
+        # Start processing in a separate thread
+        threading.Thread(
+            target=self._process_chunks,
+            args=(self._iter_chunks(items, chunk_size), processor_func, job_id, use_tqdm),
+            kwargs=processor_kwargs
+        ).start()
+        
+        return job_id
+    
+    def _iter_chunks(self, items: Iterable[Any], chunk_size: int) -> Generator[List[Any], None, None]:
+        """Lazily group items into lists of at most chunk_size"""
+        iterator = iter(items)
+        while True:
+            chunk = list(itertools.islice(iterator, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+    
     def process_file_batches(self, file_list: List[str], processor_func: Callable,
                              job_name: str = None, use_tqdm: bool = True,
                              **processor_kwargs) -> str:
@@ -158,13 +231,13 @@ class BatchProcessor:
         
         return job_id
     
-    def _process_chunks(self, chunks: List[pd.DataFrame], processor_func: Callable, 
+    def _process_chunks(self, chunks: Iterable[Any], processor_func: Callable, 
                        job_id: str, use_tqdm: bool, **processor_kwargs) -> None:
         """
-        Process DataFrame chunks in parallel.
+        Process chunks in parallel.
         
         Args:
-            chunks (List[pd.DataFrame]): List of DataFrame chunks
+            chunks (Iterable[Any]): DataFrame chunks or lists of items
             processor_func (Callable): Function to process each chunk
             job_id (str): ID of the batch job
             use_tqdm (bool): Whether to display progress bar
@@ -174,45 +247,75 @@ class BatchProcessor:
         results = []
         errors = []
         
+        # Chunks submitted at once; more are read from chunks as these complete,
+        # so only a bounded part of the input is held in memory
+        max_in_flight = self.max_workers * 2
+        
         try:
+            # Known up front for sized inputs, 0 until all chunks are read otherwise
+            with self._job_lock:
+                total_chunks = self.jobs[job_id]['total_chunks']
+            
+            # Setup progress tracking
+            if use_tqdm:
+                pbar = tqdm(total=total_chunks or None, desc=f"Processing {self.jobs[job_id]['name']}")
+            
             with executor_class(max_workers=self.max_workers) as executor:
-                # Submit all tasks
-                future_to_chunk = {
-                    executor.submit(processor_func, chunk, **processor_kwargs): i 
-                    for i, chunk in enumerate(chunks)
-                }
+                chunk_iter = enumerate(chunks)
+                future_to_chunk = {}
+                submitted = 0
+                exhausted = False
                 
-                # Setup progress tracking
-                if use_tqdm:
-                    pbar = tqdm(total=len(chunks), desc=f"Processing {self.jobs[job_id]['name']}")
-                
-                # Process results as they complete
-                for future in as_completed(future_to_chunk):
-                    chunk_idx = future_to_chunk[future]
-                    
-                    try:
-                        result = future.result()
-                        results.append((chunk_idx, result))
-                        self._result_queue.put(('chunk', job_id, chunk_idx, result, None))
-                    except Exception as exc:
-                        error_info = {
-                            'chunk_idx': chunk_idx,
-                            'error': str(exc),
-                            'traceback': traceback.format_exc()
-                        }
-                        errors.append(error_info)
-                        self._result_queue.put(('error', job_id, chunk_idx, None, error_info))
+                while True:
+                    # Top up the chunks in flight
+                    while not exhausted and len(future_to_chunk) < max_in_flight:
+                        try:
+                            i, chunk = next(chunk_iter)
+                        except StopIteration:
+                            exhausted = True
+                            if submitted != total_chunks:
+                                total_chunks = submitted
+                                with self._job_lock:
+                                    self.jobs[job_id]['total_chunks'] = total_chunks
+                                if use_tqdm:
+                                    pbar.total = total_chunks
+                                    pbar.refresh()
+                            break
+                        future_to_chunk[executor.submit(processor_func, chunk, **processor_kwargs)] = i
+                        submitted += 1
                     
-                    # Update progress
-                    with self._job_lock:
-                        self.jobs[job_id]['completed_chunks'] += 1
-                        self.jobs[job_id]['progress'] = self.jobs[job_id]['completed_chunks'] / len(chunks) * 100
+                    if not future_to_chunk:
+                        break
                     
-                    if use_tqdm:
-                        pbar.update(1)
-                
-                if use_tqdm:
-                    pbar.close()
+                    # Process results as they complete
+                    done, _ = wait(future_to_chunk, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        chunk_idx = future_to_chunk.pop(future)
+                        
+                        try:
+                            result = future.result()
+                            results.append((chunk_idx, result))
+                            self._result_queue.put(('chunk', job_id, chunk_idx, result, None))
+                        except Exception as exc:
+                            error_info = {
+                                'chunk_idx': chunk_idx,
+                                'error': str(exc),
+                                'traceback': traceback.format_exc()
+                            }
+                            errors.append(error_info)
+                            self._result_queue.put(('error', job_id, chunk_idx, None, error_info))
+                        
+                        # Update progress, once the total is known
+                        with self._job_lock:
+                            self.jobs[job_id]['completed_chunks'] += 1
+                            if total_chunks:
+                                self.jobs[job_id]['progress'] = self.jobs[job_id]['completed_chunks'] / total_chunks * 100
+                        
+                        if use_tqdm:
+                            pbar.update(1)
+            
+            if use_tqdm:
+                pbar.close()
         
         except Exception as exc:
             with self._job_lock:
@@ -475,8 +578,18 @@ class BatchProcessor:
             if format == 'json':
                 # For JSON, try to convert to serializable format
                 serializable_results = self._make_serializable(results)
-                with open(output_path, 'w') as f:
-                    json.dump(serializable_results, f, indent=2)
+                if orjson is not None:
+                    # DataFrame results keep their index as non-string keys,
+                    # which json.dump turned into strings as well
+                    with open(output_path, 'wb') as f:
+                        f.write(orjson.dumps(
+                            serializable_results,
+                            option=(orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY |
+                                    orjson.OPT_NON_STR_KEYS)
+                        ))
+                else:
+                    with open(output_path, 'w') as f:
+                        json.dump(serializable_results, f, indent=2)
             
             elif format in ('csv', 'xlsx'):
                 # For tabular formats, convert to DataFrame if needed
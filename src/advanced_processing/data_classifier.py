@@ -4,15 +4,54 @@ import numpy as np
 from typing import List, Dict, Any, Optional, Union, Tuple
 import logging
 from collections import defaultdict
+import random
 import re
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.cluster import KMeans
 from sklearn.preprocessing import StandardScaler
 import joblib
+import json
 import os
 from datetime import datetime
 
+# Characters stripped from strings before numeric conversion
+_NON_NUMERIC_RE = re.compile(r'[^\d.-]')
+
+# Placeholders in synthetic text templates, e.g. "{topic}"
+_PLACEHOLDER_RE = re.compile(r'\{(\w+)\}')
+
+# Simple templates for different text categories
+_TEXT_TEMPLATES = {
+    'article': "This is a detailed article about {topic}. It contains multiple paragraphs discussing various aspects of {topic}.",
+    'description': "A {adjective} {item} with {feature1} and {feature2}.",
+    'title': "{Heading}: {Subtitle}",
+    'name': "{Title} {FirstName} {LastName}",
+    'comment': "I {feeling} this {item}. It {opinion}.",
+    'address': "{number} {street}, {city}, {state} {zip}"
+}
+
+# Random content used to fill template placeholders
+_CONTENT_OPTIONS = {
+    'topic': ['technology', 'science', 'history', 'art', 'business', 'health'],
+    'adjective': ['red', 'large', 'modern', 'efficient', 'innovative', 'complex'],
+    'item': ['product', 'device', 'tool', 'application', 'solution', 'system'],
+    'feature1': ['high performance', 'low cost', 'easy setup', 'advanced features'],
+    'feature2': ['long battery life', 'compact design', 'fast processing', 'elegant interface'],
+    'heading': ['Introduction', 'Analysis', 'Overview', 'Guide', 'Review'],
+    'subtitle': ['Part 1', 'A New Approach', 'Key Insights', 'Future Directions'],
+    'title': ['Mr.', 'Ms.', 'Dr.', 'Prof.'],
+    'firstname': ['John', 'Jane', 'David', 'Sarah', 'Michael', 'Emily'],
+    'lastname': ['Smith', 'Johnson', 'Brown', 'Davis', 'Wilson', 'Lee'],
+    'feeling': ['like', 'love', 'appreciate', 'dislike', 'hate'],
+    'opinion': ['works well', 'saved me time', 'exceeded expectations', 'was disappointing'],
+    'number': ['123', '456', '789', '1011'],
+    'street': ['Main St', 'Park Ave', 'Oak Rd', 'Cedar Ln'],
+    'city': ['Springfield', 'Rivertown', 'Lakeside', 'Hillcrest'],
+    'state': ['CA', 'NY', 'TX', 'FL', 'IL'],
+    'zip': ['12345', '67890', '54321', '98765']
+}
+
 class DataClassifier:
     """
     Automated data classification system that uses machine learning
@@ -35,6 +74,9 @@ class DataClassifier:
         # Pre-defined classifiers
         self.classifiers = {}
         
+        # Seeded random generator for reproducible synthetic training data
+        self._random = random.Random(42)
+        
         # Feature extractors
         self.feature_extractors = {
             'text': self._extract_text_features,
@@ -96,39 +138,65 @@ class DataClassifier:
         
         return features
     
-    def _extract_numeric_features(self, values: List[Union[float, int, str]]) -> np.ndarray:
+    def _parse_numeric_values(self, values: List[Union[float, int, str]]) -> np.ndarray:
         """
-        Extract features from numeric data.
+        Convert a list of values to floats, using NaN for anything unparseable.
         
         Args:
             values (List[Union[float, int, str]]): List of numeric values
             
+        Returns:
+            np.ndarray: Float array with NaN for missing values
+        """
+        # Strip formatting from strings, then convert the whole column at once
+        cleaned = [
+            _NON_NUMERIC_RE.sub('', value) if isinstance(value, str)
+            else value if isinstance(value, (int, float))
+            else None
+            for value in values
+        ]
+        
+        return pd.to_numeric(pd.Series(cleaned, dtype=object), errors='coerce').to_numpy(dtype=float, copy=True)
+    
+    def _numeric_fill_value(self, numeric_array: np.ndarray) -> float:
+        """Get the value used to replace missing numeric values"""
+        finite = numeric_array[np.isfinite(numeric_array)]
+        
+        # A median of one record is meaningless, and an empty one is undefined
+        if len(numeric_array) <= 1 or len(finite) == 0:
+            return 0.0
+        
+        return float(np.median(finite))
+    
+    def _extract_numeric_features(self, values: Union[List[Union[float, int, str]], np.ndarray],
+                                  fill_value: Optional[float] = None) -> np.ndarray:
+        """
+        Extract features from numeric data.
+        
+        Args:
+            values (Union[List[Union[float, int, str]], np.ndarray]): List of numeric
+                values, or an array already returned by _parse_numeric_values
+            fill_value (float, optional): Replacement for missing values. Defaults to
+                the median of the values.
+            
         Returns:
             np.ndarray: Feature matrix
         """
-        # Convert strings to numeric if needed
-        numeric_values = []
-        for value in values:
-            if isinstance(value, (int, float)):
-                numeric_values.append(float(value))
-            elif isinstance(value, str):
-                try:
-                    numeric_values.append(float(re.sub(r'[^\d.-]', '', value)))
-                except ValueError:
-                    numeric_values.append(np.nan)
-            else:
-                numeric_values.append(np.nan)
+        if isinstance(values, np.ndarray):
+            numeric_array = values.astype(float)
+        else:
+            numeric_array = self._parse_numeric_values(values)
         
-        # Replace NaN with median
-        numeric_array = np.array(numeric_values)
-        median = np.nanmedian(numeric_array)
-        numeric_array = np.nan_to_num(numeric_array, nan=median)
+        # Replace missing values with the median
+        if fill_value is None:
+            fill_value = self._numeric_fill_value(numeric_array)
+        numeric_array[~np.isfinite(numeric_array)] = fill_value
         
         # Extract features: raw values, log values, is_integer
         features = np.zeros((len(numeric_array), 3))
         features[:, 0] = numeric_array
         features[:, 1] = np.log1p(np.abs(numeric_array))  # Log transform
-        features[:, 2] = np.array([float(v).is_integer() for v in numeric_array])
+        features[:, 2] = np.mod(numeric_array, 1) == 0
         
         # Normalize features
         scaler = StandardScaler()
@@ -167,6 +235,39 @@ class DataClassifier:
         
         return features
     
+    def _combine_features(self, all_features: List[np.ndarray], n_samples: int) -> np.ndarray:
+        """
+        Combine per-field feature blocks into a single float32 feature matrix.
+        
+        Args:
+            all_features (List[np.ndarray]): Feature matrices, one per field
+            n_samples (int): Expected number of rows in every block
+            
+        Returns:
+            np.ndarray: Feature matrix with the blocks side by side
+        """
+        # Make sure all feature arrays have the same number of samples
+        assert all(f.shape[0] == n_samples for f in all_features)
+        
+        # Fill a preallocated matrix instead of building one with np.hstack
+        total_cols = sum(f.shape[1] for f in all_features)
+        X = np.empty((n_samples, total_cols), dtype=np.float32)
+        
+        col = 0
+        for f in all_features:
+            X[:, col:col + f.shape[1]] = f
+            col += f.shape[1]
+        
+        return X
+    
+    def _prepare_X(self, X: np.ndarray) -> np.ndarray:
+        """
+        Convert a feature matrix to the C-contiguous float32 layout sklearn's
+        tree code works on, so it doesn't copy the input on every call.
+        This is a no-op when X already has that layout.
+        """
+        return np.ascontiguousarray(X, dtype=np.float32)
+    
     def train_classifier(self, data: List[Dict[str, Any]], category_field: str, 
                         feature_fields: List[str], classifier_name: str,
                         algorithm: str = 'random_forest') -> Dict[str, Any]:
@@ -207,32 +308,29 @@ class DataClassifier:
         
         # Extract features for each field
         all_features = []
+        feature_types = {}
+        numeric_medians = {}
         
         for field, values in feature_sets.items():
-            # Determine feature type
-            if all(isinstance(v, (int, float)) for v in values if v):
-                feature_type = 'numeric'
-            elif all(isinstance(v, str) for v in values if v):
-                feature_type = 'text'
-            else:
-                feature_type = 'mixed'
+            # Determine feature type once; it is reused for the metadata below
+            feature_type = self._detect_feature_type(values)
+            feature_types[field] = feature_type
             
             # Extract features
-            extractor = self.feature_extractors[feature_type]
-            field_features = extractor(values)
+            if feature_type == 'numeric':
+                # Keep the training median so classification can fill missing values with it
+                numeric_array = self._parse_numeric_values(values)
+                numeric_medians[field] = self._numeric_fill_value(numeric_array)
+                field_features = self._extract_numeric_features(numeric_array, numeric_medians[field])
+            else:
+                extractor = self.feature_extractors[feature_type]
+                field_features = extractor(values)
             
             all_features.append(field_features)
         
         # Combine features from all fields
         if all_features:
-            if len(all_features) == 1:
-                X = all_features[0]
-            else:
-                # Make sure all feature arrays have the same number of samples
-                assert all(f.shape[0] == len(categories) for f in all_features)
-                
-                # Concatenate along feature axis
-                X = np.hstack(all_features)
+            X = self._combine_features(all_features, len(categories))
         else:
             return {'error': 'Failed to extract features'}
         
@@ -241,13 +339,14 @@ class DataClassifier:
         
         # Train classifier based on selected algorithm
         if algorithm == 'random_forest':
-            clf = RandomForestClassifier(n_estimators=100, random_state=42)
+            # n_jobs=-1 builds the trees, and predicts with them, in parallel
+            clf = RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=-1)
         elif algorithm == 'kmeans':
             clf = KMeans(n_clusters=len(set(categories)), random_state=42)
         else:
             return {'error': f'Unsupported algorithm: {algorithm}'}
         
-        clf.fit(X, y)
+        clf.fit(self._prepare_X(X), y)
         
         # Save classifier and metadata
         model_path = os.path.join(self.model_dir, f"{classifier_name}.joblib")
@@ -257,7 +356,8 @@ class DataClassifier:
             'feature_fields': feature_fields,
             'category_field': category_field,
             'categories': list(set(categories)),
-            'feature_types': {field: self._detect_feature_type(feature_sets[field]) for field in feature_fields},
+            'feature_types': {field: feature_types[field] for field in feature_fields},
+            'numeric_medians': numeric_medians,
             'created_at': datetime.now().isoformat(),
             'sample_count': len(categories)
         }
@@ -265,6 +365,9 @@ class DataClassifier:
         # Save both classifier and metadata
         joblib.dump({'classifier': clf, 'metadata': metadata}, model_path)
         
+        # Save metadata separately so it can be listed without unpickling the model
+        self._save_metadata(classifier_name, metadata)
+        
         # Add to classifiers dictionary
         self.classifiers[classifier_name] = {
             'classifier': clf,
@@ -286,13 +389,61 @@ class DataClassifier:
         }
     
     def _detect_feature_type(self, values: List[Any]) -> str:
-        """Detect the type of features in a list of values"""
-        if all(isinstance(v, (int, float)) for v in values if v):
-            return 'numeric'
-        elif all(isinstance(v, str) for v in values if v):
-            return 'text'
-        else:
-            return 'mixed'
+        """Detect the type of features in a list of values in a single pass"""
+        has_numeric = False
+        has_text = False
+        
+        for v in values:
+            # Empty values don't say anything about the type
+            if not v:
+                continue
+            
+            if isinstance(v, (int, float)):
+                has_numeric = True
+            elif isinstance(v, str):
+                has_text = True
+            else:
+                return 'mixed'
+            
+            if has_numeric and has_text:
+                return 'mixed'
+        
+        return 'text' if has_text else 'numeric'
+    
+    def _metadata_path(self, classifier_name: str) -> str:
+        """Get the path of the sidecar metadata file for a classifier"""
+        return os.path.join(self.model_dir, f"{classifier_name}.meta.json")
+    
+    def _save_metadata(self, classifier_name: str, metadata: Dict[str, Any]) -> None:
+        """Write classifier metadata to its sidecar JSON file"""
+        try:
+            with open(self._metadata_path(classifier_name), 'w', encoding='utf-8') as f:
+                json.dump(metadata, f, indent=2, default=str)
+        except (OSError, TypeError) as e:
+            self.logger.warning(f"Error saving classifier metadata {classifier_name}: {e}")
+    
+    def _read_metadata(self, classifier_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Read classifier metadata without loading the model when possible.
+        
+        Falls back to loading the full model file for classifiers saved before
+        sidecar metadata existed, and writes the sidecar for next time.
+        """
+        metadata_path = self._metadata_path(classifier_name)
+        
+        if os.path.exists(metadata_path):
+            with open(metadata_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        
+        model_path = os.path.join(self.model_dir, f"{classifier_name}.joblib")
+        loaded_data = joblib.load(model_path)
+        
+        if isinstance(loaded_data, dict) and 'metadata' in loaded_data:
+            metadata = loaded_data['metadata']
+            self._save_metadata(classifier_name, metadata)
+            return metadata
+        
+        return None
     
     def load_classifier(self, classifier_name: str) -> bool:
         """
@@ -354,11 +505,9 @@ class DataClassifier:
                 if name not in self.classifiers:
                     try:
                         # Just load the metadata
-                        model_path = os.path.join(self.model_dir, filename)
-                        loaded_data = joblib.load(model_path)
+                        metadata = self._read_metadata(name)
                         
-                        if isinstance(loaded_data, dict) and 'metadata' in loaded_data:
-                            metadata = loaded_data['metadata']
+                        if metadata is not None:
                             result.append({
                                 'name': name,
                                 'algorithm': metadata.get('algorithm', 'unknown'),
@@ -373,25 +522,17 @@ class DataClassifier:
         
         return result
     
-    def classify(self, data: Dict[str, Any], classifier_name: str) -> Dict[str, Any]:
+    def _extract_record_features(self, data: Dict[str, Any], metadata: Dict[str, Any]) -> Optional[np.ndarray]:
         """
-        Classify a single data record.
+        Extract the feature vector of a single record.
         
         Args:
-            data (Dict[str, Any]): The data record to classify
-            classifier_name (str): Name of the classifier to use
+            data (Dict[str, Any]): The data record
+            metadata (Dict[str, Any]): Metadata of the classifier to extract features for
             
         Returns:
-            Dict[str, Any]: Classification results with probabilities
+            Optional[np.ndarray]: Feature matrix with one row, or None if there are no features
         """
-        if classifier_name not in self.classifiers:
-            if not self.load_classifier(classifier_name):
-                return {'error': f'Classifier not found: {classifier_name}'}
-        
-        classifier_data = self.classifiers[classifier_name]
-        clf = classifier_data['classifier']
-        metadata = classifier_data['metadata']
-        
         # Extract features based on classifier's feature fields
         feature_fields = metadata['feature_fields']
         all_features = []
@@ -409,89 +550,224 @@ class DataClassifier:
             
             # Determine feature type and extract features
             feature_type = metadata['feature_types'].get(field, self._detect_feature_type(values))
-            extractor = self.feature_extractors[feature_type]
-            field_features = extractor(values)
+            if feature_type == 'numeric':
+                fill_value = metadata.get('numeric_medians', {}).get(field)
+                field_features = self._extract_numeric_features(values, fill_value)
+            else:
+                extractor = self.feature_extractors[feature_type]
+                field_features = extractor(values)
             
             all_features.append(field_features)
         
-        # Combine features
-        if all_features:
-            if len(all_features) == 1:
-                X = all_features[0]
-            else:
-                # Ensure all feature arrays have the same number of samples (should be 1)
-                assert all(f.shape[0] == 1 for f in all_features)
-                X = np.hstack(all_features)
-        else:
-            return {'error': 'Failed to extract features'}
+        if not all_features:
+            return None
         
-        # Perform classification
+        return self._combine_features(all_features, 1)
+    
+    def _extract_features_batch(self, data_list: List[Dict[str, Any]], metadata: Dict[str, Any]) -> Optional[np.ndarray]:
+        """
+        Extract feature vectors for a list of records.
+        
+        Args:
+            data_list (List[Dict[str, Any]]): List of data records
+            metadata (Dict[str, Any]): Metadata of the classifier to extract features for
+            
+        Returns:
+            Optional[np.ndarray]: Feature matrix with one row per record, or None if there are no features
+        """
+        if not data_list or not metadata['feature_fields']:
+            return None
+        
+        return np.vstack([self._extract_record_features(data, metadata) for data in data_list])
+    
+    def _predict(self, clf: Any, X: np.ndarray, metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Run a classifier over a feature matrix.
+        
+        Args:
+            clf (Any): The trained classifier
+            X (np.ndarray): Feature matrix
+            metadata (Dict[str, Any]): Metadata of the classifier
+            
+        Returns:
+            List[Dict[str, Any]]: Classification results for each row of X
+        """
         algorithm = metadata.get('algorithm', 'random_forest')
+        X = self._prepare_X(X)
+        results = []
         
         if algorithm == 'random_forest':
-            # For RandomForest, we can get probability estimates
-            category = clf.predict(X)[0]
-            probabilities = clf.predict_proba(X)[0]
-            
-            # Map probabilities to category names
-            probability_map = {}
-            for i, prob in enumerate(probabilities):
-                category_name = clf.classes_[i]
-                probability_map[category_name] = float(prob)
-            
-            return {
-                'category': category,
-                'probabilities': probability_map,
-                'confidence': float(max(probabilities))
-            }
+            # For RandomForest, we can get probability estimates. The predicted
+            # category is the most probable class, so predict() isn't needed.
+            all_probabilities = clf.predict_proba(X)
+            categories = clf.classes_[all_probabilities.argmax(axis=1)]
             
-        elif algorithm == 'kmeans':
-            # For KMeans, we can get distance to cluster centers
-            cluster_idx = clf.predict(X)[0]
-            distances = clf.transform(X)[0]
+            for category, probabilities in zip(categories, all_probabilities):
+                # Map probabilities to category names
+                probability_map = {}
+                for i, prob in enumerate(probabilities):
+                    category_name = clf.classes_[i]
+                    probability_map[category_name] = float(prob)
+                
+                results.append({
+                    'category': category,
+                    'probabilities': probability_map,
+                    'confidence': float(max(probabilities))
+                })
             
-            # Convert cluster index to category name
+        elif algorithm == 'kmeans':
+            # For KMeans, we can get distance to cluster centers; the
+            # predicted cluster is the nearest one
+            all_distances = clf.transform(X)
+            cluster_indices = all_distances.argmin(axis=1)
             categories = metadata.get('categories', [])
-            if cluster_idx < len(categories):
-                category = categories[cluster_idx]
-            else:
-                category = f"cluster_{cluster_idx}"
             
-            # Calculate confidence based on distance
-            confidence = 1.0 / (1.0 + distances[cluster_idx])
-            
-            return {
-                'category': category,
-                'cluster_distances': {f"cluster_{i}": float(d) for i, d in enumerate(distances)},
-                'confidence': float(confidence)
-            }
+            for cluster_idx, distances in zip(cluster_indices, all_distances):
+                # Convert cluster index to category name
+                if cluster_idx < len(categories):
+                    category = categories[cluster_idx]
+                else:
+                    category = f"cluster_{cluster_idx}"
+                
+                # Calculate confidence based on distance
+                confidence = 1.0 / (1.0 + distances[cluster_idx])
+                
+                results.append({
+                    'category': category,
+                    'cluster_distances': {f"cluster_{i}": float(d) for i, d in enumerate(distances)},
+                    'confidence': float(confidence)
+                })
         
         else:
             # Generic classification without probabilities
-            category = clf.predict(X)[0]
-            return {
-                'category': category,
-                'confidence': 1.0
-            }
+            for category in clf.predict(X):
+                results.append({
+                    'category': category,
+                    'confidence': 1.0
+                })
+        
+        return results
     
-    def batch_classify(self, data_list: List[Dict[str, Any]], classifier_name: str) -> List[Dict[str, Any]]:
+    def classify(self, data: Dict[str, Any], classifier_name: str) -> Dict[str, Any]:
+        """
+        Classify a single data record.
+        
+        Args:
+            data (Dict[str, Any]): The data record to classify
+            classifier_name (str): Name of the classifier to use
+            
+        Returns:
+            Dict[str, Any]: Classification results with probabilities
+        """
+        if classifier_name not in self.classifiers:
+            if not self.load_classifier(classifier_name):
+                return {'error': f'Classifier not found: {classifier_name}'}
+        
+        classifier_data = self.classifiers[classifier_name]
+        clf = classifier_data['classifier']
+        metadata = classifier_data['metadata']
+        
+        X = self._extract_record_features(data, metadata)
+        if X is None:
+            return {'error': 'Failed to extract features'}
+        
+        # Perform classification
+        return self._predict(clf, X, metadata)[0]
+    
+    def batch_classify(self, data_list: List[Dict[str, Any]], classifier_name: str,
+                       n_jobs: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Classify a batch of data records.
         
+        Features are extracted for all records first (in parallel worker
+        processes when n_jobs is set) and the classifier is run once over
+        the whole batch.
+        
         Args:
             data_list (List[Dict[str, Any]]): List of data records to classify
             classifier_name (str): Name of the classifier to use
+            n_jobs (int, optional): Number of processes for feature extraction.
+                None or 1 extracts features in this process. Negative values
+                count back from the number of CPUs, as in joblib (-1 uses all);
+                0 raises a ValueError.
             
         Returns:
             List[Dict[str, Any]]: Classification results for each record
         """
-        results = []
+        if n_jobs == 0:
+            raise ValueError("n_jobs == 0 has no meaning")
+        n_jobs = 1 if n_jobs is None else joblib.effective_n_jobs(n_jobs)
+        
+        if not data_list:
+            return []
+        
+        if classifier_name not in self.classifiers:
+            if not self.load_classifier(classifier_name):
+                return [{'error': f'Classifier not found: {classifier_name}'} for _ in data_list]
+        
+        classifier_data = self.classifiers[classifier_name]
+        clf = classifier_data['classifier']
+        metadata = classifier_data['metadata']
+        
+        feature_fields = metadata['feature_fields']
+        if not feature_fields:
+            return [{'error': 'Failed to extract features'} for _ in data_list]
+        
+        # Records with identical feature values get identical results, so
+        # only classify each distinct record once
+        unique_records = []
+        unique_index = {}
+        record_positions = []
         
         for data in data_list:
-            result = self.classify(data, classifier_name)
-            results.append(result)
+            key = self._record_key(data, feature_fields)
+            position = unique_index.get(key)
+            if position is None:
+                position = len(unique_records)
+                unique_index[key] = position
+                unique_records.append(data)
+            record_positions.append(position)
+        
+        if n_jobs == 1 or len(unique_records) == 1:
+            X = self._extract_features_batch(unique_records, metadata)
+        else:
+            # Split records into one chunk per worker
+            chunk_size = -(-len(unique_records) // n_jobs)
+            chunks = [unique_records[i:i + chunk_size] for i in range(0, len(unique_records), chunk_size)]
+            
+            blocks = joblib.Parallel(n_jobs=n_jobs, backend='loky')(
+                joblib.delayed(_extract_features_worker)(self.model_dir, chunk, metadata)
+                for chunk in chunks
+            )
+            X = np.vstack(blocks)
+        
+        unique_results = self._predict(clf, X, metadata)
+        
+        # Give every record its own copy of the result, including the nested
+        # probabilities or cluster distances
+        return [{key: dict(value) if isinstance(value, dict) else value
+                 for key, value in unique_results[position].items()}
+                for position in record_positions]
+    
+    def _record_key(self, data: Dict[str, Any], feature_fields: List[str]) -> Tuple:
+        """Build a hashable key from the feature values of a record"""
+        key = []
         
-        return results
+        for field in feature_fields:
+            if field not in data:
+                key.append((field, None, None))
+                continue
+            
+            value = data[field]
+            try:
+                hash(value)
+            except TypeError:
+                value = repr(value)
+            
+            # Include the type: 1, 1.0 and True hash alike but yield different features
+            key.append((field, type(data[field]), value))
+        
+        return tuple(key)
     
     def create_default_classifier(self, data_type: str, sample_data: List[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
@@ -544,10 +820,11 @@ class DataClassifier:
             for category in categories:
                 # Generate 10 samples per category
                 for i in range(10):
+                    sample = self._generate_text_sample(category)
                     synthetic_data.append({
                         'category': category,
-                        'text': self._generate_text_sample(category),
-                        'length': len(self._generate_text_sample(category))
+                        'text': sample,
+                        'length': len(sample)
                     })
         
         elif data_type == 'person':
@@ -576,55 +853,29 @@ class DataClassifier:
     
     def _generate_text_sample(self, category: str) -> str:
         """Generate synthetic text sample for a category"""
-        # Simple templates for different text categories
-        templates = {
-            'article': "This is a detailed article about {topic}. It contains multiple paragraphs discussing various aspects of {topic}.",
-            'description': "A {adjective} {item} with {feature1} and {feature2}.",
-            'title': "{Topic}: {Subtitle}",
-            'name': "{Title} {FirstName} {LastName}",
-            'comment': "I {feeling} this {item}. It {opinion}.",
-            'address': "{number} {street}, {city}, {state} {zip}"
-        }
+        template = _TEXT_TEMPLATES.get(category)
         
-        # Fill templates with random content
-        if category in templates:
-            template = templates[category]
-            
-            # Replace placeholders with random content
-            for placeholder in re.findall(r'\{(\w+)\}', template):
-                replacement = self._get_random_content(placeholder.lower())
-                template = template.replace(f"{{{placeholder}}}", replacement)
-            
-            return template
-        else:
+        if template is None:
             return f"Sample text for {category} category"
+        
+        # Replace placeholders with random content, reusing the same value
+        # for repeated placeholders
+        chosen = {}
+        
+        def fill(match):
+            placeholder = match.group(1)
+            if placeholder not in chosen:
+                chosen[placeholder] = self._get_random_content(placeholder.lower())
+            return chosen[placeholder]
+        
+        return _PLACEHOLDER_RE.sub(fill, template)
     
     def _get_random_content(self, content_type: str) -> str:
         """Get random content for synthetic data generation"""
-        content_options = {
-            'topic': ['technology', 'science', 'history', 'art', 'business', 'health'],
-            'adjective': ['red', 'large', 'modern', 'efficient', 'innovative', 'complex'],
-            'item': ['product', 'device', 'tool', 'application', 'solution', 'system'],
-            'feature1': ['high performance', 'low cost', 'easy setup', 'advanced features'],
-            'feature2': ['long battery life', 'compact design', 'fast processing', 'elegant interface'],
-            'topic': ['Introduction', 'Analysis', 'Overview', 'Guide', 'Review'],
-            'subtitle': ['Part 1', 'A New Approach', 'Key Insights', 'Future Directions'],
-            'title': ['Mr.', 'Ms.', 'Dr.', 'Prof.'],
-            'firstname': ['John', 'Jane', 'David', 'Sarah', 'Michael', 'Emily'],
-            'lastname': ['Smith', 'Johnson', 'Brown', 'Davis', 'Wilson', 'Lee'],
-            'feeling': ['like', 'love', 'appreciate', 'dislike', 'hate'],
-            'opinion': ['works well', 'saved me time', 'exceeded expectations', 'was disappointing'],
-            'number': ['123', '456', '789', '1011'],
-            'street': ['Main St', 'Park Ave', 'Oak Rd', 'Cedar Ln'],
-            'city': ['Springfield', 'Rivertown', 'Lakeside', 'Hillcrest'],
-            'state': ['CA', 'NY', 'TX', 'FL', 'IL'],
-            'zip': ['12345', '67890', '54321', '98765']
-        }
+        options = _CONTENT_OPTIONS.get(content_type)
         
-        if content_type in content_options:
-            import random
-            options = content_options[content_type]
-            return random.choice(options)
+        if options:
+            return self._random.choice(options)
         else:
             return content_type.title()
     
@@ -727,3 +978,13 @@ class DataClassifier:
             'low_confidence_count': len(low_confidence_entries),
             'top_categories': sorted(category_counts.items(), key=lambda x: x[1], reverse=True)[:3]
         }
+
+
+def _extract_features_worker(model_dir: str, data_list: List[Dict[str, Any]],
+                             metadata: Dict[str, Any]) -> np.ndarray:
+    """
+    Extract features for a chunk of records in a worker process.
+    
+    Uses a fresh classifier so trained models are not sent to the worker.
+    """
+    return DataClassifier(model_dir)._extract_features_batch(data_list, metadata)
@@ -1,16 +1,151 @@
 # src/advanced_processing/manager.py
 import os
+import asyncio
+import copy
+import functools
+import hashlib
 import logging
+import re
+import sys
+import threading
+from collections import OrderedDict
 import pandas as pd
+import numpy as np
 import json
 from typing import List, Dict, Any, Optional, Union, Tuple, Callable
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import numba
+except ImportError:
+    numba = None
 
 from .ai_extractor import AIExtractor
 from .pattern_recognizer import PatternRecognizer
 from .data_classifier import DataClassifier
 from .batch_processor import BatchProcessor
 
+# Patterns used when analyzing document structure and tables, compiled once
+# Markdown ("## Title") or numbered ("1.2 Title") heading, told apart by lastgroup
+_RE_HEADING = re.compile(r'(?P<md>#{1,6})\s+|(?P<num>[0-9]+\.[0-9]*\s+[A-Z])')
+# Classifies a table line in one scan; lastgroup is the row format. The
+# order matches the format precedence (pipe, tab, aligned), and 'sep' only
+# wins for separator lines that are not rows themselves. A run of 2+ spaces
+# before/after text exists exactly when two spaces directly border text.
+_ALIGNED_ROW = r'(?P<aligned>(?=.*?\s\s\S)(?=.*?\S\s\s))'
+_SEPARATOR_ROW = r'(?P<sep>[\s\-+|]+$)'
+_RE_TABLE_ROW = re.compile(
+    r'(?P<pipe>[^|]*\|[^|]*\|)'
+    r'|(?P<tab>[^\t]*\t[^\t]*\t)'
+    r'|' + _ALIGNED_ROW + r'|' + _SEPARATOR_ROW
+)
+# Same classification for lines without pipes or tabs
+_RE_SPACED_ROW = re.compile(_ALIGNED_ROW + r'|' + _SEPARATOR_ROW)
+_RE_MD_SEPARATOR = re.compile(r'^\s*\|[\s\-+:]+\|\s*$')
+
+# Code points matched by \s (the same set str.isspace() accepts)
+_WHITESPACE_CODES = np.array([c for c in range(0x3001) if chr(c).isspace()], dtype=np.uint32)
+# Lookup table over the same code points for the compiled scan below
+_IS_WHITESPACE = np.zeros(0x3001, dtype=bool)
+_IS_WHITESPACE[_WHITESPACE_CODES] = True
+
+
+def _call_safely(func: Callable, *args) -> Any:
+    """Call func, returning an error result instead of raising"""
+    try:
+        return func(*args)
+    except Exception as e:
+        return {'error': str(e)}
+
+
+def _scan_multispace_starts(codes: np.ndarray, is_whitespace: np.ndarray, starts: np.ndarray) -> None:
+    """Set starts[i] where a run of two or more whitespace code points starts in codes"""
+    n = codes.shape[0]
+    table_size = is_whitespace.shape[0]
+    i = 0
+    while i < n - 1:
+        if (codes[i] < table_size and is_whitespace[codes[i]]
+                and codes[i + 1] < table_size and is_whitespace[codes[i + 1]]):
+            starts[i] = True
+            # Skip the rest of the run
+            i += 2
+            while i < n and codes[i] < table_size and is_whitespace[codes[i]]:
+                i += 1
+        else:
+            i += 1
+
+
+# With numba installed the scan is compiled to a single pass over the line;
+# without it the vectorized NumPy version below is used
+if numba is not None:
+    _scan_multispace_starts = numba.njit(cache=True)(_scan_multispace_starts)
+
+
+def _multispace_starts(line: str) -> np.ndarray:
+    """Positions where a run of two or more whitespace characters starts, as in \\s{2,}"""
+    codes = np.frombuffer(line.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+    
+    if numba is not None:
+        starts = np.zeros(len(codes), dtype=bool)
+        _scan_multispace_starts(codes, _IS_WHITESPACE, starts)
+        return np.flatnonzero(starts)
+    
+    is_space = np.isin(codes, _WHITESPACE_CODES)
+    
+    # A run starts at a space not preceded by a space and followed by one
+    starts = is_space.copy()
+    starts[1:] &= ~is_space[:-1]
+    starts[:-1] &= is_space[1:]
+    starts[-1:] = False
+    
+    return np.flatnonzero(starts)
+
+
+def _split_pipe_row(line: str) -> List[str]:
+    """
+    Split a stripped pipe-delimited line into stripped cells.
+    
+    The empty cells before a leading '|' and after a trailing '|' are dropped
+    by slicing the split result once rather than rebuilding the list.
+    """
+    cells = line.split('|')
+    # The line is stripped, so only an outer '|' leaves an empty edge cell
+    start = 1 if not cells[0] else 0
+    end = len(cells) - 1 if not cells[-1] else len(cells)
+    return list(map(str.strip, cells[start:end]))
+
+
+class _Section:
+    """Document section collected by analyze_document_structure"""
+    
+    __slots__ = ('title', 'level', 'start_line', 'end_line', 'lines')
+    
+    def __init__(self, title: str = '', level: int = 0, start_line: Optional[int] = None):
+        self.title = title
+        self.level = level
+        self.start_line = start_line
+        self.end_line = start_line
+        self.lines = []
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the section dict returned to callers"""
+        section = {
+            'title': self.title,
+            'content': '\n'.join(self.lines),
+            'level': self.level
+        }
+        if self.start_line is not None:
+            section['start_line'] = self.start_line
+        section['end_line'] = self.end_line
+        return section
+
+
 class AdvancedProcessingManager:
     """
     Integration manager for advanced processing capabilities.
@@ -26,12 +161,14 @@ class AdvancedProcessingManager:
             config_path (str, optional): Path to configuration file
         """
         self.logger = logging.getLogger(__name__)
+        self.config_path = config_path
         
         # Load configuration if provided
         self.config = {}
         if config_path and os.path.exists(config_path):
-            with open(config_path, 'r') as f:
-                self.config = json.load(f)
+            with open(config_path, 'rb') as f:
+                config_data = f.read()
+            self.config = orjson.loads(config_data) if orjson is not None else json.loads(config_data)
         
         # Initialize components with configuration
         ai_config = self.config.get('ai_extractor', {})
@@ -61,11 +198,24 @@ class AdvancedProcessingManager:
             log_dir=batch_config.get('log_dir', './logs')
         )
         
+        # Threads used for per-row extraction within a DataFrame chunk
+        self._row_workers = batch_config.get('row_workers', os.cpu_count() or 1)
+        
+        # LRU cache of AI extraction results for repeated texts. Pattern results
+        # aren't cached here: the recognizer caches them itself, invalidates
+        # them when its patterns change and records every call in its history.
+        cache_config = self.config.get('cache', {})
+        self._cache_enabled = cache_config.get('enabled', True)
+        self._cache_size = cache_config.get('max_size', 4096)
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
         self.logger.info("Advanced Processing Manager initialized")
     
     def process_text_content(self, text: str, extract_entities: bool = True, 
                            extract_patterns: bool = True, custom_patterns: Optional[Dict] = None,
-                           classify: bool = False, classifier_name: Optional[str] = None) -> Dict[str, Any]:
+                           classify: bool = False, classifier_name: Optional[str] = None,
+                           analyze_structure: bool = False, find_tables: bool = False) -> Dict[str, Any]:
         """
         Process text content with multiple extraction methods.
         
@@ -76,36 +226,89 @@ class AdvancedProcessingManager:
             custom_patterns (Dict, optional): Custom patterns for recognition
             classify (bool): Whether to classify the text
             classifier_name (str, optional): Name of classifier to use
+            analyze_structure (bool): Whether to analyze the document structure
+            find_tables (bool): Whether to identify data tables
+            
+        Returns:
+            Dict[str, Any]: Processing results
+        """
+        ai_results = self._extract_ai_results(text) if extract_entities else None
+        pattern_results = self._recognize_text_patterns(text, custom_patterns) if extract_patterns else None
+        
+        results = self._combine_text_results(text, ai_results, pattern_results, classify, classifier_name)
+        results.update(self._analyze_layout(text, analyze_structure, find_tables))
+        return results
+    
+    async def process_text_content_async(self, text: str, extract_entities: bool = True,
+                                         extract_patterns: bool = True, custom_patterns: Optional[Dict] = None,
+                                         classify: bool = False, classifier_name: Optional[str] = None,
+                                         analyze_structure: bool = False, find_tables: bool = False) -> Dict[str, Any]:
+        """
+        Process text content like process_text_content, running AI extraction
+        and pattern recognition concurrently in worker threads.
+        
+        Args:
+            text (str): Text content to process
+            extract_entities (bool): Whether to extract named entities
+            extract_patterns (bool): Whether to recognize patterns
+            custom_patterns (Dict, optional): Custom patterns for recognition
+            classify (bool): Whether to classify the text
+            classifier_name (str, optional): Name of classifier to use
+            analyze_structure (bool): Whether to analyze the document structure
+            find_tables (bool): Whether to identify data tables
             
         Returns:
             Dict[str, Any]: Processing results
         """
+        loop = asyncio.get_running_loop()
+        
+        async def skipped():
+            return None
+        
+        ai_task = loop.run_in_executor(None, self._extract_ai_results, text) if extract_entities else skipped()
+        pattern_task = (loop.run_in_executor(None, self._recognize_text_patterns, text, custom_patterns)
+                        if extract_patterns else skipped())
+        ai_results, pattern_results = await asyncio.gather(ai_task, pattern_task)
+        
+        results = self._combine_text_results(text, ai_results, pattern_results, classify, classifier_name)
+        results.update(await loop.run_in_executor(None, self._analyze_layout, text, analyze_structure, find_tables))
+        return results
+    
+    def _extract_ai_results(self, text: str) -> Dict[str, Any]:
+        """Extract entities and information from text using AI"""
+        return self._cached('ai_extraction', text, lambda: self.ai_extractor.process_document(
+            text=text,
+            extract_topics=True,
+            extract_entities=True,
+            extract_key_phrases=True,
+            extract_relationships=True,
+            classify=True
+        ))
+    
+    def _recognize_text_patterns(self, text: str, custom_patterns: Optional[Dict] = None) -> Dict[str, Any]:
+        """Recognize patterns in text, including custom patterns if provided"""
+        pattern_results = self.pattern_recognizer.recognize_pattern(
+            text=text,
+            include_sensitive=False
+        )
+        
+        # If custom patterns are provided, extract them too
+        if custom_patterns:
+            custom_results = self.ai_extractor.extract_custom_entities(text, custom_patterns)
+            pattern_results['custom'] = custom_results
+        
+        return pattern_results
+    
+    def _combine_text_results(self, text: str, ai_results: Optional[Dict[str, Any]],
+                              pattern_results: Optional[Dict[str, Any]], classify: bool,
+                              classifier_name: Optional[str]) -> Dict[str, Any]:
+        """Combine extraction results and classify the text if requested"""
         results = {}
         
-        # Extract entities and information using AI
-        if extract_entities:
-            ai_results = self.ai_extractor.process_document(
-                text=text,
-                extract_topics=True,
-                extract_entities=True,
-                extract_key_phrases=True,
-                extract_relationships=True,
-                classify=True
-            )
+        if ai_results is not None:
             results['ai_extraction'] = ai_results
         
-        # Recognize patterns
-        if extract_patterns:
-            pattern_results = self.pattern_recognizer.recognize_pattern(
-                text=text,
-                include_sensitive=False
-            )
-            
-            # If custom patterns are provided, extract them too
-            if custom_patterns:
-                custom_results = self.ai_extractor.extract_custom_entities(text, custom_patterns)
-                pattern_results['custom'] = custom_results
-                
+        if pattern_results is not None:
             results['pattern_recognition'] = pattern_results
         
         # Classify text if requested
@@ -118,16 +321,16 @@ class AdvancedProcessingManager:
             }
             
             # Add recognized entities as features
-            if extract_entities and 'ai_extraction' in results:
-                entities = results['ai_extraction'].get('entities', {})
+            if ai_results is not None:
+                entities = ai_results.get('entities', {})
                 for entity_type, values in entities.items():
                     if values:
                         data[f'has_{entity_type.lower()}'] = True
                         data[f'{entity_type.lower()}_count'] = len(values)
             
             # Add recognized patterns as features
-            if extract_patterns and 'pattern_recognition' in results:
-                for pattern_type, matches in results['pattern_recognition'].items():
+            if pattern_results is not None:
+                for pattern_type, matches in pattern_results.items():
                     if matches:
                         data[f'has_{pattern_type.lower()}'] = True
                         data[f'{pattern_type.lower()}_count'] = len(matches)
@@ -138,6 +341,53 @@ class AdvancedProcessingManager:
         
         return results
     
+    def _analyze_layout(self, text: str, analyze_structure: bool, find_tables: bool) -> Dict[str, Any]:
+        """Analyze the document structure and data tables of text, as requested, splitting it into lines once"""
+        results = {}
+        if not (analyze_structure or find_tables):
+            return results
+        
+        lines = text.split('\n')
+        if analyze_structure:
+            results['document_structure'] = self.analyze_document_structure(text, _prepared_lines=lines)
+        if find_tables:
+            results['data_tables'] = self.identify_data_tables(text, _prepared_lines=lines)
+        
+        return results
+    
+    def _cached(self, kind: str, text: str, compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Get an extraction result from the LRU cache, computing it on a miss.
+        
+        Args:
+            kind (str): Type of extraction, part of the cache key
+            text (str): Text the extraction runs on
+            compute (Callable): Function computing the result on a cache miss
+            
+        Returns:
+            Dict[str, Any]: A deep copy of the result, safe for the caller to modify
+        """
+        if not self._cache_enabled:
+            return compute()
+        
+        # Keyed by a digest so the cache doesn't keep whole documents alive
+        key = (kind, hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest())
+        with self._cache_lock:
+            result = self._cache.get(key)
+            if result is not None:
+                self._cache.move_to_end(key)
+                return copy.deepcopy(result)
+        
+        result = compute()
+        
+        with self._cache_lock:
+            self._cache[key] = result
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        
+        return copy.deepcopy(result)
+    
     def batch_process_documents(self, documents: List[Dict[str, str]], 
                                processing_config: Dict[str, Any],
                                job_name: Optional[str] = None) -> str:
@@ -155,56 +405,10 @@ class AdvancedProcessingManager:
         if not job_name:
             job_name = f"doc_processing_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
-        # Create processor function
-        def document_processor(doc_batch, **kwargs):
-            results = []
-            
-            for doc in doc_batch:
-                # Get text content from document
-                text = doc.get('text', '')
-                if not text and 'content' in doc:
-                    text = doc['content']
-                
-                # Skip empty documents
-                if not text:
-                    results.append({
-                        'document_id': doc.get('id', 'unknown'),
-                        'error': 'No text content found'
-                    })
-                    continue
-                
-                # Process with configured options
-                try:
-                    doc_result = self.process_text_content(
-                        text=text,
-                        extract_entities=kwargs.get('extract_entities', True),
-                        extract_patterns=kwargs.get('extract_patterns', True),
-                        custom_patterns=kwargs.get('custom_patterns'),
-                        classify=kwargs.get('classify', False),
-                        classifier_name=kwargs.get('classifier_name')
-                    )
-                    
-                    # Add document identifiers to results
-                    doc_result['document_id'] = doc.get('id', 'unknown')
-                    doc_result['title'] = doc.get('title', '')
-                    doc_result['source'] = doc.get('source', '')
-                    
-                    results.append(doc_result)
-                except Exception as e:
-                    results.append({
-                        'document_id': doc.get('id', 'unknown'),
-                        'error': str(e)
-                    })
-            
-            return results
-        
-        # Convert documents to DataFrame for batch processing
-        df = pd.DataFrame(documents)
-        
-        # Start batch processing
-        job_id = self.batch_processor.process_dataframe(
-            df=df,
-            processor_func=document_processor,
+        # Start batch processing, handing documents over in chunks as they are
+        job_id = self.batch_processor.process_iterable(
+            items=documents,
+            processor_func=self._bind_processor(_document_processor),
             job_name=job_name,
             use_tqdm=True,
             **processing_config
@@ -212,6 +416,65 @@ class AdvancedProcessingManager:
         
         return job_id
     
+    async def _process_documents_async(self, doc_batch: List[Dict[str, Any]], **kwargs) -> List[Dict[str, Any]]:
+        """
+        Process a batch of documents concurrently, returning one result per document.
+        Documents with identical text are only processed once.
+        """
+        # Get text content from documents
+        texts = []
+        for doc in doc_batch:
+            text = doc.get('text', '')
+            if not text and 'content' in doc:
+                text = doc['content']
+            texts.append(text)
+        
+        # Process each distinct text with configured options
+        unique_texts = list(dict.fromkeys(text for text in texts if text))
+        text_results = await asyncio.gather(*(
+            self.process_text_content_async(
+                text=text,
+                extract_entities=kwargs.get('extract_entities', True),
+                extract_patterns=kwargs.get('extract_patterns', True),
+                custom_patterns=kwargs.get('custom_patterns'),
+                classify=kwargs.get('classify', False),
+                classifier_name=kwargs.get('classifier_name')
+            )
+            for text in unique_texts
+        ), return_exceptions=True)
+        results_by_text = dict(zip(unique_texts, text_results))
+        
+        results = []
+        for doc, text in zip(doc_batch, texts):
+            # Skip empty documents
+            if not text:
+                results.append({
+                    'document_id': doc.get('id', 'unknown'),
+                    'error': 'No text content found'
+                })
+                continue
+            
+            text_result = results_by_text[text]
+            if isinstance(text_result, Exception):
+                results.append({
+                    'document_id': doc.get('id', 'unknown'),
+                    'error': str(text_result)
+                })
+                continue
+            
+            # Add document identifiers to a copy of the shared text results
+            doc_result = dict(text_result)
+            doc_result['document_id'] = doc.get('id', 'unknown')
+            doc_result['title'] = doc.get('title', '')
+            # Batches usually come from a handful of sources, so share one
+            # string object per source across all results
+            source = doc.get('source', '')
+            doc_result['source'] = sys.intern(source) if type(source) is str else source
+            
+            results.append(doc_result)
+        
+        return results
+    
     def process_dataframe(self, df: pd.DataFrame, column_config: Dict[str, Any],
                           job_name: Optional[str] = None) -> str:
         """
@@ -228,86 +491,10 @@ class AdvancedProcessingManager:
         if not job_name:
             job_name = f"df_processing_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
-        # Create processor function
-        def dataframe_processor(df_chunk, **kwargs):
-            result_df = df_chunk.copy()
-            
-            # Process text columns
-            text_columns = kwargs.get('text_columns', [])
-            for col in text_columns:
-                if col not in df_chunk.columns:
-                    continue
-                
-                # Create new columns for extracted entities
-                if kwargs.get('extract_entities', False):
-                    # Process each row
-                    entities_list = []
-                    for text in df_chunk[col].fillna(''):
-                        if not text:
-                            entities_list.append({})
-                            continue
-                            
-                        # Extract entities
-                        try:
-                            entities = self.ai_extractor.extract_entities(text)
-                            entities_list.append(entities)
-                        except Exception as e:
-                            entities_list.append({'error': str(e)})
-                    
-                    # Add as new column
-                    result_df[f"{col}_entities"] = entities_list
-                
-                # Create new columns for pattern recognition
-                if kwargs.get('extract_patterns', False):
-                    # Process each row
-                    patterns_list = []
-                    for text in df_chunk[col].fillna(''):
-                        if not text:
-                            patterns_list.append({})
-                            continue
-                            
-                        # Recognize patterns
-                        try:
-                            patterns = self.pattern_recognizer.recognize_pattern(text)
-                            patterns_list.append(patterns)
-                        except Exception as e:
-                            patterns_list.append({'error': str(e)})
-                    
-                    # Add as new column
-                    result_df[f"{col}_patterns"] = patterns_list
-            
-            # Apply data classification if configured
-            if kwargs.get('classify', False) and kwargs.get('classifier_name'):
-                classifier_name = kwargs.get('classifier_name')
-                
-                # Prepare each row for classification
-                classifications = []
-                
-                for idx, row in df_chunk.iterrows():
-                    # Create a feature dictionary from the row
-                    data = {}
-                    feature_columns = kwargs.get('feature_columns', [])
-                    
-                    for fcol in feature_columns:
-                        if fcol in row:
-                            data[fcol] = row[fcol]
-                    
-                    # Perform classification
-                    try:
-                        classification = self.data_classifier.classify(data, classifier_name)
-                        classifications.append(classification)
-                    except Exception as e:
-                        classifications.append({'error': str(e)})
-                
-                # Add classification results
-                result_df['classification'] = classifications
-            
-            return result_df
-        
         # Start batch processing
         job_id = self.batch_processor.process_dataframe(
             df=df,
-            processor_func=dataframe_processor,
+            processor_func=self._bind_processor(_dataframe_processor),
             job_name=job_name,
             use_tqdm=True,
             **column_config
@@ -315,7 +502,107 @@ class AdvancedProcessingManager:
         
         return job_id
     
-    def analyze_document_structure(self, text: str) -> Dict[str, Any]:
+    def _bind_processor(self, processor_func: Callable) -> Callable:
+        """
+        Bind a module-level processor function to this manager for batch processing.
+        
+        Thread pools share this manager directly. Process pools can't pickle it
+        (it owns threads and locks), so workers get the config path instead and
+        build their own manager once per process.
+        """
+        if self.batch_processor.use_processes:
+            bound = functools.partial(processor_func, config_path=self.config_path)
+        else:
+            bound = functools.partial(processor_func, manager=self)
+        
+        return functools.update_wrapper(bound, processor_func)
+    
+    def _process_dataframe_chunk(self, df_chunk: pd.DataFrame, **kwargs) -> pd.DataFrame:
+        """Process the configured columns of a single DataFrame chunk"""
+        # Only new columns are added, so the existing column data can be
+        # shared with the input chunk instead of copied
+        result_df = df_chunk.copy(deep=False)
+        
+        # Process text columns
+        text_columns = kwargs.get('text_columns', [])
+        for col in text_columns:
+            if col not in df_chunk.columns:
+                continue
+            
+            texts = df_chunk[col].fillna('')
+            
+            # Create new columns for extracted entities
+            if kwargs.get('extract_entities', False):
+                result_df[f"{col}_entities"] = self._map_texts(texts, self._extract_value_entities)
+            
+            # Create new columns for pattern recognition
+            if kwargs.get('extract_patterns', False):
+                result_df[f"{col}_patterns"] = self._map_texts(texts, self._recognize_value_patterns)
+        
+        # Apply data classification if configured
+        if kwargs.get('classify', False) and kwargs.get('classifier_name'):
+            classifier_name = kwargs.get('classifier_name')
+            
+            # Create a feature dictionary for each row from the feature columns present
+            feature_columns = [fcol for fcol in kwargs.get('feature_columns', []) if fcol in df_chunk.columns]
+            if feature_columns:
+                records = df_chunk[feature_columns].to_dict(orient='records')
+            else:
+                records = [{} for _ in range(len(df_chunk))]
+            
+            # Perform classification
+            classifications = self._classify_records(records, classifier_name)
+            
+            # Add classification results
+            result_df['classification'] = classifications
+        
+        return result_df
+    
+    def _map_texts(self, texts: pd.Series, func: Callable) -> pd.Series:
+        """
+        Apply func to each value of a column.
+        
+        The whole column is processed without per-value error handling first.
+        Only if a call raises is the column redone value by value, so that
+        failing values get an error result instead of failing the chunk.
+        """
+        try:
+            return self._apply_texts(texts, func)
+        except Exception:
+            return self._apply_texts(texts, functools.partial(_call_safely, func))
+    
+    def _apply_texts(self, texts: pd.Series, func: Callable) -> pd.Series:
+        """Apply func to each value of a column, spreading the calls over a thread pool"""
+        if self._row_workers <= 1 or len(texts) <= 1:
+            return texts.map(func)
+        
+        with ThreadPoolExecutor(max_workers=min(self._row_workers, len(texts))) as executor:
+            return pd.Series(list(executor.map(func, texts)), index=texts.index)
+    
+    def _extract_value_entities(self, text: str) -> Dict[str, Any]:
+        """Extract entities from a single column value"""
+        if not text:
+            return {}
+        return self.ai_extractor.extract_entities(text)
+    
+    def _recognize_value_patterns(self, text: str) -> Dict[str, Any]:
+        """Recognize patterns in a single column value"""
+        if not text:
+            return {}
+        return self.pattern_recognizer.recognize_pattern(text)
+    
+    def _classify_records(self, records: List[Dict[str, Any]], classifier_name: str) -> List[Dict[str, Any]]:
+        """
+        Classify records as one batch, falling back to one record at a time
+        if the batch raises so only the failing records get an error result.
+        """
+        try:
+            return self.data_classifier.batch_classify(records, classifier_name)
+        except Exception:
+            return [_call_safely(self.data_classifier.classify, data, classifier_name) for data in records]
+    
+    def analyze_document_structure(self, text: str,
+                                   _prepared_lines: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Analyze document structure to identify sections, headings, and logical flow.
         
@@ -325,37 +612,44 @@ class AdvancedProcessingManager:
         Returns:
             Dict[str, Any]: Structure analysis results
         """
-        # Split text into lines
-        lines = text.split('\n')
+        # Split text into lines, unless the caller already has, stripping each
+        # once so the look-ahead below is a lookup rather than another strip
+        lines = text.split('\n') if _prepared_lines is None else _prepared_lines
+        stripped = [line.strip() for line in lines]
+        last_line = len(stripped) - 1
         
         # Identify potential headings
         headings = []
         sections = []
-        current_section = {'title': '', 'content': '', 'level': 0}
+        current_section = _Section()
+        # Heading levels seen so far, as a bitset (levels are small ints)
+        level_mask = 0
+        max_level = 0
         
-        for i, line in enumerate(lines):
-            line = line.strip()
+        for i, line in enumerate(stripped):
             if not line:
                 continue
             
             # Check if line is a heading
             is_heading = False
             heading_level = 0
+            heading_match = _RE_HEADING.match(line)
+            heading_kind = heading_match.lastgroup if heading_match else None
             
             if line.isupper() and len(line) < 100:
                 # All uppercase, likely a main heading
                 is_heading = True
                 heading_level = 1
-            elif re.match(r'^#{1,6}\s+', line):
+            elif heading_kind == 'md':
                 # Markdown heading
-                heading_level = len(re.match(r'^(#+)', line).group(1))
+                heading_level = len(heading_match.group('md'))
                 is_heading = True
-                line = re.sub(r'^#{1,6}\s+', '', line)
-            elif re.match(r'^[0-9]+\.[0-9]*\s+[A-Z]', line):
+                line = line[heading_match.end():]
+            elif heading_kind == 'num':
                 # Numbered heading (e.g., "1.2 Title")
                 is_heading = True
                 heading_level = 2
-            elif len(line) < 80 and i < len(lines) - 1 and not lines[i+1].strip():
+            elif len(line) < 80 and i < last_line and not stripped[i+1]:
                 # Short line followed by an empty line
                 if line[0].isupper() and line[-1] not in '.,:;?!':
                     is_heading = True
@@ -363,46 +657,43 @@ class AdvancedProcessingManager:
             
             if is_heading:
                 # Save previous section if it has content
-                if current_section['content'].strip():
-                    sections.append(current_section)
+                if current_section.lines:
+                    sections.append(current_section.to_dict())
                 
                 # Create new section
-                current_section = {
-                    'title': line,
-                    'content': '',
-                    'level': heading_level,
-                    'start_line': i,
-                    'end_line': i
-                }
+                current_section = _Section(line, heading_level, i)
                 
                 headings.append({
                     'text': line,
                     'level': heading_level,
                     'line': i
                 })
+                level_mask |= 1 << heading_level
+                if heading_level > max_level:
+                    max_level = heading_level
             else:
                 # Add line to current section content
-                if current_section['content']:
-                    current_section['content'] += '\n'
-                current_section['content'] += line
-                current_section['end_line'] = i
+                current_section.lines.append(line)
+                current_section.end_line = i
         
         # Add the last section
-        if current_section['content'].strip():
-            sections.append(current_section)
+        if current_section.lines:
+            sections.append(current_section.to_dict())
         
         # Analyze structure
         structure = {
             'headings': headings,
             'sections': sections,
             'total_sections': len(sections),
-            'max_heading_level': max([h['level'] for h in headings]) if headings else 0,
-            'has_hierarchical_structure': len(set([h['level'] for h in headings])) > 1 if headings else False
+            'max_heading_level': max_level,
+            # More than one bit set means more than one distinct level
+            'has_hierarchical_structure': bool(level_mask & (level_mask - 1))
         }
         
         return structure
     
-    def identify_data_tables(self, text: str) -> List[Dict[str, Any]]:
+    def identify_data_tables(self, text: str,
+                             _prepared_lines: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
         Identify potential data tables in text content.
         
@@ -413,22 +704,28 @@ class AdvancedProcessingManager:
             List[Dict[str, Any]]: Identified tables
         """
         tables = []
-        lines = text.split('\n')
+        lines = text.split('\n') if _prepared_lines is None else _prepared_lines
         
         # Look for common table markers
         in_table = False
         current_table = {'lines': [], 'start_line': 0, 'end_line': 0}
-        separator_pattern = re.compile(r'^[\s\-+|]+$')
+        non_empty_rows = 0
         
         for i, line in enumerate(lines):
-            # Check for separator lines or pipe-delimited content
-            is_separator = separator_pattern.match(line)
-            has_multiple_pipes = line.count('|') > 1
-            has_multiple_tabs = line.count('\t') > 1
-            has_aligned_spaces = re.search(r'\s{2,}[^\s]', line) and re.search(r'[^\s]\s{2,}', line)
+            is_blank = not line.strip()
+            
+            # Check for separator lines or pipe/tab/space-delimited content
+            # Single-character 'in' checks are memchr fast and let most prose
+            # lines skip the pipe and tab alternatives entirely
+            if '|' in line or '\t' in line:
+                row_match = _RE_TABLE_ROW.match(line)
+            else:
+                row_match = _RE_SPACED_ROW.match(line)
+            row_format = row_match.lastgroup if row_match else None
             
             # Table markers
-            is_table_row = has_multiple_pipes or has_multiple_tabs or has_aligned_spaces
+            is_separator = row_format == 'sep'
+            is_table_row = row_format is not None and not is_separator
             
             if not in_table and (is_separator or is_table_row):
                 # Start of a new table
@@ -437,21 +734,24 @@ class AdvancedProcessingManager:
                     'lines': [line],
                     'start_line': i,
                     'end_line': i,
-                    'format': 'pipe' if has_multiple_pipes else ('tab' if has_multiple_tabs else 'aligned')
+                    'format': row_format if is_table_row else 'aligned'
                 }
+                non_empty_rows = 0 if is_blank else 1
             elif in_table:
-                if is_table_row or is_separator or line.strip() == '':
+                if is_table_row or is_separator or is_blank:
                     # Continue the table
                     current_table['lines'].append(line)
                     current_table['end_line'] = i
+                    if not is_blank:
+                        non_empty_rows += 1
                 else:
                     # End of table if we have 2+ non-empty rows
-                    if len([l for l in current_table['lines'] if l.strip()]) >= 2:
+                    if non_empty_rows >= 2:
                         tables.append(current_table)
                     in_table = False
         
         # Add the last table if it exists
-        if in_table and len([l for l in current_table['lines'] if l.strip()]) >= 2:
+        if in_table and non_empty_rows >= 2:
             tables.append(current_table)
         
         # Process identified tables
@@ -491,7 +791,7 @@ class AdvancedProcessingManager:
         """Parse a pipe-delimited table"""
         # Check if it's a markdown table
         is_markdown = False
-        if len(lines) > 1 and re.match(r'^\s*\|[\s\-+:]+\|\s*$', lines[1]):
+        if len(lines) > 1 and _RE_MD_SEPARATOR.match(lines[1]):
             is_markdown = True
         
         # Extract header and rows
@@ -500,14 +800,7 @@ class AdvancedProcessingManager:
         
         # Parse header row
         if lines:
-            header_line = lines[0].strip()
-            header_cells = [cell.strip() for cell in header_line.split('|')]
-            # Remove empty cells at start/end if present
-            if not header_cells[0]:
-                header_cells = header_cells[1:]
-            if not header_cells[-1]:
-                header_cells = header_cells[:-1]
-            headers = header_cells
+            headers = _split_pipe_row(lines[0].strip())
         
         # Skip separator line if markdown
         start_row = 2 if is_markdown else 1
@@ -515,16 +808,10 @@ class AdvancedProcessingManager:
         # Parse data rows
         for line in lines[start_row:]:
             line = line.strip()
-            if not line or (is_markdown and re.match(r'^\s*\|[\s\-+:]+\|\s*$', line)):
+            if not line or (is_markdown and _RE_MD_SEPARATOR.match(line)):
                 continue
                 
-            cells = [cell.strip() for cell in line.split('|')]
-            # Remove empty cells at start/end if present
-            if not cells[0]:
-                cells = cells[1:]
-            if not cells[-1]:
-                cells = cells[:-1]
-            
+            cells = _split_pipe_row(line)
             if cells:
                 rows.append(cells)
         
@@ -540,18 +827,13 @@ class AdvancedProcessingManager:
     def _parse_tab_table(self, lines: List[str]) -> Dict[str, Any]:
         """Parse a tab-delimited table"""
         headers = []
-        rows = []
         
         # Parse header row
         if lines:
-            header_cells = [cell.strip() for cell in lines[0].split('\t')]
-            headers = header_cells
+            headers = list(map(str.strip, lines[0].split('\t')))
         
         # Parse data rows
-        for line in lines[1:]:
-            cells = [cell.strip() for cell in line.split('\t')]
-            if cells:
-                rows.append(cells)
+        rows = [list(map(str.strip, line.split('\t'))) for line in lines[1:]]
         
         return {
             'format': 'tab',
@@ -568,26 +850,26 @@ class AdvancedProcessingManager:
             return None
             
         # Try to detect column boundaries based on multiple spaces
-        col_boundaries = []
-        
         # Analyze first few lines to find consistent column breaks
         num_lines_to_analyze = min(5, len(lines))
+        width = max(len(line) for line in lines[:num_lines_to_analyze]) + 2
+        boundaries = np.zeros(width, dtype=bool)
         
         for i in range(num_lines_to_analyze):
-            line = lines[i]
-            # Find positions of multiple spaces
-            spaces = [m.start() for m in re.finditer(r'\s{2,}', line)]
+            # Mark positions of multiple spaces
+            spaces = np.zeros(width, dtype=bool)
+            spaces[_multispace_starts(lines[i])] = True
             
-            if not col_boundaries:
-                col_boundaries = spaces
+            if not boundaries.any():
+                boundaries = spaces
             else:
-                # Keep only boundaries that appear consistently
-                new_boundaries = []
-                for boundary in col_boundaries:
-                    # Check if there's a boundary close to this position
-                    if any(abs(boundary - s) <= 1 for s in spaces):
-                        new_boundaries.append(boundary)
-                col_boundaries = new_boundaries
+                # Keep only boundaries with a space run within one position in this line
+                near_spaces = spaces.copy()
+                near_spaces[1:] |= spaces[:-1]
+                near_spaces[:-1] |= spaces[1:]
+                boundaries &= near_spaces
+        
+        col_boundaries = np.flatnonzero(boundaries).tolist()
         
         # If no clear boundaries found, fallback to simple splitting
         if not col_boundaries:
@@ -597,9 +879,6 @@ class AdvancedProcessingManager:
                 'note': 'Could not determine column boundaries'
             }
         
-        # Sort boundaries
-        col_boundaries.sort()
-        
         # Extract data using boundaries
         headers = []
         rows = []
@@ -711,3 +990,35 @@ class AdvancedProcessingManager:
             pattern_config (Dict[str, Any]): Pattern configuration
         """
         return self.pattern_recognizer.add_pattern(pattern_name, pattern_config)
+
+
+# Managers created inside process-pool workers, one per config path
+_worker_managers = {}
+
+
+def _get_manager(manager: Optional[AdvancedProcessingManager],
+                 config_path: Optional[str]) -> AdvancedProcessingManager:
+    """Get the manager to process with, creating one per worker process if needed"""
+    if manager is not None:
+        return manager
+    
+    if config_path not in _worker_managers:
+        _worker_managers[config_path] = AdvancedProcessingManager(config_path)
+    return _worker_managers[config_path]
+
+
+def _document_processor(doc_batch: List[Dict[str, Any]],
+                        manager: Optional[AdvancedProcessingManager] = None,
+                        config_path: Optional[str] = None, **kwargs) -> List[Dict[str, Any]]:
+    """Batch processor for documents; module-level so process pools can pickle it"""
+    manager = _get_manager(manager, config_path)
+    
+    # Documents in a batch are processed concurrently
+    return asyncio.run(manager._process_documents_async(doc_batch, **kwargs))
+
+
+def _dataframe_processor(df_chunk: pd.DataFrame,
+                         manager: Optional[AdvancedProcessingManager] = None,
+                         config_path: Optional[str] = None, **kwargs) -> pd.DataFrame:
+    """Batch processor for DataFrame chunks; module-level so process pools can pickle it"""
+    return _get_manager(manager, config_path)._process_dataframe_chunk(df_chunk, **kwargs)
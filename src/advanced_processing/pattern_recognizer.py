@@ -1,16 +1,126 @@
 # src/advanced_processing/pattern_recognizer.py
 import re
+import string
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Any, Optional, Tuple, Set, Union
+from typing import List, Dict, Any, Optional, Tuple, Set, Union, Callable
+import functools
+import hashlib
 import logging
-from collections import defaultdict
-import jellyfish  # For fuzzy matching
-from fuzzywuzzy import fuzz  # For string similarity
+import threading
+from collections import defaultdict, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from rapidfuzz import fuzz  # For string similarity
+from rapidfuzz.process import cdist
 import json
 import os
 from datetime import datetime
 
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# Regexes used by the validators and formatters, compiled once
+_RE_NON_DIGIT = re.compile(r'[^0-9]')
+_RE_NON_PHONE_CHAR = re.compile(r'[^0-9+]')
+_RE_NON_DECIMAL = re.compile(r'\D')
+_RE_WRITTEN_DATE = re.compile(r'([A-Za-z]+)\s+(\d{1,2}),?\s+(\d{4})')
+_RE_IPV4 = re.compile(r'^(?:\d{1,3}\.){3}\d{1,3}$')
+_RE_NUMERIC = re.compile(r'^-?\d+(\.\d+)?$')
+# ASCII characters Python's \s matches but Hyperscan's (PCRE) \s does not
+_RE_PYTHON_ONLY_SPACE = re.compile('[\x1c-\x1f]')
+
+# Translate tables deleting characters, faster than the equivalent re.sub.
+# Every Latin-1 character other than the ASCII digits (and '+' for phones):
+_NON_DIGIT_DELETE = str.maketrans('', '', ''.join(chr(c) for c in range(256) if not '0' <= chr(c) <= '9'))
+_NON_PHONE_CHAR_DELETE = str.maketrans('', '', ''.join(chr(c) for c in range(256) if not '0' <= chr(c) <= '9' and chr(c) != '+'))
+# Exactly the date separators [/\-\s,.] (\s is str.isspace(), all below U+3001)
+_DATE_SEPARATOR_DELETE = str.maketrans('', '', '/-,.' + ''.join(chr(c) for c in range(0x3001) if chr(c).isspace()))
+_ASCII_DIGIT_DELETE = str.maketrans('', '', '0123456789')
+_ASCII_LETTER_DELETE = str.maketrans('', '', string.ascii_letters)
+# Byte tables for the Luhn check: ASCII digit to its value, and value to its
+# doubled digit sum (2 * n, minus 9 when that exceeds 9)
+_DIGIT_VALUES = bytes.maketrans(b'0123456789', bytes(range(10)))
+_LUHN_DOUBLED = bytes.maketrans(bytes(range(10)), bytes([0, 2, 4, 6, 8, 1, 3, 5, 7, 9]))
+
+# Character sets for the pattern prefilters
+_ASCII_DIGIT_CHARS = frozenset(string.digits)
+_ASCII_UPPERCASE_CHARS = frozenset(string.ascii_uppercase)
+
+# Rows of the value similarity matrix scored per cdist call, bounding its memory
+_SIMILARITY_BLOCK_ROWS = 512
+
+# Maximum number of recognize_pattern results kept for repeated texts
+_RECOGNITION_CACHE_SIZE = 10000
+
+
+def _delete_chars(text: str, table: Dict[int, Any], pattern: re.Pattern) -> str:
+    """
+    Delete the characters matched by pattern, using a translate table that
+    covers the Latin-1 ones. Only text left with rarer characters needs the regex.
+    """
+    text = text.translate(table)
+    if text.isascii():
+        return text
+    return pattern.sub('', text)
+
+
+def _keep_digits(text: str) -> str:
+    """Remove every character other than the ASCII digits 0-9"""
+    return _delete_chars(text, _NON_DIGIT_DELETE, _RE_NON_DIGIT)
+
+
+# Numeric date formats tried by _format_date_string, grouped by separator in
+# their original order. A format can only parse a string containing its separator.
+_DATE_FORMATS_BY_SEPARATOR = {
+    '-': ('%Y-%m-%d', '%m-%d-%Y', '%d-%m-%Y'),
+    '/': ('%m/%d/%Y', '%d/%m/%Y'),
+    '.': ('%m.%d.%Y', '%d.%m.%Y')
+}
+# Already ISO formatted, with ASCII digits and a four digit year: parsing
+# would format a valid date back to the same string, and leave an invalid one as is
+_RE_ISO_DATE = re.compile(r'[1-9][0-9]{3}-[0-9]{2}-[0-9]{2}')
+_MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+
+
+@functools.lru_cache(maxsize=10000)
+def _format_date_string(date_str: str) -> str:
+    """Format date to ISO format when possible; dates recur across rows, so results are cached"""
+    if _RE_ISO_DATE.fullmatch(date_str):
+        return date_str
+    
+    try:
+        # Try to parse the date formats that use a separator in the string
+        for separator, formats in _DATE_FORMATS_BY_SEPARATOR.items():
+            if separator not in date_str:
+                continue
+            for fmt in formats:
+                try:
+                    parsed_date = datetime.strptime(date_str, fmt)
+                    return parsed_date.strftime('%Y-%m-%d')
+                except ValueError:
+                    continue
+        
+        # Handle written dates like "January 1, 2020"
+        match = _RE_WRITTEN_DATE.match(date_str)
+        if match:
+            month_abbr = match.group(1).lower()[:3]
+            if month_abbr in _MONTHS:
+                month = _MONTHS[month_abbr]
+                day = int(match.group(2))
+                year = int(match.group(3))
+                return f"{year:04d}-{month:02d}-{day:02d}"
+    except Exception:
+        pass
+    
+    # Return original if parsing fails
+    return date_str
+
+
 class PatternRecognizer:
     """
     Advanced pattern recognition class for detecting complex patterns
@@ -29,8 +139,17 @@ class PatternRecognizer:
         self.fuzzy_threshold = fuzzy_threshold
         self.logger = logging.getLogger(__name__)
         
-        # Load default patterns
+        # Results of recent recognize_pattern calls, keyed by text and options
+        self._recognition_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
+        # Load default patterns. Scanning uses tables derived from them: change
+        # them with add_pattern and remove_pattern. Entries added, replaced or
+        # removed in self.patterns directly are picked up on the next scan,
+        # but edits inside an entry's configuration are not until it is
+        # passed to add_pattern again.
         self.patterns = self._load_default_patterns()
+        self._refresh_patterns()
         
         # History of recognized patterns for learning
         self.recognition_history = defaultdict(list)
@@ -42,14 +161,17 @@ class PatternRecognizer:
         Returns:
             Dict[str, Dict[str, Any]]: Dictionary of pattern types and their settings
         """
-        # Extended and improved patterns for common data types
-        return {
+        # Extended and improved patterns for common data types. A "prefilter"
+        # gives the shortest text a validated match can have and characters it
+        # always contains at least one of; texts failing it are not scanned.
+        patterns = {
             "email": {
                 "patterns": [
                     r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b'
                 ],
                 "validation": lambda x: '@' in x and '.' in x.split('@')[1],
-                "confidence": 0.95
+                "confidence": 0.95,
+                "prefilter": (6, frozenset('@'))
             },
             "phone": {
                 "patterns": [
@@ -62,7 +184,8 @@ class PatternRecognizer:
                 ],
                 "validation": lambda x: sum(c.isdigit() for c in x) >= 7,
                 "confidence": 0.85,
-                "formatter": lambda x: re.sub(r'[^0-9+]', '', x)
+                "formatter": lambda x: _delete_chars(x, _NON_PHONE_CHAR_DELETE, _RE_NON_PHONE_CHAR),
+                "prefilter": (7, _ASCII_DIGIT_CHARS)
             },
             "url": {
                 "patterns": [
@@ -70,7 +193,8 @@ class PatternRecognizer:
                     r'www\.(?:[-\w.]|(?:%[\da-fA-F]{2}))+[/\w\.-]*\??[/\w\.-]*'
                 ],
                 "validation": lambda x: '.' in x and any(tld in x.lower() for tld in ['.com', '.org', '.net', '.edu', '.gov', '.io']),
-                "confidence": 0.9
+                "confidence": 0.9,
+                "prefilter": (6, frozenset('.'))
             },
             "date": {
                 "patterns": [
@@ -85,16 +209,18 @@ class PatternRecognizer:
                 ],
                 "validation": self._validate_date,
                 "confidence": 0.8,
-                "formatter": self._format_date
+                "formatter": self._format_date,
+                "prefilter": (6, _ASCII_DIGIT_CHARS)
             },
             "ssn": {  # US Social Security Number
                 "patterns": [
                     r'\d{3}[-]\d{2}[-]\d{4}',
                     r'\b\d{9}\b'
                 ],
-                "validation": lambda x: len(re.sub(r'[^0-9]', '', x)) == 9,
+                "validation": lambda x: len(_keep_digits(x)) == 9,
                 "confidence": 0.9,
-                "sensitive": True
+                "sensitive": True,
+                "prefilter": (9, _ASCII_DIGIT_CHARS)
             },
             "credit_card": {
                 "patterns": [
@@ -104,7 +230,8 @@ class PatternRecognizer:
                 "validation": self._validate_credit_card,
                 "confidence": 0.9,
                 "sensitive": True,
-                "formatter": lambda x: re.sub(r'[^0-9]', '', x)
+                "formatter": _keep_digits,
+                "prefilter": (13, _ASCII_DIGIT_CHARS)
             },
             "ip_address": {
                 "patterns": [
@@ -114,7 +241,8 @@ class PatternRecognizer:
                     r'\b(?:[0-9a-fA-F]{1,4}:){7}[0-9a-fA-F]{1,4}\b'
                 ],
                 "validation": self._validate_ip,
-                "confidence": 0.95
+                "confidence": 0.95,
+                "prefilter": (7, frozenset('.:'))
             },
             "address": {
                 "patterns": [
@@ -122,7 +250,8 @@ class PatternRecognizer:
                     r'\d+\s+[A-Za-z0-9\s,.]+'
                 ],
                 "confidence": 0.7,
-                "requires_context": True
+                "requires_context": True,
+                "prefilter": (3, _ASCII_DIGIT_CHARS)
             },
             "person_name": {
                 "patterns": [
@@ -134,7 +263,8 @@ class PatternRecognizer:
                     r'\bMrs\.\s+[A-Z][a-z]+\b'
                 ],
                 "confidence": 0.7,
-                "requires_context": True
+                "requires_context": True,
+                "prefilter": (5, _ASCII_UPPERCASE_CHARS)
             },
             "company_name": {
                 "patterns": [
@@ -142,14 +272,254 @@ class PatternRecognizer:
                     r'\b[A-Z][A-Za-z0-9\s]+(?:Inc\.|LLC\.|Ltd\.|Corp\.|Corporation)\b'
                 ],
                 "confidence": 0.75,
-                "requires_context": True
+                "requires_context": True,
+                "prefilter": (5, _ASCII_UPPERCASE_CHARS)
             }
         }
+        
+        for pattern_config in patterns.values():
+            self._compile_patterns(pattern_config)
+        
+        return patterns
+    
+    def _compile_patterns(self, pattern_config: Dict[str, Any]) -> None:
+        """Compile the regex sources of a pattern configuration into its 'compiled' list"""
+        pattern_config['compiled'] = [re.compile(pattern) for pattern in pattern_config['patterns']]
+    
+    def _refresh_patterns(self) -> None:
+        """Rebuild everything derived from self.patterns after it changes"""
+        # What the derived tables were built from, see _refresh_if_stale
+        self._patterns_snapshot = (self.patterns, tuple(self.patterns.items()))
+        self._build_pattern_table()
+        self._build_combined_pattern()
+        self._build_hyperscan_database()
+        
+        with self._cache_lock:
+            self._recognition_cache.clear()
+    
+    def _refresh_if_stale(self) -> None:
+        """Rebuild the derived tables if entries of self.patterns were changed directly"""
+        patterns, items = self._patterns_snapshot
+        if self.patterns is patterns and tuple(self.patterns.items()) == items:
+            return
+        
+        # Entries set directly haven't been compiled
+        for pattern_config in self.patterns.values():
+            compiled = pattern_config.get('compiled', [])
+            if [pattern.pattern for pattern in compiled] != list(pattern_config['patterns']):
+                self._compile_patterns(pattern_config)
+        
+        self._refresh_patterns()
+    
+    def _build_pattern_table(self) -> None:
+        """
+        Lay the pattern settings used while scanning out in parallel lists,
+        one entry per pattern type in self.patterns order.
+        
+        Scanning then indexes these directly instead of looking settings up in
+        each configuration dict, and the sensitivity and type filters become
+        boolean masks over the entries.
+        """
+        self._pattern_names = list(self.patterns)
+        self._pattern_name_array = np.array(self._pattern_names, dtype=object)
+        self._pattern_compiled = [config['compiled'] for config in self.patterns.values()]
+        # One alternation per pattern type, to find candidate values in bulk
+        self._pattern_joined = [self._join_patterns(config['compiled']) for config in self.patterns.values()]
+        self._pattern_validators = [config.get('validation') for config in self.patterns.values()]
+        self._pattern_formatters = [config.get('formatter') for config in self.patterns.values()]
+        self._pattern_confidences = [config.get('confidence') for config in self.patterns.values()]
+        self._pattern_prefilters = [config.get('prefilter') for config in self.patterns.values()]
+        self._pattern_sensitive = np.array([bool(config.get('sensitive', False)) for config in self.patterns.values()],
+                                           dtype=bool)
+        
+        # Selections and their scanners only change with the table, so start
+        # fresh caches for it
+        self._select_patterns = functools.lru_cache(maxsize=32)(self._compute_selection)
+        self._get_scanner = functools.lru_cache(maxsize=32)(self._compile_scanner)
+    
+    def _compute_selection(self, pattern_types: Optional[frozenset], include_sensitive: bool) -> Tuple[int, ...]:
+        """
+        Select the pattern table entries to scan with.
+        
+        Args:
+            pattern_types (frozenset, optional): Pattern types to recognize, or None for all
+            include_sensitive (bool): Whether to include sensitive pattern types
+            
+        Returns:
+            Tuple[int, ...]: Indices of the selected entries, in table order
+        """
+        selected = np.ones(len(self._pattern_names), dtype=bool) if include_sensitive else ~self._pattern_sensitive
+        if pattern_types:
+            selected &= np.isin(self._pattern_name_array, list(pattern_types))
+        
+        return tuple(np.flatnonzero(selected).tolist())
+    
+    def _compile_scanner(self, selection: Tuple[int, ...]) -> Callable[[str, Optional[Set[int]], float], Dict[str, List[Dict[str, Any]]]]:
+        """
+        Generate a function scanning text with the selected pattern table entries.
+        
+        The function is specialized for the selection: the compiled regexes,
+        validators, formatters and prefilters of each entry are bound to local
+        names and the loop over them is unrolled, so scanning does no table
+        lookups or checks for settings an entry doesn't have. Only indices
+        and generated names go into the source; the settings themselves are
+        passed in through the namespace it is executed in.
+        
+        Args:
+            selection (Tuple[int, ...]): Indices of the entries to scan with, in table order
+            
+        Returns:
+            Callable: scan(text, matching_types, confidence_threshold) returning
+                the matches by pattern type, as _recognize does; matching_types
+                are the entries Hyperscan found matches for, or None to try all
+        """
+        namespace = {}
+        lines = ['def scan(text, matching_types, confidence_threshold):',
+                 '    results = {}']
+        
+        if any(self._pattern_prefilters[index] is not None for index in selection):
+            # \d also matches non-ASCII digits, so the required characters
+            # of the prefilters are only conclusive for ASCII text
+            lines += ['    text_length = len(text)',
+                      '    text_chars = set(text) if text.isascii() else None']
+        
+        for index in selection:
+            conditions = [f'(matching_types is None or {index} in matching_types)']
+            prefilter = self._pattern_prefilters[index]
+            if prefilter is not None:
+                namespace[f'min_length_{index}'], namespace[f'required_chars_{index}'] = prefilter
+                conditions.append(f'text_length >= min_length_{index}')
+                conditions.append(f'(text_chars is None or not text_chars.isdisjoint(required_chars_{index}))')
+            
+            namespace[f'name_{index}'] = self._pattern_names[index]
+            confidence = self._pattern_confidences[index]
+            if confidence is None:
+                confidence_expr = 'confidence_threshold'
+            else:
+                namespace[f'confidence_{index}'] = confidence
+                confidence_expr = f'confidence_{index}'
+            validation_func = self._pattern_validators[index]
+            formatter_func = self._pattern_formatters[index]
+            
+            lines += [f'    if {" and ".join(conditions)}:',
+                      '        found = []',
+                      '        seen_matches = set()']
+            for number, pattern in enumerate(self._pattern_compiled[index]):
+                namespace[f'finditer_{index}_{number}'] = pattern.finditer
+                lines += [f'        for match in finditer_{index}_{number}(text):',
+                          '            match_text = match.group(0)']
+                indent = '            '
+                if validation_func is not None:
+                    namespace[f'validate_{index}'] = validation_func
+                    lines.append(f'{indent}if validate_{index}(match_text):')
+                    indent += '    '
+                if formatter_func is not None:
+                    namespace[f'format_{index}'] = formatter_func
+                    lines.append(f'{indent}formatted_match = format_{index}(match_text)')
+                else:
+                    lines.append(f'{indent}formatted_match = match_text')
+                lines += [f'{indent}if formatted_match not in seen_matches:',
+                          f'{indent}    seen_matches.add(formatted_match)',
+                          f'{indent}    start, end = match.span()',
+                          f"{indent}    found.append({{'match': formatted_match, 'position': (start, end), "
+                          f"'confidence': {confidence_expr}, 'context': text[max(0, start - 20):end + 20]}})"]
+            lines += ['        if found:',
+                      f'            results[name_{index}] = found']
+        
+        lines.append('    return results')
+        exec(compile('\n'.join(lines), '<pattern scanner>', 'exec'), namespace)
+        return namespace['scan']
+    
+    def _build_combined_pattern(self) -> None:
+        """
+        Fuse all patterns into one alternation, so a single scan can rule out
+        texts that no pattern matches.
+        """
+        self._combined_pattern = self._join_patterns(
+            [pattern for pattern_config in self.patterns.values() for pattern in pattern_config['compiled']]
+        )
+    
+    def _build_hyperscan_database(self) -> None:
+        """
+        Compile all patterns into a Hyperscan database when the optional
+        hyperscan package is installed. A single scan then tells which pattern
+        types match a text at all, so the re scans of the others are skipped.
+        
+        The database and the thread-local holder of its scratch space are
+        published together in self._hs, so a scan never pairs a database with
+        scratch allocated for the one it replaced.
+        """
+        self._hs = None
+        if hyperscan is None:
+            return
+        
+        expressions = []
+        ids = []
+        for index, compiled in enumerate(self._pattern_compiled):
+            for pattern in compiled:
+                # Flags would not carry over into the database
+                if pattern.flags & ~re.UNICODE:
+                    return
+                expressions.append(pattern.pattern.encode('utf-8'))
+                ids.append(index)
+        if not expressions:
+            return
+        
+        try:
+            database = hyperscan.Database()
+            database.compile(expressions=expressions, ids=ids, elements=len(expressions),
+                             flags=hyperscan.HS_FLAG_SINGLEMATCH)
+        except hyperscan.error as e:
+            self.logger.warning(f"Could not compile patterns with Hyperscan, using re only: {str(e)}")
+            return
+        
+        # Scratch space can't be shared between threads scanning at once
+        self._hs = (database, threading.local())
+    
+    def _matching_pattern_types(self, text: str) -> Optional[Set[int]]:
+        """
+        Find the pattern table entries with any match in text using Hyperscan.
+        
+        Args:
+            text (str): The text to scan
+            
+        Returns:
+            Optional[Set[int]]: Indices of the matching entries, or None if
+                Hyperscan is not available or can't be relied on for this text
+        """
+        # Hyperscan matches bytes, and its \d, \w, \s and \b only agree with
+        # Python's on ASCII text without the extra separator characters
+        hs = self._hs
+        if hs is None or not text.isascii() or _RE_PYTHON_ONLY_SPACE.search(text):
+            return None
+        
+        database, hs_local = hs
+        scratch = getattr(hs_local, 'scratch', None)
+        if scratch is None:
+            scratch = hs_local.scratch = hyperscan.Scratch(database)
+        
+        matched = set()
+        database.scan(text.encode('ascii'), match_event_handler=lambda pattern_id, start, end, flags, context: matched.add(pattern_id),
+                      scratch=scratch)
+        return matched
+    
+    @staticmethod
+    def _join_patterns(compiled: List[re.Pattern]) -> Optional[re.Pattern]:
+        """
+        Join compiled patterns into one alternation that matches wherever any of them does.
+        
+        Capture groups or flags would change meaning once patterns are joined,
+        so None is returned if any pattern uses them.
+        """
+        if not compiled or any(pattern.groups or pattern.flags & ~re.UNICODE for pattern in compiled):
+            return None
+        
+        return re.compile('|'.join(f'(?:{pattern.pattern})' for pattern in compiled))
     
     def _validate_date(self, date_str: str) -> bool:
         """Validate if a string is a plausible date"""
         # Remove common separators and check if it has appropriate length
-        clean_date = re.sub(r'[/\-\s,.]', '', date_str)
+        clean_date = date_str.translate(_DATE_SEPARATOR_DELETE)
         if not clean_date.isdigit():
             return False
         
@@ -161,60 +531,28 @@ class PatternRecognizer:
     
     def _format_date(self, date_str: str) -> str:
         """Format date to ISO format when possible"""
-        try:
-            # Try to parse various date formats
-            for fmt in ('%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y', '%m-%d-%Y', '%d-%m-%Y', '%m.%d.%Y', '%d.%m.%Y'):
-                try:
-                    parsed_date = datetime.strptime(date_str, fmt)
-                    return parsed_date.strftime('%Y-%m-%d')
-                except ValueError:
-                    continue
-            
-            # Handle written dates like "January 1, 2020"
-            match = re.match(r'([A-Za-z]+)\s+(\d{1,2}),?\s+(\d{4})', date_str)
-            if match:
-                month_map = {
-                    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
-                    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
-                }
-                month_abbr = match.group(1).lower()[:3]
-                if month_abbr in month_map:
-                    month = month_map[month_abbr]
-                    day = int(match.group(2))
-                    year = int(match.group(3))
-                    return f"{year:04d}-{month:02d}-{day:02d}"
-        except Exception:
-            pass
-        
-        # Return original if parsing fails
-        return date_str
+        return _format_date_string(date_str)
     
     def _validate_credit_card(self, card_num: str) -> bool:
         """Validate a credit card number using Luhn algorithm"""
         # Remove non-digit characters
-        card_num = re.sub(r'[^0-9]', '', card_num)
+        card_num = _keep_digits(card_num)
         
         # Check if length is valid for major credit cards
         if len(card_num) < 13 or len(card_num) > 19:
             return False
         
-        # Luhn algorithm check
-        total = 0
-        reverse_digits = card_num[::-1]
-        for i, digit in enumerate(reverse_digits):
-            n = int(digit)
-            if i % 2 == 1:
-                n *= 2
-                if n > 9:
-                    n -= 9
-            total += n
+        # Luhn algorithm check: from the right, every second digit is doubled.
+        # Both sums run over byte slices, with no per-digit Python code
+        values = card_num.encode('ascii').translate(_DIGIT_VALUES)
+        total = sum(values[::-2]) + sum(values[-2::-2].translate(_LUHN_DOUBLED))
         
         return total % 10 == 0
     
     def _validate_ip(self, ip: str) -> bool:
         """Validate an IP address"""
         # Check IPv4
-        if re.match(r'^(?:\d{1,3}\.){3}\d{1,3}$', ip):
+        if _RE_IPV4.match(ip):
             octets = ip.split('.')
             return all(0 <= int(octet) <= 255 for octet in octets)
         
@@ -232,7 +570,9 @@ class PatternRecognizer:
             pattern_name (str): Name of the pattern
             pattern_config (Dict[str, Any]): Configuration including patterns, validation, confidence
         """
+        self._compile_patterns(pattern_config)
         self.patterns[pattern_name] = pattern_config
+        self._refresh_patterns()
         self.logger.info(f"Added new pattern: {pattern_name}")
     
     def remove_pattern(self, pattern_name: str) -> bool:
@@ -247,6 +587,7 @@ class PatternRecognizer:
         """
         if pattern_name in self.patterns:
             del self.patterns[pattern_name]
+            self._refresh_patterns()
             self.logger.info(f"Removed pattern: {pattern_name}")
             return True
         return False
@@ -264,142 +605,200 @@ class PatternRecognizer:
         Returns:
             Dict[str, List[Dict[str, Any]]]: Dictionary of pattern types and their matches
         """
-        results = defaultdict(list)
+        self._refresh_if_stale()
+        pattern_types = frozenset(pattern_types) if pattern_types else None
+        results = self._recognize_cached(text, pattern_types, include_sensitive)
+        self._record_history(results)
         
-        # Determine which patterns to use
-        patterns_to_use = {}
-        for pattern_name, pattern_config in self.patterns.items():
-            if pattern_types and pattern_name not in pattern_types:
-                continue
-            if not include_sensitive and pattern_config.get('sensitive', False):
-                continue
-            patterns_to_use[pattern_name] = pattern_config
-        
-        # Apply each pattern
-        for pattern_name, pattern_config in patterns_to_use.items():
-            pattern_list = pattern_config['patterns']
-            confidence = pattern_config.get('confidence', self.confidence_threshold)
-            validation_func = pattern_config.get('validation', lambda x: True)
-            formatter_func = pattern_config.get('formatter', lambda x: x)
-            
-            for pattern in pattern_list:
-                matches = re.finditer(pattern, text)
-                
-                for match in matches:
-                    match_text = match.group(0)
-                    
-                    # Validate the match
-                    if validation_func(match_text):
-                        # Format the match if needed
-                        formatted_match = formatter_func(match_text)
-                        
-                        # Check if this match is already in results
-                        is_duplicate = False
-                        for existing_match in results[pattern_name]:
-                            if existing_match['match'] == formatted_match:
-                                is_duplicate = True
-                                break
-                        
-                        if not is_duplicate:
-                            match_info = {
-                                'match': formatted_match,
-                                'position': match.span(),
-                                'confidence': confidence,
-                                'context': text[max(0, match.start() - 20):min(len(text), match.end() + 20)]
-                            }
-                            results[pattern_name].append(match_info)
-                            
-                            # Record in recognition history for learning
-                            self.recognition_history[pattern_name].append(formatted_match)
-        
-        return dict(results)
-    
-    def find_data_patterns(self, df: pd.DataFrame, sample_size: int = 100) -> Dict[str, Dict[str, Any]]:
+        # Give the caller its own copy of the cached matches
+        return {pattern_name: [dict(match_info) for match_info in matches]
+                for pattern_name, matches in results.items()}
+    
+    def _recognize_cached(self, text: str, pattern_types: Optional[frozenset],
+                          include_sensitive: bool) -> Dict[str, List[Dict[str, Any]]]:
+        """Get the results of _recognize from the cache, scanning text on a miss; results are shared, not copied"""
+        # Results only depend on the text and options, so repeated values
+        # (common in DataFrame columns) are only scanned once. Texts are keyed
+        # by a digest so the cache doesn't keep whole documents alive.
+        digest = hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        cache_key = (digest, pattern_types, include_sensitive)
+        with self._cache_lock:
+            results = self._recognition_cache.get(cache_key)
+            if results is not None:
+                self._recognition_cache.move_to_end(cache_key)
+        
+        if results is None:
+            results = self._recognize(text, pattern_types, include_sensitive)
+            with self._cache_lock:
+                self._recognition_cache[cache_key] = results
+                if len(self._recognition_cache) > _RECOGNITION_CACHE_SIZE:
+                    self._recognition_cache.popitem(last=False)
+        
+        return results
+    
+    def _record_history(self, results: Dict[str, List[Dict[str, Any]]]) -> None:
+        """Record recognized matches in the recognition history for learning"""
+        for pattern_name, matches in results.items():
+            self.recognition_history[pattern_name].extend(match_info['match'] for match_info in matches)
+    
+    def _recognize(self, text: str, pattern_types: Optional[frozenset],
+                   include_sensitive: bool) -> Dict[str, List[Dict[str, Any]]]:
+        """Scan text with the selected patterns, as described in recognize_pattern"""
+        # Only scan with the pattern types Hyperscan found matches for, if it can be used
+        matching_types = self._matching_pattern_types(text)
+        
+        # Texts that none of the patterns match need no further scanning
+        if matching_types is None and self._combined_pattern is not None and not self._combined_pattern.search(text):
+            return {}
+        
+        scan = self._get_scanner(self._select_patterns(pattern_types, include_sensitive))
+        return scan(text, matching_types, self.confidence_threshold)
+    
+    def find_data_patterns(self, df: pd.DataFrame, sample_size: int = 100,
+                           max_workers: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
         """
         Identify patterns and data types in DataFrame columns.
         
         Args:
             df (pd.DataFrame): The DataFrame to analyze
             sample_size (int): Number of rows to sample for analysis
+            max_workers (int, optional): Number of threads analyzing columns
+                concurrently. None or 1 analyzes the columns in turn.
             
         Returns:
             Dict[str, Dict[str, Any]]: Dictionary of column names and detected patterns
         """
+        self._refresh_if_stale()
         results = {}
         
         # Sample rows for analysis
         sample = df.sample(min(sample_size, len(df))) if len(df) > sample_size else df
         
-        for column in df.columns:
-            column_data = sample[column].astype(str).fillna('').tolist()
-            pattern_counts = defaultdict(int)
-            
-            # Find patterns in each column's data
-            for value in column_data:
-                if not value or value.lower() in ('nan', 'null', 'none', ''):
-                    continue
-                    
-                patterns_found = self.recognize_pattern(value)
-                for pattern_type, matches in patterns_found.items():
-                    if matches:
-                        pattern_counts[pattern_type] += 1
-            
-            # Determine primary pattern based on frequency
-            primary_pattern = None
-            pattern_confidence = 0.0
+        columns = list(df.columns)
+        column_values = [sample[column].astype(str).fillna('') for column in columns]
+        
+        if max_workers and max_workers > 1 and len(columns) > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(columns))) as executor:
+                analyses = list(executor.map(self._analyze_column, column_values))
+        else:
+            analyses = [self._analyze_column(column_series) for column_series in column_values]
+        
+        for column, (column_result, patterns_found) in zip(columns, analyses):
+            # History is only written here, in column order, never from the workers
+            for value_patterns in patterns_found:
+                self._record_history(value_patterns)
             
-            if pattern_counts:
-                most_common_pattern = max(pattern_counts.items(), key=lambda x: x[1])
-                pattern_frequency = most_common_pattern[1] / len([x for x in column_data if x])
-                
-                if pattern_frequency >= self.confidence_threshold:
-                    primary_pattern = most_common_pattern[0]
-                    pattern_confidence = pattern_frequency
+            results[column] = column_result
+        
+        return results
+    
+    def _analyze_column(self, column_series: pd.Series) -> Tuple[Dict[str, Any], List[Dict[str, List[Dict[str, Any]]]]]:
+        """
+        Detect the patterns and data type of one column's sampled values.
+        
+        Args:
+            column_series (pd.Series): The column's values as strings
             
-            # Determine data type based on values
-            data_type = self._infer_data_type(column_data)
+        Returns:
+            Tuple[Dict[str, Any], List[Dict[str, List[Dict[str, Any]]]]]: The
+                column's analysis, and the patterns found in each value for the
+                caller to record in the recognition history
+        """
+        pattern_indices = self._select_patterns(None, False)
+        column_data = column_series.tolist()
+        pattern_counts = defaultdict(int)
+        
+        # Skip empty and placeholder values, and recognize each distinct value
+        # once: columns often repeat a handful of values
+        counted = (column_series != '') & ~column_series.str.lower().isin(('nan', 'null', 'none'))
+        value_codes, unique_values = pd.factorize(column_series[counted])
+        unique_values = pd.Series(unique_values, dtype=object)
+        value_weights = np.bincount(value_codes, minlength=len(unique_values)).tolist()
+        
+        # Find the values each pattern type could match, scanning all distinct
+        # values per type; types without a joined pattern check every value
+        candidates = np.array([
+            unique_values.str.contains(self._pattern_joined[index]).to_numpy(dtype=bool)
+            if self._pattern_joined[index] is not None else np.ones(len(unique_values), dtype=bool)
+            for index in pattern_indices
+        ]).reshape(len(pattern_indices), len(unique_values))
+        
+        # Find patterns in each distinct value, only trying the types with
+        # candidate matches in it, and count them once per occurrence
+        patterns_found_by_unique = {}
+        for position in np.flatnonzero(candidates.any(axis=0)):
+            pattern_types = frozenset(self._pattern_names[pattern_indices[i]] for i in np.flatnonzero(candidates[:, position]))
+            patterns_found = self._recognize_cached(unique_values[position], pattern_types, False)
+            patterns_found_by_unique[position] = patterns_found
+            for pattern_type, matches in patterns_found.items():
+                if matches:
+                    pattern_counts[pattern_type] += value_weights[position]
+        
+        # The patterns found for each occurrence, in column order
+        patterns_found_by_value = [patterns_found_by_unique[code] for code in value_codes.tolist()
+                                   if code in patterns_found_by_unique]
+        
+        # Determine primary pattern based on frequency
+        primary_pattern = None
+        pattern_confidence = 0.0
+        
+        if pattern_counts:
+            most_common_pattern = max(pattern_counts.items(), key=lambda x: x[1])
+            pattern_frequency = most_common_pattern[1] / len([x for x in column_data if x])
             
-            results[column] = {
-                'primary_pattern': primary_pattern,
-                'pattern_confidence': pattern_confidence,
-                'detected_patterns': dict(pattern_counts),
-                'inferred_data_type': data_type,
-                'sample_values': column_data[:5]
-            }
+            if pattern_frequency >= self.confidence_threshold:
+                primary_pattern = most_common_pattern[0]
+                pattern_confidence = pattern_frequency
         
-        return results
+        # Determine data type based on values
+        data_type = self._infer_data_type(column_series)
+        
+        column_result = {
+            'primary_pattern': primary_pattern,
+            'pattern_confidence': pattern_confidence,
+            'detected_patterns': dict(pattern_counts),
+            'inferred_data_type': data_type,
+            'sample_values': column_data[:5]
+        }
+        
+        return column_result, patterns_found_by_value
     
-    def _infer_data_type(self, values: List[str]) -> str:
+    def _infer_data_type(self, values: Union[List[str], pd.Series]) -> str:
         """
         Infer the data type of a list of values.
         
         Args:
-            values (List[str]): List of values as strings
+            values (Union[List[str], pd.Series]): Values as strings
             
         Returns:
             str: Inferred data type
         """
+        values = pd.Series(values, dtype=object)
+        
         # Filter out empty values
-        non_empty_values = [v for v in values if v and v.lower() not in ('nan', 'null', 'none', '')]
-        if not non_empty_values:
+        lower_values = values.str.lower()
+        non_empty = (values != '') & ~lower_values.isin(('nan', 'null', 'none'))
+        non_empty_values = values[non_empty]
+        if non_empty_values.empty:
             return 'unknown'
         
         # Check if all values are numeric
-        numeric_count = sum(1 for v in non_empty_values if re.match(r'^-?\d+(\.\d+)?$', v))
-        if numeric_count / len(non_empty_values) > 0.9:
+        numeric = non_empty_values.str.match(_RE_NUMERIC)
+        if numeric.mean() > 0.9:
             # Check if integers or floats
-            if all('.' not in v for v in non_empty_values if re.match(r'^-?\d+(\.\d+)?$', v)):
+            if not non_empty_values[numeric].str.contains('.', regex=False).any():
                 return 'integer'
             return 'float'
         
-        # Check if dates
-        date_count = sum(1 for v in non_empty_values if self._validate_date(v))
-        if date_count / len(non_empty_values) > 0.8:
+        # Check if dates, as _validate_date does for each value
+        clean_dates = non_empty_values.str.translate(_DATE_SEPARATOR_DELETE)
+        is_date = clean_dates.str.isdigit() & clean_dates.str.len().between(6, 8)
+        if is_date.mean() > 0.8:
             return 'date'
         
         # Check if boolean
         bool_values = {'true', 'false', 'yes', 'no', '1', '0', 't', 'f', 'y', 'n'}
-        if all(v.lower() in bool_values for v in non_empty_values):
+        if lower_values[non_empty].isin(bool_values).all():
             return 'boolean'
         
         # Default to string
@@ -424,30 +823,93 @@ class PatternRecognizer:
         if len(unique_values) <= 1:
             return {}
         
+        lower_values = [v.lower() for v in unique_values]
+        
+        # Find all similar pairs up front in C
+        neighbours = self._similar_pairs(lower_values, threshold)
+        
         # Group similar values
         similar_groups = {}
-        processed_values = set()
+        processed = np.zeros(len(unique_values), dtype=bool)
         
         for i, value1 in enumerate(unique_values):
-            if value1 in processed_values:
+            if processed[i]:
                 continue
-                
-            group = [value1]
-            for j, value2 in enumerate(unique_values):
-                if i != j and value2 not in processed_values:
-                    similarity = fuzz.ratio(value1.lower(), value2.lower())
-                    if similarity >= threshold:
-                        group.append(value2)
-                        processed_values.add(value2)
             
-            if len(group) > 1:
+            group_indices = neighbours[i][~processed[neighbours[i]]]
+            
+            if len(group_indices):
                 # Use the most frequent value as canonical
                 canonical = value1
-                similar_groups[canonical] = [v for v in group if v != canonical]
-                processed_values.add(value1)
+                similar_groups[canonical] = [unique_values[j] for j in group_indices]
+                processed[group_indices] = True
+                processed[i] = True
         
         return similar_groups
     
+    @staticmethod
+    def _length_window(length: int, threshold: int) -> Tuple[float, float]:
+        """
+        Range of lengths a value can have and still reach the threshold against
+        a value of the given length.
+        
+        A ratio is at most 200 * shorter / (sum of lengths). Scores count once
+        rounded to whole percentages, like the integer scores of fuzzywuzzy.
+        """
+        score_cutoff = threshold - 0.5
+        if score_cutoff <= 0:
+            return 0, float('inf')
+        
+        # Small tolerance so float error can't drop a value on the boundary
+        return (score_cutoff * length / (200 - score_cutoff) - 1e-9,
+                length * (200 - score_cutoff) / score_cutoff + 1e-9)
+    
+    def _similar_pairs(self, lower_values: List[str], threshold: int) -> List[np.ndarray]:
+        """
+        Find the similar values of every value.
+        
+        Values are sorted by length and scored in blocks of rows against only
+        the window of lengths that can reach the threshold.
+        
+        Args:
+            lower_values (List[str]): Lowercased values to compare
+            threshold (int): Similarity threshold (0-100)
+            
+        Returns:
+            List[np.ndarray]: Sorted indices of the similar values of each value
+        """
+        num_values = len(lower_values)
+        lengths = np.fromiter(map(len, lower_values), dtype=np.int64, count=num_values)
+        by_length = np.argsort(lengths, kind='stable')
+        sorted_lengths = lengths[by_length]
+        sorted_values = [lower_values[j] for j in by_length]
+        score_cutoff = min(max(threshold - 0.5, 0), 100)
+        
+        rows, cols = [], []
+        for block_start in range(0, num_values, _SIMILARITY_BLOCK_ROWS):
+            block_stop = min(block_start + _SIMILARITY_BLOCK_ROWS, num_values)
+            min_length = self._length_window(sorted_lengths[block_start], threshold)[0]
+            max_length = self._length_window(sorted_lengths[block_stop - 1], threshold)[1]
+            start = np.searchsorted(sorted_lengths, min_length, side='left')
+            stop = np.searchsorted(sorted_lengths, max_length, side='right')
+            
+            scores = cdist(sorted_values[block_start:block_stop], sorted_values[start:stop],
+                           scorer=fuzz.ratio, score_cutoff=score_cutoff, workers=-1)
+            block_rows, block_cols = np.nonzero(np.rint(scores) >= threshold)
+            rows.append(by_length[block_start + block_rows])
+            cols.append(by_length[start + block_cols])
+        
+        rows = np.concatenate(rows)
+        cols = np.concatenate(cols)
+        not_self = rows != cols
+        rows, cols = rows[not_self], cols[not_self]
+        
+        # Group the pairs by value, each value's neighbours in index order
+        order = np.lexsort((cols, rows))
+        rows, cols = rows[order], cols[order]
+        bounds = np.searchsorted(rows, np.arange(num_values + 1))
+        return [cols[bounds[i]:bounds[i + 1]] for i in range(num_values)]
+    
     def suggest_pattern_improvements(self) -> Dict[str, Any]:
         """
         Suggest improvements to patterns based on recognition history.
@@ -480,7 +942,7 @@ class PatternRecognizer:
         formats = defaultdict(int)
         for match in matches:
             # Strip non-digit characters to analyze format
-            digits = re.sub(r'\D', '', match)
+            digits = _delete_chars(match, _NON_DIGIT_DELETE, _RE_NON_DECIMAL)
             digit_count = len(digits)
             formats[digit_count] += 1
         
@@ -523,11 +985,11 @@ class PatternRecognizer:
         for match in matches:
             # Look for common separators
             if re.match(r'\d{1,2}[/.-]\d{1,2}[/.-]\d{2,4}', match):
-                separator = re.sub(r'[0-9]', '', match)[0]
+                separator = match.translate(_ASCII_DIGIT_DELETE)[0]
                 if re.match(r'\d{1,2}' + re.escape(separator) + r'\d{1,2}' + re.escape(separator) + r'\d{2,4}', match):
                     formats[f'MM{separator}DD{separator}YYYY'] += 1
             elif re.match(r'\d{4}[/.-]\d{1,2}[/.-]\d{1,2}', match):
-                separator = re.sub(r'[0-9]', '', match)[0]
+                separator = match.translate(_ASCII_DIGIT_DELETE)[0]
                 formats[f'YYYY{separator}MM{separator}DD'] += 1
         
         # Find common formats not in patterns
@@ -539,7 +1001,7 @@ class PatternRecognizer:
                     suggestions['date'] = {'new_formats': []}
                 
                 # Check if this format is already in patterns
-                separator = re.sub(r'[A-Za-z]', '', format_str)[0]
+                separator = format_str.translate(_ASCII_LETTER_DELETE)[0]
                 new_pattern = None
                 
                 if format_str.startswith('MM'):
@@ -600,9 +1062,16 @@ class PatternRecognizer:
             
             if common_pattern and common_pattern not in self.patterns[pattern_type]['patterns']:
                 self.patterns[pattern_type]['patterns'].append(common_pattern)
+                # The prefilter was only written for the existing patterns
+                self.patterns[pattern_type].pop('prefilter', None)
+                self._compile_patterns(self.patterns[pattern_type])
                 changes['updated'] = True
                 changes['new_pattern_added'] = common_pattern
         
+        # Validation or patterns changed, so cached results are stale
+        if changes['updated']:
+            self._refresh_patterns()
+        
         return changes
     
     def _find_common_characteristics(self, values: List[str]) -> Dict[str, float]:
@@ -629,22 +1098,40 @@ class PatternRecognizer:
         pattern_parts = []
         min_length = min(len(v) for v in values)
         
-        for i in range(min_length):
-            chars = [v[i] for v in values]
+        if min_length:
+            # Code points of each value's prefix, one row per value
+            codes = np.frombuffer(''.join(v[:min_length] for v in values).encode('utf-32-le', 'surrogatepass'),
+                                  dtype=np.uint32).reshape(len(values), min_length)
+            
+            # Classify each distinct character once, then check every position
+            # (column) for the class holding for all values
+            unique_codes, inverse = np.unique(codes.ravel(), return_inverse=True)
+            unique_chars = [chr(code) for code in unique_codes.tolist()]
+            
+            def all_values(predicate):
+                flags = np.array([predicate(c) for c in unique_chars], dtype=bool)
+                return flags[inverse].reshape(codes.shape).all(axis=0)
             
-            if all(c.isdigit() for c in chars):
-                pattern_parts.append("\\d")
-            elif all(c.isalpha() for c in chars):
-                if all(c.isupper() for c in chars):
-                    pattern_parts.append("[A-Z]")
-                elif all(c.islower() for c in chars):
-                    pattern_parts.append("[a-z]")
+            all_digit = all_values(str.isdigit)
+            all_alpha = all_values(str.isalpha)
+            all_upper = all_values(str.isupper)
+            all_lower = all_values(str.islower)
+            all_special = all_values(lambda c: c in '@._-+')
+            
+            for i in range(min_length):
+                if all_digit[i]:
+                    pattern_parts.append("\\d")
+                elif all_alpha[i]:
+                    if all_upper[i]:
+                        pattern_parts.append("[A-Z]")
+                    elif all_lower[i]:
+                        pattern_parts.append("[a-z]")
+                    else:
+                        pattern_parts.append("[A-Za-z]")
+                elif all_special[i]:
+                    pattern_parts.append(re.escape(values[0][i]))
                 else:
-                    pattern_parts.append("[A-Za-z]")
-            elif all(c in '@._-+' for c in chars):
-                pattern_parts.append(re.escape(chars[0]))
-            else:
-                pattern_parts.append(".")
+                    pattern_parts.append(".")
         
         # Add flexible ending
         pattern = ''.join(pattern_parts)
@@ -1,17 +1,154 @@
 # src/connectors/api/auth_manager.py
 
 import os
+import re
 import json
+import asyncio
 import time
 import logging
 import datetime
-from typing import Dict, List, Optional, Any, Union, Callable
-import requests
+from typing import Dict, List, Optional, Any, Union, Callable, Mapping, Tuple
 from urllib.parse import urlencode
 import base64
 import hashlib
 import secrets
 import threading
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from types import MappingProxyType
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+except ImportError:
+    Fernet = None
+
+
+def _import_aiohttp() -> Any:
+    """Import aiohttp, only needed by the asynchronous methods, on their first use."""
+    try:
+        import aiohttp
+    except ImportError:
+        raise ImportError("Asynchronous token refresh requires the aiohttp package") from None
+    
+    return aiohttp
+
+
+# Service names that can be used in token file names as they are
+_RE_PLAIN_SERVICE_NAME = re.compile(r'[\w.-]{1,100}')
+
+
+@functools.lru_cache(maxsize=1024)
+def _token_file_name(service_name: str) -> str:
+    """
+    Get the name of a service's token file.
+    
+    Plain names are used as they are, as they always have been. Other names,
+    such as paths, URLs or JSON, are replaced by a keyed BLAKE2b hash, so they
+    can't point outside the storage directory or exceed file name limits.
+    """
+    if _RE_PLAIN_SERVICE_NAME.fullmatch(service_name):
+        return f"{service_name}_token.json"
+    
+    digest = hashlib.blake2b(service_name.encode('utf-8'), digest_size=16, key=b'service-token').hexdigest()
+    return f"{digest}_token.json"
+
+
+def _expiry_timestamp(value: Any) -> Optional[float]:
+    """
+    Convert a token expiry to Unix seconds.
+    
+    Args:
+        value: Expiry as Unix seconds, a datetime or an ISO format string
+        
+    Returns:
+        Optional[float]: Expiry in Unix seconds, or None if it can't be read
+    """
+    if isinstance(value, datetime.datetime):
+        return value.timestamp()
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+def _monotonic_deadline(expires_at: float) -> float:
+    """
+    Convert an expiry in Unix seconds to the time.monotonic() reading it
+    corresponds to now. Expiries are persisted in wall-clock time, since
+    monotonic readings don't survive restarts, and converted once when stored.
+    """
+    return expires_at - time.time() + time.monotonic()
+
+
+class _ReadWriteLock:
+    """
+    Lock that any number of readers can hold at once, or a single writer.
+    
+    Waiting writers go before new readers, so a steady stream of reads can't
+    starve them. The lock is not reentrant, for readers or the writer; code
+    running under it calls the *_locked variants of locking methods. Using
+    the lock itself as a context manager acquires it for writing.
+    """
+    
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writing = False
+        self._writers_waiting = 0
+    
+    @contextmanager
+    def read(self):
+        """Hold the lock for reading."""
+        with self._condition:
+            while self._writing or self._writers_waiting:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+    
+    @contextmanager
+    def write(self):
+        """Hold the lock for writing."""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+    
+    def acquire(self) -> None:
+        """Acquire the lock for writing."""
+        with self._condition:
+            self._writers_waiting += 1
+            while self._writing or self._readers:
+                self._condition.wait()
+            self._writers_waiting -= 1
+            self._writing = True
+    
+    def release(self) -> None:
+        """Release the lock after acquire."""
+        with self._condition:
+            self._writing = False
+            self._condition.notify_all()
+    
+    __enter__ = acquire
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
 
 
 class AuthenticationManager:
@@ -20,18 +157,35 @@ class AuthenticationManager:
     flows for multiple APIs and services.
     """
     
-    def __init__(self, storage_dir: str = None, encrypt_tokens: bool = False):
+    def __init__(self, storage_dir: str = None, encrypt_tokens: bool = False,
+                 background_refresh: bool = True, encryption_key: Optional[Union[str, bytes]] = None):
         """
         Initialize the authentication manager.
         
         Args:
             storage_dir: Directory to store authentication tokens
             encrypt_tokens: Whether to encrypt stored tokens
+            background_refresh: Whether to refresh tokens in the background
+                shortly before they expire
+            encryption_key: Fernet key to encrypt stored tokens with (see
+                cryptography.fernet.Fernet.generate_key), required when
+                encrypt_tokens is set
         """
         self.storage_dir = storage_dir
         self.encrypt_tokens = encrypt_tokens
+        self.background_refresh = background_refresh
         self.logger = logging.getLogger(__name__)
         
+        # Cipher for stored tokens, created once and reused for every save and load
+        self._fernet = None
+        if encrypt_tokens:
+            if Fernet is None:
+                raise ImportError("Token encryption requires the cryptography package")
+            if encryption_key is None:
+                # A generated key would be lost on restart, along with every token saved with it
+                raise ValueError("Token encryption requires an encryption_key")
+            self._fernet = Fernet(encryption_key)
+        
         # Dictionary to store credentials for different services
         self.credentials = {}
         
@@ -41,15 +195,38 @@ class AuthenticationManager:
         # Dictionary to store auth-related configurations
         self.auth_configs = {}
         
-        # Lock for thread safety
-        self.lock = threading.RLock()
+        # Request settings derived from each service's credentials and
+        # configuration, computed once at registration
+        self._service_settings = {}
+        
+        # Access token and expiry of each stored token, read without the lock
+        # by get_access_token. The expiry is a time.monotonic() reading, so
+        # system clock adjustments can't expire tokens early or keep them alive.
+        self._access_tokens = {}
+        
+        # Lock for thread safety; lookups only need to hold it for reading,
+        # so concurrent scrapers can read tokens at the same time. It guards
+        # registering services, while each registered service's tokens are
+        # guarded by a lock of its own, so work on one service doesn't wait
+        # for another.
+        self.lock = _ReadWriteLock()
+        self._service_locks = {}
+        
+        # Shared session, so token requests reuse pooled keep-alive connections
+        # instead of opening a new TCP and TLS connection each time. It is
+        # created on the first request; see _get_session.
+        self._session = None
+        self._session_lock = threading.Lock()
+        
+        # Timers refreshing each service's token before it expires
+        self._refresh_timers = {}
         
         # Create storage directory if it doesn't exist
         if storage_dir:
             os.makedirs(storage_dir, exist_ok=True)
     
     def register_service(self, service_name: str, credentials: Dict[str, str], 
-                       auth_config: Dict[str, Any]) -> bool:
+                       auth_config: Dict[str, Any], defer_load: bool = False) -> bool:
         """
         Register a service with its credentials and authentication configuration.
         
@@ -57,22 +234,155 @@ class AuthenticationManager:
             service_name: Name of the service
             credentials: Dictionary of credentials (client_id, client_secret, etc.)
             auth_config: Authentication configuration (auth_url, token_url, scopes, etc.)
+            defer_load: Whether to leave loading the stored token to the caller
             
         Returns:
             bool: True if registration was successful
         """
-        with self.lock:
-            try:
-                self.credentials[service_name] = credentials
-                self.auth_configs[service_name] = auth_config
-                
-                # Try to load existing token
-                self._load_token(service_name)
-                
-                return True
-            except Exception as e:
-                self.logger.error(f"Error registering service {service_name}: {str(e)}")
-                return False
+        with self.lock.write():
+            service_lock = self._service_locks.setdefault(service_name, _ReadWriteLock())
+            with service_lock.write():
+                try:
+                    self.credentials[service_name] = credentials
+                    self.auth_configs[service_name] = auth_config
+                    self._service_settings[service_name] = self._prepare_settings(credentials, auth_config)
+                    
+                    # Try to load existing token
+                    if not defer_load:
+                        self._load_token(service_name)
+                    
+                    return True
+                except Exception as e:
+                    self.logger.error(f"Error registering service {service_name}: {str(e)}")
+                    return False
+    
+    def bulk_register(self, services: List[Dict[str, Any]]) -> Dict[str, bool]:
+        """
+        Register several services, then load their stored tokens together.
+        
+        Args:
+            services: register_service arguments for each service (service_name,
+                credentials, auth_config)
+            
+        Returns:
+            Dict[str, bool]: Whether each service was registered successfully
+        """
+        results = {}
+        for service in services:
+            results[service['service_name']] = self.register_service(**service, defer_load=True)
+        
+        self._bulk_load([service_name for service_name, registered in results.items() if registered])
+        
+        return results
+    
+    def _bulk_load(self, service_names: List[str]) -> None:
+        """
+        Load the stored tokens of several services, listing the storage
+        directory once and reading the token files on a thread pool.
+        """
+        if not self.storage_dir or not service_names:
+            return
+        
+        try:
+            with os.scandir(self.storage_dir) as entries:
+                file_names = {entry.name for entry in entries if entry.is_file()}
+        except OSError as e:
+            self.logger.error(f"Error listing token directory {self.storage_dir}: {str(e)}")
+            return
+        
+        # Tokens still stored under a name from before it was hashed are
+        # loaded, and migrated, too
+        stored = [service_name for service_name in service_names
+                  if _token_file_name(service_name) in file_names
+                  or self._legacy_token_path(service_name) is not None]
+        if not stored:
+            return
+        
+        def load(service_name):
+            with self._service_lock(service_name).write():
+                return self._load_token(service_name)
+        
+        # Reading the files is I/O bound, so threads overlap it despite the GIL
+        with ThreadPoolExecutor(max_workers=min(8, len(stored))) as executor:
+            list(executor.map(load, stored))
+    
+    def _service_lock(self, service_name: str) -> _ReadWriteLock:
+        """Get the lock guarding a service's tokens; services that aren't registered share the main lock."""
+        return self._service_locks.get(service_name, self.lock)
+    
+    @staticmethod
+    def _prepare_settings(credentials: Dict[str, str], auth_config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Work out the parts of token requests that only depend on a service's
+        credentials and configuration.
+        
+        Args:
+            credentials: Dictionary of credentials (client_id, client_secret, etc.)
+            auth_config: Authentication configuration
+            
+        Returns:
+            Dict[str, Any]: The client fields sent with every request
+                ('client_data'), the client fields and headers of token
+                requests ('token_client_data', 'token_headers'), and the
+                configured scopes formatted for authorization URLs ('scope')
+                and client credentials requests ('token_scope'), or None, and
+                the API header format split around the token ('header_parts'),
+                or None if it has to be filled in with str.format
+        """
+        client_data = {
+            'client_id': credentials.get('client_id'),
+            'client_secret': credentials.get('client_secret')
+        }
+        settings = {
+            'client_data': client_data,
+            'token_client_data': client_data,
+            'token_headers': {}
+        }
+        
+        scope_format = auth_config.get('scope_format', 'space')
+        settings['scope'] = AuthenticationManager._format_scopes(auth_config.get('scopes', []), scope_format)
+        # Client credentials requests only send space or comma separated scopes
+        settings['token_scope'] = settings['scope'] if scope_format in ('space', 'comma') else None
+        
+        # Formats with a single {token} field and no other braces are just the
+        # text around the token
+        prefix, field, suffix = auth_config.get('header_format', 'Bearer {token}').partition('{token}')
+        plain = field and '{' not in prefix + suffix and '}' not in prefix + suffix
+        settings['header_parts'] = (prefix, suffix) if plain else None
+        
+        # Handle different auth methods
+        if auth_config.get('auth_method', 'params') == 'basic':
+            # HTTP Basic Auth, instead of sending the client in the data
+            auth_string = f"{credentials.get('client_id')}:{credentials.get('client_secret')}"
+            encoded_auth = base64.b64encode(auth_string.encode('utf-8')).decode('utf-8')
+            settings['token_headers'] = {'Authorization': f"Basic {encoded_auth}"}
+            settings['token_client_data'] = {}
+        
+        return settings
+    
+    @staticmethod
+    def _format_scopes(scopes: Optional[List[str]], scope_format: str) -> Optional[str]:
+        """
+        Format permission scopes into a scope parameter.
+        
+        Args:
+            scopes: List of permission scopes
+            scope_format: How the service separates scopes ('space', 'comma' or 'multiple')
+            
+        Returns:
+            Optional[str]: Scope parameter, or None if there are no scopes or the format is unknown
+        """
+        if not scopes:
+            return None
+        
+        # Different services format scopes differently; services taking
+        # multiple scope parameters still get them space separated
+        if scope_format in ('space', 'multiple'):
+            return ' '.join(scopes)
+        elif scope_format == 'comma':
+            return ','.join(scopes)
+        
+        return None
     
     def get_auth_url(self, service_name: str, scopes: Optional[List[str]] = None, 
                    state: Optional[str] = None, redirect_uri: Optional[str] = None) -> str:
@@ -88,7 +398,7 @@ class AuthenticationManager:
         Returns:
             str: Authorization URL
         """
-        with self.lock:
+        with self._service_lock(service_name).read():
             if service_name not in self.auth_configs:
                 raise ValueError(f"Service {service_name} not registered")
                 
@@ -104,10 +414,6 @@ class AuthenticationManager:
             if not auth_url:
                 raise ValueError(f"Service {service_name} has no auth_url configured")
                 
-            # Use provided scopes or fall back to config
-            if not scopes:
-                scopes = config.get('scopes', [])
-                
             # Use provided redirect_uri or fall back to config
             if not redirect_uri:
                 redirect_uri = config.get('redirect_uri')
@@ -120,21 +426,13 @@ class AuthenticationManager:
                 'state': state
             }
             
-            # Add scopes if specified
+            # Use provided scopes or fall back to the ones formatted from config
             if scopes:
-                # Different services format scopes differently
-                scope_format = config.get('scope_format', 'space')
-                if scope_format == 'space':
-                    params['scope'] = ' '.join(scopes)
-                elif scope_format == 'comma':
-                    params['scope'] = ','.join(scopes)
-                elif scope_format == 'multiple':
-                    # Some APIs use multiple scope parameters
-                    for scope in scopes:
-                        if 'scope' not in params:
-                            params['scope'] = scope
-                        else:
-                            params['scope'] += ' ' + scope
+                scope = self._format_scopes(scopes, config.get('scope_format', 'space'))
+            else:
+                scope = self._service_settings[service_name]['scope']
+            if scope is not None:
+                params['scope'] = scope
             
             # Add service-specific parameters
             additional_params = config.get('auth_params', {})
@@ -157,64 +455,20 @@ class AuthenticationManager:
         Returns:
             bool: True if successful
         """
-        with self.lock:
+        with self._service_lock(service_name).write():
             if service_name not in self.auth_configs:
                 raise ValueError(f"Service {service_name} not registered")
-                
-            config = self.auth_configs[service_name]
-            creds = self.credentials[service_name]
             
-            # Get the token endpoint
-            token_url = config.get('token_url')
-            if not token_url:
-                raise ValueError(f"Service {service_name} has no token_url configured")
-                
             # Use provided redirect_uri or fall back to config
             if not redirect_uri:
-                redirect_uri = config.get('redirect_uri')
+                redirect_uri = self.auth_configs[service_name].get('redirect_uri')
             
-            # Build the request data
             data = {
                 'grant_type': 'authorization_code',
                 'code': code,
-                'client_id': creds.get('client_id'),
-                'client_secret': creds.get('client_secret'),
                 'redirect_uri': redirect_uri
             }
-            
-            # Add service-specific parameters
-            additional_params = config.get('token_params', {})
-            data.update(additional_params)
-            
-            # Handle different auth methods
-            auth_method = config.get('auth_method', 'params')
-            headers = {}
-            
-            if auth_method == 'basic':
-                # HTTP Basic Auth
-                auth_string = f"{creds.get('client_id')}:{creds.get('client_secret')}"
-                encoded_auth = base64.b64encode(auth_string.encode('utf-8')).decode('utf-8')
-                headers['Authorization'] = f"Basic {encoded_auth}"
-                # Remove from data when using basic auth
-                if 'client_secret' in data:
-                    del data['client_secret']
-                if 'client_id' in data:
-                    del data['client_id']
-            
-            # Make the request
-            try:
-                response = requests.post(token_url, data=data, headers=headers)
-                response.raise_for_status()
-                
-                token_data = response.json()
-                
-                # Store the token
-                self._process_and_store_token(service_name, token_data)
-                
-                return True
-            except Exception as e:
-                self.logger.error(f"Error getting token for {service_name}: {str(e)}")
-                return False
+            return self._token_request(service_name, data, 'token_params', "getting token")
     
     def get_client_credentials_token(self, service_name: str) -> bool:
         """
@@ -226,68 +480,18 @@ class AuthenticationManager:
         Returns:
             bool: True if successful
         """
-        with self.lock:
+        with self._service_lock(service_name).write():
             if service_name not in self.auth_configs:
                 raise ValueError(f"Service {service_name} not registered")
-                
-            config = self.auth_configs[service_name]
-            creds = self.credentials[service_name]
-            
-            # Get the token endpoint
-            token_url = config.get('token_url')
-            if not token_url:
-                raise ValueError(f"Service {service_name} has no token_url configured")
             
-            # Build the request data
-            data = {
-                'grant_type': 'client_credentials',
-                'client_id': creds.get('client_id'),
-                'client_secret': creds.get('client_secret')
-            }
+            data = {'grant_type': 'client_credentials'}
             
             # Add scopes if specified
-            scopes = config.get('scopes', [])
-            if scopes:
-                # Different services format scopes differently
-                scope_format = config.get('scope_format', 'space')
-                if scope_format == 'space':
-                    data['scope'] = ' '.join(scopes)
-                elif scope_format == 'comma':
-                    data['scope'] = ','.join(scopes)
+            token_scope = self._service_settings[service_name]['token_scope']
+            if token_scope is not None:
+                data['scope'] = token_scope
             
-            # Add service-specific parameters
-            additional_params = config.get('token_params', {})
-            data.update(additional_params)
-            
-            # Handle different auth methods
-            auth_method = config.get('auth_method', 'params')
-            headers = {}
-            
-            if auth_method == 'basic':
-                # HTTP Basic Auth
-                auth_string = f"{creds.get('client_id')}:{creds.get('client_secret')}"
-                encoded_auth = base64.b64encode(auth_string.encode('utf-8')).decode('utf-8')
-                headers['Authorization'] = f"Basic {encoded_auth}"
-                # Remove from data when using basic auth
-                if 'client_secret' in data:
-                    del data['client_secret']
-                if 'client_id' in data:
-                    del data['client_id']
-            
-            # Make the request
-            try:
-                response = requests.post(token_url, data=data, headers=headers)
-                response.raise_for_status()
-                
-                token_data = response.json()
-                
-                # Store the token
-                self._process_and_store_token(service_name, token_data)
-                
-                return True
-            except Exception as e:
-                self.logger.error(f"Error getting client credentials token for {service_name}: {str(e)}")
-                return False
+            return self._token_request(service_name, data, 'token_params', "getting client credentials token")
     
     def refresh_token(self, service_name: str) -> bool:
         """
@@ -299,70 +503,211 @@ class AuthenticationManager:
         Returns:
             bool: True if successful
         """
-        with self.lock:
+        with self._service_lock(service_name).write():
+            return self._refresh_token_locked(service_name)
+    
+    def _refresh_token_locked(self, service_name: str) -> bool:
+        """refresh_token for callers already holding the service's lock for writing."""
+        if service_name not in self.auth_configs or service_name not in self.tokens:
+            return False
+        
+        # Check if refresh token exists
+        refresh_token = self.tokens[service_name].get('refresh_token')
+        if not refresh_token:
+            self.logger.warning(f"No refresh token available for {service_name}")
+            return False
+        
+        data = {
+            'grant_type': 'refresh_token',
+            'refresh_token': refresh_token
+        }
+        return self._token_request(service_name, data, 'refresh_params', "refreshing token",
+                                   refresh_token=refresh_token)
+    
+    def _token_request(self, service_name: str, data: Dict[str, Any], params_key: str,
+                       action: str, refresh_token: Optional[str] = None) -> bool:
+        """
+        Request a token from a service's token endpoint and store it. The caller
+        holds the lock for writing.
+        
+        Args:
+            service_name: Name of the service
+            data: Flow-specific request data
+            params_key: Config key of the service-specific parameters to add
+            action: What the request does, for the error log
+            refresh_token: Refresh token to keep if the response has none
+            
+        Returns:
+            bool: True if successful
+        """
+        token_url, data, headers = self._build_token_request(service_name, data, params_key)
+        
+        # Make the request
+        try:
+            response = self._get_session().post(token_url, data=data, headers=headers)
+            response.raise_for_status()
+            
+            self._store_token_response(service_name, response.json(), refresh_token)
+            
+            return True
+        except Exception as e:
+            self.logger.error(f"Error {action} for {service_name}: {str(e)}")
+            return False
+    
+    def _build_token_request(self, service_name: str, data: Dict[str, Any],
+                             params_key: str) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
+        """
+        Complete the request data for a service's token endpoint.
+        
+        Args:
+            service_name: Name of the service
+            data: Flow-specific request data, completed in place
+            params_key: Config key of the service-specific parameters to add
+            
+        Returns:
+            Tuple[str, Dict[str, Any], Dict[str, str]]: Token endpoint, request data and headers
+        """
+        config = self.auth_configs[service_name]
+        settings = self._service_settings[service_name]
+        
+        # Get the token endpoint
+        token_url = config.get('token_url')
+        if not token_url:
+            raise ValueError(f"Service {service_name} has no token_url configured")
+        
+        # Add the client, unless it authenticates with HTTP Basic Auth, and service-specific parameters
+        data.update(settings['token_client_data'])
+        data.update(config.get(params_key, {}))
+        
+        return token_url, data, settings['token_headers']
+    
+    def _store_token_response(self, service_name: str, token_data: Dict[str, Any],
+                              refresh_token: Optional[str]) -> None:
+        """Store the token a token endpoint returned, keeping the refresh token it replaces if it has none."""
+        # Some services don't return the refresh token again, preserve it
+        if refresh_token and 'refresh_token' not in token_data:
+            token_data['refresh_token'] = refresh_token
+        
+        # Store the token
+        self._process_and_store_token(service_name, token_data)
+    
+    async def refresh_token_async(self, service_name: str, session: Optional[Any] = None) -> bool:
+        """
+        Refresh an access token using a refresh token, without blocking the event loop.
+        
+        The service's lock is only held to build the request and to store the
+        new token, not while the request is in flight. It is acquired on an
+        executor thread, as a synchronous refresh may hold it for a whole
+        round trip to the token endpoint.
+        
+        Args:
+            service_name: Name of the service
+            session: aiohttp.ClientSession to send the request with; a temporary
+                one is used if not given
+            
+        Returns:
+            bool: True if successful
+        """
+        aiohttp = _import_aiohttp()
+        loop = asyncio.get_running_loop()
+        
+        request = await loop.run_in_executor(None, self._build_refresh_request, service_name)
+        if request is None:
+            return False
+        token_url, data, headers, refresh_token = request
+        
+        # aiohttp can't encode None form values; requests leaves them out
+        data = {key: value for key, value in data.items() if value is not None}
+        
+        try:
+            if session is None:
+                async with aiohttp.ClientSession() as session:
+                    token_data = await self._post_token_request_async(session, token_url, data, headers)
+            else:
+                token_data = await self._post_token_request_async(session, token_url, data, headers)
+        except Exception as e:
+            self.logger.error(f"Error refreshing token for {service_name}: {str(e)}")
+            return False
+        
+        return await loop.run_in_executor(None, self._store_refreshed_token,
+                                          service_name, token_data, refresh_token)
+    
+    def _build_refresh_request(self, service_name: str) -> Optional[Tuple[str, Dict[str, Any], Dict[str, str], str]]:
+        """
+        Build the token request of refresh_token_async under the service's lock.
+        
+        Args:
+            service_name: Name of the service
+            
+        Returns:
+            Optional[Tuple[str, Dict[str, Any], Dict[str, str], str]]: Token endpoint,
+                request data, headers and the refresh token, or None if the
+                service has no token to refresh
+        """
+        with self._service_lock(service_name).read():
             if service_name not in self.auth_configs or service_name not in self.tokens:
-                return False
-                
-            config = self.auth_configs[service_name]
-            creds = self.credentials[service_name]
-            token_data = self.tokens[service_name]
+                return None
             
             # Check if refresh token exists
-            refresh_token = token_data.get('refresh_token')
+            refresh_token = self.tokens[service_name].get('refresh_token')
             if not refresh_token:
                 self.logger.warning(f"No refresh token available for {service_name}")
-                return False
-                
-            # Get the token endpoint
-            token_url = config.get('token_url')
-            if not token_url:
-                raise ValueError(f"Service {service_name} has no token_url configured")
+                return None
             
-            # Build the request data
             data = {
                 'grant_type': 'refresh_token',
-                'refresh_token': refresh_token,
-                'client_id': creds.get('client_id'),
-                'client_secret': creds.get('client_secret')
+                'refresh_token': refresh_token
             }
-            
-            # Add service-specific parameters
-            additional_params = config.get('refresh_params', {})
-            data.update(additional_params)
-            
-            # Handle different auth methods
-            auth_method = config.get('auth_method', 'params')
-            headers = {}
-            
-            if auth_method == 'basic':
-                # HTTP Basic Auth
-                auth_string = f"{creds.get('client_id')}:{creds.get('client_secret')}"
-                encoded_auth = base64.b64encode(auth_string.encode('utf-8')).decode('utf-8')
-                headers['Authorization'] = f"Basic {encoded_auth}"
-                # Remove from data when using basic auth
-                if 'client_secret' in data:
-                    del data['client_secret']
-                if 'client_id' in data:
-                    del data['client_id']
-            
-            # Make the request
-            try:
-                response = requests.post(token_url, data=data, headers=headers)
-                response.raise_for_status()
-                
-                new_token_data = response.json()
-                
-                # Some services don't return the refresh token again, preserve it
-                if 'refresh_token' not in new_token_data and refresh_token:
-                    new_token_data['refresh_token'] = refresh_token
-                
-                # Store the token
-                self._process_and_store_token(service_name, new_token_data)
-                
-                return True
-            except Exception as e:
-                self.logger.error(f"Error refreshing token for {service_name}: {str(e)}")
+            token_url, data, headers = self._build_token_request(service_name, data, 'refresh_params')
+        
+        return token_url, data, headers, refresh_token
+    
+    def _store_refreshed_token(self, service_name: str, token_data: Dict[str, Any],
+                               refresh_token: str) -> bool:
+        """Store the token refresh_token_async got, under the service's lock."""
+        with self._service_lock(service_name).write():
+            # Don't bring back a token that was logged out during the request
+            if service_name not in self.tokens:
                 return False
+            
+            self._store_token_response(service_name, token_data, refresh_token)
+            return True
+    
+    @staticmethod
+    async def _post_token_request_async(session: Any, token_url: str, data: Dict[str, Any],
+                                        headers: Dict[str, str]) -> Dict[str, Any]:
+        """Post a token request with aiohttp and return the token data of the response."""
+        async with session.post(token_url, data=data, headers=headers) as response:
+            response.raise_for_status()
+            return await response.json(content_type=None)
+    
+    async def refresh_all_due(self, within: float = 600) -> Dict[str, bool]:
+        """
+        Refresh, concurrently, every token with a refresh token that expires soon.
+        
+        Args:
+            within: Refresh tokens expiring within this many seconds
+            
+        Returns:
+            Dict[str, bool]: Whether each refreshed service's token was refreshed
+        """
+        aiohttp = _import_aiohttp()
+        
+        now = time.monotonic()
+        due = [service_name for service_name in self.get_registered_services()
+               if self.tokens.get(service_name, {}).get('refresh_token')
+               and self._expiry_deadline(service_name) - now < within]
+        if not due:
+            return {}
+        
+        # One pooled connector for the whole sweep; sessions belong to the
+        # running event loop, so one isn't kept between sweeps
+        connector = aiohttp.TCPConnector(limit=20, ttl_dns_cache=300)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            results = await asyncio.gather(*(self.refresh_token_async(service_name, session)
+                                             for service_name in due))
+        
+        return dict(zip(due, results))
     
     def get_access_token(self, service_name: str, auto_refresh: bool = True) -> Optional[str]:
         """
@@ -375,32 +720,90 @@ class AuthenticationManager:
         Returns:
             Optional[str]: Access token or None if not available
         """
-        with self.lock:
+        # Tokens that aren't about to expire are returned without locking;
+        # each entry is replaced as a whole, so it is never seen half-updated
+        access_token = self._access_tokens.get(service_name)
+        if access_token is not None and access_token[1] - time.monotonic() > 300:
+            return access_token[0]
+        
+        with self._service_lock(service_name).read():
             if service_name not in self.tokens:
                 return None
                 
             token_data = self.tokens[service_name]
             
-            # Check if token is expired
-            if 'expires_at' in token_data:
-                expires_at = token_data['expires_at']
-                if isinstance(expires_at, str):
-                    expires_at = datetime.datetime.fromisoformat(expires_at)
-                
-                # Check if token is expired or about to expire (within 5 minutes)
-                if expires_at <= (datetime.datetime.now() + datetime.timedelta(minutes=5)):
-                    if auto_refresh and 'refresh_token' in token_data:
-                        success = self.refresh_token(service_name)
-                        if not success:
-                            self.logger.warning(f"Failed to refresh token for {service_name}")
-                            return None
-                    else:
-                        self.logger.warning(f"Token for {service_name} is expired")
-                        return None
+            # Check if token is expired or about to expire (within 5 minutes)
+            if self._expiry_deadline(service_name) - time.monotonic() > 300:
+                return token_data.get('access_token')
             
-            return token_data.get('access_token')
+            if not (auto_refresh and 'refresh_token' in token_data):
+                self.logger.warning(f"Token for {service_name} is expired")
+                return None
+        
+        # A read lock can't be upgraded, so refresh after releasing it. Another
+        # thread may have refreshed the token in between.
+        with self._service_lock(service_name).write():
+            token_data = self.tokens.get(service_name)
+            if token_data is not None and self._expiry_deadline(service_name) - time.monotonic() <= 300:
+                if not self._refresh_token_locked(service_name):
+                    self.logger.warning(f"Failed to refresh token for {service_name}")
+                    return None
+                token_data = self.tokens.get(service_name)
+            
+            return token_data.get('access_token') if token_data is not None else None
+    
+    def _get_session(self) -> Any:
+        """
+        Get the pooled requests.Session, creating it on first use.
+        
+        requests (with urllib3 and its other dependencies) is only imported
+        here, so using tokens that are already stored doesn't pay for it.
+        """
+        session = self._session
+        if session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    from requests.packages.urllib3.util.retry import Retry
+                    
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=10,
+                        pool_maxsize=20,
+                        max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504])
+                    )
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    self._session = session
+                session = self._session
+        
+        return session
+    
+    def _expiry_deadline(self, service_name: str) -> float:
+        """Get the time.monotonic() reading at which a service's stored token expires."""
+        access_token = self._access_tokens.get(service_name)
+        if access_token is None:
+            # The token wasn't stored through _set_token
+            return _monotonic_deadline(self._expiry_time(self.tokens.get(service_name, {})))
+        
+        return access_token[1]
     
-    def get_full_token(self, service_name: str) -> Optional[Dict[str, Any]]:
+    @staticmethod
+    def _expiry_time(token_data: Dict[str, Any]) -> float:
+        """
+        Get when a stored token expires, in Unix seconds.
+        
+        Tokens without expiration info never expire, and ones whose expiry
+        couldn't be read are treated as expired.
+        """
+        if 'expires_at' not in token_data:
+            return float('inf')
+        
+        expires_at = token_data['expires_at']
+        return expires_at if isinstance(expires_at, float) else 0.0
+    
+    def get_full_token(self, service_name: str) -> Optional[Mapping[str, Any]]:
         """
         Get the full token data for a service.
         
@@ -408,13 +811,17 @@ class AuthenticationManager:
             service_name: Name of the service
             
         Returns:
-            Optional[Dict[str, Any]]: Token data or None if not available
+            Optional[Mapping[str, Any]]: Read-only view of the token data, or
+                None if not available; its expires_at is in Unix seconds. Use
+                dict(view) for a copy that can be modified.
         """
-        with self.lock:
+        with self._service_lock(service_name).read():
             if service_name not in self.tokens:
                 return None
-                
-            return self.tokens[service_name].copy()
+            
+            # Stored token dicts are replaced rather than modified, so the view
+            # can be handed out without copying
+            return MappingProxyType(self.tokens[service_name])
     
     def is_authenticated(self, service_name: str) -> bool:
         """
@@ -426,7 +833,13 @@ class AuthenticationManager:
         Returns:
             bool: True if authenticated
         """
-        with self.lock:
+        # Tokens stored through _set_token are checked without locking, from
+        # the access token and expiry cached for get_access_token
+        access_token = self._access_tokens.get(service_name)
+        if access_token is not None:
+            return bool(access_token[0]) and access_token[1] > time.monotonic()
+        
+        with self._service_lock(service_name).read():
             # Check if the service has a token
             if service_name not in self.tokens:
                 return False
@@ -434,13 +847,8 @@ class AuthenticationManager:
             token_data = self.tokens[service_name]
             
             # Check if token is expired
-            if 'expires_at' in token_data:
-                expires_at = token_data['expires_at']
-                if isinstance(expires_at, str):
-                    expires_at = datetime.datetime.fromisoformat(expires_at)
-                
-                if expires_at <= datetime.datetime.now():
-                    return False
+            if self._expiry_deadline(service_name) <= time.monotonic():
+                return False
             
             # Check if token has an access token
             if 'access_token' not in token_data or not token_data['access_token']:
@@ -458,44 +866,104 @@ class AuthenticationManager:
         Returns:
             bool: True if successful
         """
-        with self.lock:
-            if service_name in self.tokens:
-                del self.tokens[service_name]
-                
-                # Remove token file if it exists
-                if self.storage_dir:
-                    token_path = os.path.join(self.storage_dir, f"{service_name}_token.json")
-                    if os.path.exists(token_path):
-                        try:
-                            os.remove(token_path)
-                        except Exception as e:
-                            self.logger.error(f"Error removing token file for {service_name}: {str(e)}")
-                
-                return True
-            return False
+        with self._service_lock(service_name).write():
+            return self._logout_locked(service_name)
+    
+    def _logout_locked(self, service_name: str) -> bool:
+        """logout for callers already holding the service's lock for writing."""
+        if service_name in self.tokens:
+            del self.tokens[service_name]
+            self._access_tokens.pop(service_name, None)
+            self._cancel_refresh(service_name)
+            
+            # Remove token file if it exists
+            if self.storage_dir:
+                try:
+                    os.remove(os.path.join(self.storage_dir, _token_file_name(service_name)))
+                except FileNotFoundError:
+                    pass
+                except Exception as e:
+                    self.logger.error(f"Error removing token file for {service_name}: {str(e)}")
+            
+            return True
+        return False
     
     def _process_and_store_token(self, service_name: str, token_data: Dict[str, Any]) -> None:
         """Process and store a token."""
         # Calculate expiration time if not provided
         if 'expires_at' not in token_data and 'expires_in' in token_data:
-            expires_in = token_data['expires_in']
-            expires_at = datetime.datetime.now() + datetime.timedelta(seconds=expires_in)
-            token_data['expires_at'] = expires_at
+            token_data['expires_at'] = time.time() + float(token_data['expires_in'])
         
         # Store the token
-        self.tokens[service_name] = token_data
+        self._set_token(service_name, token_data)
         
         # Save to file if storage directory is specified
         if self.storage_dir:
             self._save_token(service_name)
     
+    def _set_token(self, service_name: str, token_data: Dict[str, Any]) -> None:
+        """Store a service's token, updating the fast lookup and scheduled refresh derived from it."""
+        # Keep the expiry in Unix seconds, so checking it is a float comparison
+        if 'expires_at' in token_data:
+            expires_at = _expiry_timestamp(token_data['expires_at'])
+            if expires_at is not None:
+                token_data['expires_at'] = expires_at
+            else:
+                self.logger.warning(f"Could not read expiry of token for {service_name}, treating it as expired")
+        
+        self.tokens[service_name] = token_data
+        self._access_tokens[service_name] = (token_data.get('access_token'),
+                                             _monotonic_deadline(self._expiry_time(token_data)))
+        self._schedule_refresh(service_name)
+    
+    def _schedule_refresh(self, service_name: str) -> None:
+        """
+        Schedule a background refresh of a service's token 5 minutes before it
+        expires, or halfway through its remaining lifetime if that is shorter,
+        replacing any refresh already scheduled for the service.
+        
+        get_access_token then finds a fresh token instead of refreshing it while
+        the caller waits. Tokens without a refresh token or expiry are not refreshed.
+        """
+        self._cancel_refresh(service_name)
+        
+        if not self.background_refresh:
+            return
+        
+        token_data = self.tokens.get(service_name, {})
+        deadline = self._expiry_deadline(service_name)
+        if not token_data.get('refresh_token') or deadline == float('inf'):
+            return
+        
+        # Short-lived tokens are refreshed no more than once per half lifetime,
+        # and none sooner than 30 seconds after the token was stored, so their
+        # refreshes can't run back to back
+        lifetime = deadline - time.monotonic()
+        delay = max(30, lifetime - min(300, lifetime / 2))
+        timer = threading.Timer(delay, self._background_refresh, args=(service_name,))
+        timer.daemon = True
+        self._refresh_timers[service_name] = timer
+        timer.start()
+    
+    def _cancel_refresh(self, service_name: str) -> None:
+        """Cancel the background refresh scheduled for a service, if any."""
+        timer = self._refresh_timers.pop(service_name, None)
+        if timer is not None:
+            timer.cancel()
+    
+    def _background_refresh(self, service_name: str) -> None:
+        """Refresh a service's token from its timer."""
+        if not self.refresh_token(service_name):
+            # get_access_token will try again when the token is next needed
+            self.logger.warning(f"Background refresh of token for {service_name} failed")
+    
     def _save_token(self, service_name: str) -> bool:
         """Save a token to a file."""
         if not self.storage_dir or service_name not in self.tokens:
             return False
             
         try:
-            token_path = os.path.join(self.storage_dir, f"{service_name}_token.json")
+            token_path = os.path.join(self.storage_dir, _token_file_name(service_name))
             
             # Make a copy of the token data for serialization
             token_data = self.tokens[service_name].copy()
@@ -505,12 +973,25 @@ class AuthenticationManager:
                 if isinstance(value, datetime.datetime):
                     token_data[key] = value.isoformat()
             
+            # Files keep the expiry as a local ISO timestamp
+            if isinstance(token_data.get('expires_at'), float):
+                token_data['expires_at'] = datetime.datetime.fromtimestamp(token_data['expires_at']).isoformat()
+            
             # Encrypt token if configured
             if self.encrypt_tokens:
                 token_data = self._encrypt_token(service_name, token_data)
                 
-            with open(token_path, 'w') as f:
-                json.dump(token_data, f, indent=2)
+            if orjson is not None:
+                payload = orjson.dumps(token_data, option=orjson.OPT_INDENT_2)
+            else:
+                payload = json.dumps(token_data, indent=2).encode('utf-8')
+            
+            # Write to a temporary file and move it into place, so an
+            # interrupted save can't leave a truncated token file behind
+            temp_path = token_path + '.tmp'
+            with open(temp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(temp_path, token_path)
                 
             return True
         except Exception as e:
@@ -522,41 +1003,68 @@ class AuthenticationManager:
         if not self.storage_dir:
             return False
             
-        token_path = os.path.join(self.storage_dir, f"{service_name}_token.json")
+        token_path = os.path.join(self.storage_dir, _token_file_name(service_name))
+        legacy = False
         
         if not os.path.exists(token_path):
-            return False
+            token_path = self._legacy_token_path(service_name)
+            if token_path is None:
+                return False
+            legacy = True
             
         try:
-            with open(token_path, 'r') as f:
-                token_data = json.load(f)
+            with open(token_path, 'rb') as f:
+                payload = f.read()
+            token_data = orjson.loads(payload) if orjson is not None else json.loads(payload)
                 
             # Decrypt token if configured
             if self.encrypt_tokens:
                 token_data = self._decrypt_token(service_name, token_data)
                 
-            # Convert ISO format strings to datetime objects
-            for key, value in token_data.items():
-                if key == 'expires_at' and isinstance(value, str):
-                    try:
-                        token_data[key] = datetime.datetime.fromisoformat(value)
-                    except ValueError:
-                        # If parsing fails, leave as string
-                        pass
-            
-            # Store the token
-            self.tokens[service_name] = token_data
-            
-            return True
+            # Store the token; this also reads the ISO format expiry
+            self._set_token(service_name, token_data)
         except Exception as e:
             self.logger.error(f"Error loading token for {service_name}: {str(e)}")
             return False
+        
+        # Move a valid token from its old file name to the current one
+        if legacy and self._save_token(service_name):
+            try:
+                os.remove(token_path)
+                self.logger.info(f"Migrated stored token for {service_name} to {_token_file_name(service_name)}")
+            except OSError as e:
+                self.logger.warning(f"Error removing old token file of {service_name}: {str(e)}")
+        
+        return True
     
-    def _encrypt_token(self, service_name: str, token_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _legacy_token_path(self, service_name: str) -> Optional[str]:
         """
-        Encrypt token data.
+        Get the file a service's token was stored in before its name was hashed
+        in token file names, if it exists inside the storage directory.
         
-        Note: This is a placeholder. For a production system, implement proper encryption.
+        Args:
+            service_name: Name of the service
+            
+        Returns:
+            Optional[str]: Path of the old token file, or None
+        """
+        # Plain names are still used as they are
+        if _RE_PLAIN_SERVICE_NAME.fullmatch(service_name):
+            return None
+        
+        storage_dir = os.path.realpath(self.storage_dir)
+        try:
+            legacy_path = os.path.realpath(os.path.join(storage_dir, f"{service_name}_token.json"))
+            if os.path.commonpath([storage_dir, legacy_path]) != storage_dir:
+                return None
+        except (ValueError, OSError):
+            return None
+        
+        return legacy_path if os.path.isfile(legacy_path) else None
+    
+    def _encrypt_token(self, service_name: str, token_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Encrypt token data with Fernet (AES in CBC mode with an HMAC).
         
         Args:
             service_name: Name of the service
@@ -565,16 +1073,11 @@ class AuthenticationManager:
         Returns:
             Dict[str, Any]: Encrypted token data
         """
-        # This is a simple placeholder. In a real implementation,
-        # use a proper encryption library like cryptography.
-        # This example just indicates that encryption is needed.
-        
-        # WARNING: Do not use this in production!
-        self.logger.warning("Token encryption not properly implemented. Using placeholder.")
+        plaintext = orjson.dumps(token_data) if orjson is not None else json.dumps(token_data).encode('utf-8')
         
         encrypted_data = {
             "encrypted": True,
-            "data": base64.b64encode(json.dumps(token_data).encode('utf-8')).decode('utf-8'),
+            "data": self._fernet.encrypt(plaintext).decode('ascii'),
             "service": service_name,
             "timestamp": datetime.datetime.now().isoformat()
         }
@@ -585,31 +1088,33 @@ class AuthenticationManager:
         """
         Decrypt token data.
         
-        Note: This is a placeholder. For a production system, implement proper decryption.
-        
         Args:
             service_name: Name of the service
             encrypted_data: Encrypted token data
             
         Returns:
             Dict[str, Any]: Decrypted token data
+            
+        Raises:
+            ValueError: If the token can't be decrypted with this instance's key
         """
-        # This is a simple placeholder. In a real implementation,
-        # use a proper encryption library like cryptography.
-        # This example just indicates that decryption is needed.
-        
-        # WARNING: Do not use this in production!
-        self.logger.warning("Token decryption not properly implemented. Using placeholder.")
-        
         if encrypted_data.get("encrypted", False) and "data" in encrypted_data:
             try:
-                decrypted_json = base64.b64decode(encrypted_data["data"].encode('utf-8')).decode('utf-8')
-                return json.loads(decrypted_json)
-            except Exception as e:
-                self.logger.error(f"Error decrypting token: {str(e)}")
-                return {}
+                plaintext = self._fernet.decrypt(encrypted_data["data"].encode('ascii'))
+            except (InvalidToken, ValueError):
+                # Tokens saved before encryption was implemented were only base64 encoded
+                try:
+                    plaintext = base64.b64decode(encrypted_data["data"].encode('utf-8'), validate=True)
+                    token_data = json.loads(plaintext)
+                except Exception:
+                    raise ValueError("invalid key or data") from None
+                
+                self.logger.warning(f"Token for {service_name} was stored unencrypted, it will be encrypted when next saved")
+                return token_data
+            
+            return orjson.loads(plaintext) if orjson is not None else json.loads(plaintext)
         
-        # If not encrypted or decryption fails, return as is
+        # If not encrypted, return as is
         return encrypted_data
     
     def get_api_header(self, service_name: str, header_name: str = "Authorization") -> Dict[str, str]:
@@ -627,6 +1132,12 @@ class AuthenticationManager:
         if not token:
             return {}
             
+        # Formats split around the token at registration only need concatenating
+        settings = self._service_settings.get(service_name)
+        if settings is not None and settings['header_parts'] is not None and isinstance(token, str):
+            prefix, suffix = settings['header_parts']
+            return {header_name: prefix + token + suffix}
+        
         config = self.auth_configs.get(service_name, {})
         header_format = config.get('header_format', 'Bearer {token}')
         
@@ -643,50 +1154,42 @@ class AuthenticationManager:
         Returns:
             bool: True if successful
         """
-        with self.lock:
+        with self._service_lock(service_name).write():
             if service_name not in self.auth_configs or service_name not in self.tokens:
                 return False
                 
             config = self.auth_configs[service_name]
-            creds = self.credentials[service_name]
+            settings = self._service_settings[service_name]
             token_data = self.tokens[service_name]
             
             # Check if service supports token revocation
             revoke_url = config.get('revoke_url')
             if not revoke_url:
-                return self.logout(service_name)  # Just remove locally if revocation not supported
+                return self._logout_locked(service_name)  # Just remove locally if revocation not supported
             
             # Get the token to revoke
             token = token_data.get('access_token')
             if not token:
                 return False
                 
-            # Build the request data
+            # Build the request data, with service-specific parameters
             data = {
                 'token': token,
-                'client_id': creds.get('client_id'),
-                'client_secret': creds.get('client_secret'),
+                **settings['client_data'],
+                **config.get('revoke_params', {})
             }
             
-            # Add service-specific parameters
-            additional_params = config.get('revoke_params', {})
-            data.update(additional_params)
-            
+            success = False
             try:
-                response = requests.post(revoke_url, data=data)
+                response = self._get_session().post(revoke_url, data=data)
                 success = response.status_code == 200
-                
-                # Remove the token locally regardless of server response
-                self.logout(service_name)
-                
-                return success
             except Exception as e:
                 self.logger.error(f"Error revoking token for {service_name}: {str(e)}")
-                
-                # Still remove the token locally on error
-                self.logout(service_name)
-                
-                return False
+            finally:
+                # Remove the token locally regardless of server response, and on error
+                self._logout_locked(service_name)
+            
+            return success
     
     def get_registered_services(self) -> List[str]:
         """
@@ -707,20 +1210,20 @@ class AuthenticationManager:
         Returns:
             bool: True if expired or no token exists
         """
-        with self.lock:
+        with self._service_lock(service_name).read():
             if service_name not in self.tokens:
                 return True
-                
-            token_data = self.tokens[service_name]
             
-            # Check if token has expiration info
-            if 'expires_at' not in token_data:
-                # Can't determine expiration, assume not expired
-                return False
-                
-            expires_at = token_data['expires_at']
-            if isinstance(expires_at, str):
-                expires_at = datetime.datetime.fromisoformat(expires_at)
-                
-            # Check if token is expired
-            return expires_at <= datetime.datetime.now()
+            # Check if token is expired; tokens without expiration info are assumed not to be
+            return self._expiry_deadline(service_name) <= time.monotonic()
+    
+    def close(self) -> None:
+        """Cancel the scheduled token refreshes and close the pooled connections used for token requests."""
+        with self.lock.write():
+            for service_name in list(self._refresh_timers):
+                self._cancel_refresh(service_name)
+        
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
@@ -2,14 +2,122 @@
 
 import os
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time
+import asyncio
+import random
 import logging
+import threading
+import functools
+import hashlib
 import urllib.parse
+from collections import OrderedDict, deque
 from typing import Dict, List, Any, Optional, Union, Tuple
 import pandas as pd
 import datetime
 
+try:
+    import aiohttp
+    from yarl import URL
+except ImportError:
+    aiohttp = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.json as pa_json
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+
+def _json_loads(data: Union[bytes, str]) -> Any:
+    """Decode JSON with orjson when it's installed, which is much faster on large Graph responses."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(data: Any) -> bytes:
+    """Encode JSON with orjson when it's installed."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data).encode('utf-8')
+
+
+# Typed, so True, 1 and 1.0 don't share an entry
+@functools.lru_cache(maxsize=512, typed=True)
+def _encode_param(key: str, value: Union[str, int, float]) -> str:
+    """URL-encode one query parameter, such as a default field list, once."""
+    return urllib.parse.urlencode({key: value})
+
+
+def _encode_query(params: Dict[str, Any]) -> str:
+    """
+    URL-encode query parameters the way requests does.
+    
+    Parameters set to None are left out and sequences become repeated keys.
+    Scalar parameters are encoded through a cache, as the same ones, like the
+    field lists, are sent with request after request. Access tokens are
+    encoded directly, so the module-level cache never holds one.
+    
+    Args:
+        params: Query parameters
+        
+    Returns:
+        str: Encoded query string
+    """
+    parts = []
+    for key, value in params.items():
+        if value is None:
+            continue
+        if isinstance(value, (str, int, float)) and key != 'access_token':
+            parts.append(_encode_param(key, value))
+        else:
+            parts.append(urllib.parse.urlencode({key: value}, doseq=True))
+    return '&'.join(parts)
+
+
+def _flatten_nested(nested_dict: Dict, flat_dict: Dict, prefix: str) -> None:
+    """Flatten a nested dictionary into flat_dict, under keys starting with prefix."""
+    for key, value in nested_dict.items():
+        if isinstance(value, dict):
+            _flatten_nested(value, flat_dict, f"{prefix}{key}_")
+        elif isinstance(value, list):
+            # For lists, create a string representation
+            flat_dict[prefix + key] = str(value)
+        else:
+            flat_dict[prefix + key] = value
+
+
+def _flatten_record(record: Dict) -> Dict:
+    """
+    Flatten a nested API record into a single-level dictionary.
+    
+    Nested keys are joined with underscores and lists are replaced by their
+    string representation.
+    
+    Args:
+        record: API record
+        
+    Returns:
+        Dict: Flattened record
+    """
+    flat_dict = {}
+    for key, value in record.items():
+        if isinstance(value, dict):
+            _flatten_nested(value, flat_dict, f"{key}_")
+        elif isinstance(value, list):
+            flat_dict[key] = str(value)
+        else:
+            flat_dict[key] = value
+    return flat_dict
+
 
 class FacebookAPI:
     """
@@ -24,11 +132,38 @@ class FacebookAPI:
     # Default API version
     API_VERSION = "v17.0"
     
+    # Most sub-requests the Graph API accepts in one batch request
+    MAX_BATCH_SIZE = 50
+    
+    # Endpoints read like objects whose responses aren't cached, as they depend on when they're asked
+    _UNCACHED_ENDPOINTS = frozenset(['search'])
+    
+    # Fields requested by default, joined once here rather than on every call
+    _DEFAULT_USER_FIELDS = 'id,name,email,picture,link'
+    _DEFAULT_PAGE_FIELDS = 'id,name,about,description,category,fan_count,website,picture'
+    _DEFAULT_SEARCH_FIELDS = 'id,name,category,link'
+    _POST_FIELDS = 'id,message,created_time,attachments,permalink_url,shares,likes.summary(true),comments.summary(true)'
+    _POST_DETAIL_FIELDS = 'id,message,created_time,attachments,permalink_url,shares,likes.summary(true),comments.summary(true),reactions.summary(true)'
+    _COMMENT_FIELDS = 'id,message,created_time,attachment,like_count,comment_count,from'
+    _EVENT_FIELDS = 'id,name,description,start_time,end_time,place,attending_count,interested_count'
+    _ALBUM_FIELDS = 'id,name,description,created_time,count,cover_photo{source}'
+    _PHOTO_FIELDS = 'id,name,images,created_time,place,likes.summary(true),comments.summary(true)'
+    _VIDEO_FIELDS = 'id,title,description,created_time,thumbnail_url,permalink_url,views,likes.summary(true),comments.summary(true)'
+    
+    # Tokens read or written by any instance in this process, by absolute
+    # token path: ((file mtime_ns, size), access token, expiry timestamp or None)
+    _TOKEN_CACHE: Dict[str, Tuple[Tuple[int, int], str, Optional[float]]] = {}
+    _TOKEN_CACHE_LOCK = threading.Lock()
+    
     def __init__(self, app_id: str = "", app_secret: str = "", 
                 redirect_uri: str = "", 
                 token_path: Optional[str] = None,
                 rate_limit: int = 200,
-                version: str = "v17.0"):
+                version: str = "v17.0",
+                refresh_skew_seconds: int = 300,
+                refresh_jitter_seconds: int = 120,
+                cache_ttl: int = 300,
+                cache_size: int = 1024):
         """
         Initialize the Facebook API connector.
         
@@ -39,6 +174,12 @@ class FacebookAPI:
             token_path: Path to save/load authentication tokens
             rate_limit: Requests per hour rate limit
             version: API version
+            refresh_skew_seconds: Extend the token when it expires within this many seconds
+            refresh_jitter_seconds: Random extra seconds added to the skew, so that
+                instances sharing a token don't all extend it at once
+            cache_ttl: Seconds to reuse the response of a GET request for an object,
+                such as a profile or page, 0 to disable
+            cache_size: Maximum number of cached GET responses
         """
         self.app_id = app_id
         self.app_secret = app_secret
@@ -46,16 +187,40 @@ class FacebookAPI:
         self.token_path = token_path
         self.rate_limit = rate_limit
         self.version = version
+        self._url_prefix = f"{self.BASE_URL}/{version}/"
+        self.refresh_skew_seconds = refresh_skew_seconds
+        self.refresh_jitter_seconds = refresh_jitter_seconds
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
         
         self.access_token = None
+        # Unix time the token expires at, None if unknown
         self.token_expiry = None
         self.logger = logging.getLogger(__name__)
         
-        # Rate limiting
-        self.request_timestamps = []
+        # Pooled connections for all requests, so calls after the first reuse
+        # their TCP and TLS connection to the Graph API
+        self._http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=20, pool_maxsize=50, max_retries=0)
+        self._http.mount('http://', adapter)
+        self._http.mount('https://', adapter)
+        
+        # Proactive token extension, see _refresh_token_if_due
+        self._refresh_lock = threading.Lock()
+        self._next_refresh_attempt = 0.0
+        
+        # Cache for GET responses, least recently used first:
+        # (url, query, token digest) -> (monotonic expiry time, encoded response data)
+        self._get_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
+        # Rate limiting: monotonic times of the requests in the last hour, oldest first.
+        # The lock makes checking the window and adding a request one step.
+        self.request_timestamps = deque()
+        self._rate_limit_lock = threading.Lock()
         
         # If token path is provided, try to load existing token
-        if token_path and os.path.exists(token_path):
+        if token_path:
             self.load_token()
     
     def auth_url(self, scopes: List[str]) -> str:
@@ -97,16 +262,16 @@ class FacebookAPI:
                 'code': code
             }
             
-            response = requests.get(self.TOKEN_URL, params=params)
+            response = self._http.get(self.TOKEN_URL, params=params)
             
             if response.status_code == 200:
-                data = response.json()
+                data = _json_loads(response.content)
                 self.access_token = data.get('access_token')
                 
                 # Set token expiry if provided
                 if 'expires_in' in data:
                     expires_in = data.get('expires_in', 0)
-                    self.token_expiry = datetime.datetime.now() + datetime.timedelta(seconds=expires_in)
+                    self.token_expiry = time.time() + expires_in
                 
                 # Save token if path provided
                 if self.token_path:
@@ -114,10 +279,10 @@ class FacebookAPI:
                     
                 return True
             else:
-                self.logger.error(f"Error getting token: {response.text}")
+                self.logger.error("Error getting token: %s", response.text)
                 return False
         except Exception as e:
-            self.logger.error(f"Error getting token: {str(e)}")
+            self.logger.error("Error getting token: %s", e)
             return False
     
     def get_app_token(self) -> bool:
@@ -134,16 +299,16 @@ class FacebookAPI:
                 'grant_type': 'client_credentials'
             }
             
-            response = requests.get(self.TOKEN_URL, params=params)
+            response = self._http.get(self.TOKEN_URL, params=params)
             
             if response.status_code == 200:
-                data = response.json()
+                data = _json_loads(response.content)
                 self.access_token = data.get('access_token')
                 
                 # Set token expiry if provided
                 if 'expires_in' in data:
                     expires_in = data.get('expires_in', 0)
-                    self.token_expiry = datetime.datetime.now() + datetime.timedelta(seconds=expires_in)
+                    self.token_expiry = time.time() + expires_in
                 
                 # Save token if path provided
                 if self.token_path:
@@ -151,10 +316,10 @@ class FacebookAPI:
                     
                 return True
             else:
-                self.logger.error(f"Error getting app token: {response.text}")
+                self.logger.error("Error getting app token: %s", response.text)
                 return False
         except Exception as e:
-            self.logger.error(f"Error getting app token: {str(e)}")
+            self.logger.error("Error getting app token: %s", e)
             return False
     
     def extend_token(self) -> bool:
@@ -175,16 +340,16 @@ class FacebookAPI:
                 'fb_exchange_token': self.access_token
             }
             
-            response = requests.get(f"{self.BASE_URL}/{self.version}/oauth/access_token", params=params)
+            response = self._http.get(self._url_prefix + 'oauth/access_token', params=params)
             
             if response.status_code == 200:
-                data = response.json()
+                data = _json_loads(response.content)
                 self.access_token = data.get('access_token')
                 
                 # Set token expiry if provided
                 if 'expires_in' in data:
                     expires_in = data.get('expires_in', 0)
-                    self.token_expiry = datetime.datetime.now() + datetime.timedelta(seconds=expires_in)
+                    self.token_expiry = time.time() + expires_in
                 
                 # Save token if path provided
                 if self.token_path:
@@ -192,10 +357,10 @@ class FacebookAPI:
                     
                 return True
             else:
-                self.logger.error(f"Error extending token: {response.text}")
+                self.logger.error("Error extending token: %s", response.text)
                 return False
         except Exception as e:
-            self.logger.error(f"Error extending token: {str(e)}")
+            self.logger.error("Error extending token: %s", e)
             return False
     
     def save_token(self) -> bool:
@@ -209,20 +374,35 @@ class FacebookAPI:
             return False
             
         try:
+            token_path = os.path.abspath(self.token_path)
+            
             # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(os.path.abspath(self.token_path)), exist_ok=True)
+            os.makedirs(os.path.dirname(token_path), exist_ok=True)
             
             token_data = {
                 'access_token': self.access_token,
-                'expiry': self.token_expiry.isoformat() if self.token_expiry else None
+                'expiry': self.token_expiry
             }
             
-            with open(self.token_path, 'w') as f:
-                json.dump(token_data, f)
+            if orjson is not None:
+                payload = orjson.dumps(token_data)
+            else:
+                payload = json.dumps(token_data).encode('utf-8')
+            
+            # Write to a temporary file and move it into place, so an
+            # interrupted save can't leave a truncated token file behind
+            with self._TOKEN_CACHE_LOCK:
+                temp_path = token_path + '.tmp'
+                with open(temp_path, 'wb') as f:
+                    f.write(payload)
+                os.replace(temp_path, token_path)
+                
+                stat = os.stat(token_path)
+                self._TOKEN_CACHE[token_path] = ((stat.st_mtime_ns, stat.st_size), self.access_token, self.token_expiry)
                 
             return True
         except Exception as e:
-            self.logger.error(f"Error saving token: {str(e)}")
+            self.logger.error("Error saving token: %s", e)
             return False
     
     def load_token(self) -> bool:
@@ -232,53 +412,120 @@ class FacebookAPI:
         Returns:
             bool: True if successful, False otherwise
         """
-        if not self.token_path or not os.path.exists(self.token_path):
+        if not self.token_path:
             return False
             
         try:
-            with open(self.token_path, 'r') as f:
-                token_data = json.load(f)
+            token_path = os.path.abspath(self.token_path)
+            try:
+                stat = os.stat(token_path)
+            except FileNotFoundError:
+                return False
+            
+            # Reuse the token another instance read or wrote, unless the file changed since
+            with self._TOKEN_CACHE_LOCK:
+                cached = self._TOKEN_CACHE.get(token_path)
+            
+            version = (stat.st_mtime_ns, stat.st_size)
+            if cached is None or cached[0] != version:
+                with open(token_path, 'rb') as f:
+                    token_data = _json_loads(f.read())
+                
+                expiry = token_data.get('expiry')
+                # Older token files keep the expiry as an ISO string
+                if isinstance(expiry, str):
+                    expiry = datetime.datetime.fromisoformat(expiry).timestamp()
                 
-            self.access_token = token_data.get('access_token')
+                cached = (version, token_data.get('access_token'), expiry)
+                with self._TOKEN_CACHE_LOCK:
+                    self._TOKEN_CACHE[token_path] = cached
             
-            expiry_str = token_data.get('expiry')
-            if expiry_str:
-                self.token_expiry = datetime.datetime.fromisoformat(expiry_str)
+            _, self.access_token, expiry = cached
+            
+            if expiry:
+                self.token_expiry = expiry
                 
                 # Check if token is expired
-                if self.token_expiry and self.token_expiry <= datetime.datetime.now():
+                if self.token_expiry <= time.time():
                     self.logger.info("Token expired. Attempting to extend...")
                     return self.extend_token()
             
             return bool(self.access_token)
         except Exception as e:
-            self.logger.error(f"Error loading token: {str(e)}")
+            self.logger.error("Error loading token: %s", e)
             return False
     
-    def _check_rate_limit(self) -> None:
-        """Check rate limit and sleep if necessary."""
-        now = time.time()
+    def _token_needs_refresh(self) -> bool:
+        """Check if the token expires within the refresh skew plus a random jitter."""
+        if not self.token_expiry or time.monotonic() < self._next_refresh_attempt:
+            return False
         
-        # Remove timestamps older than 1 hour
-        self.request_timestamps = [ts for ts in self.request_timestamps if now - ts < 3600]
+        remaining = self.token_expiry - time.time()
+        return remaining < self.refresh_skew_seconds + random.uniform(0, self.refresh_jitter_seconds)
+    
+    def _refresh_token_if_due(self) -> None:
+        """Extend the token before it expires, instead of after a request fails with 401."""
+        if not self._token_needs_refresh():
+            return
         
-        # If we've hit the rate limit, sleep until we can make another request
-        if len(self.request_timestamps) >= self.rate_limit:
-            sleep_time = 3600 - (now - self.request_timestamps[0])
-            if sleep_time > 0:
-                self.logger.info(f"Rate limit reached. Sleeping for {sleep_time:.2f} seconds")
-                time.sleep(sleep_time)
-                # Update the current time after sleeping
-                now = time.time()
+        with self._refresh_lock:
+            # Another thread may have extended the token while we waited
+            if not self._token_needs_refresh():
+                return
+            
+            self.logger.info("Token expires soon. Attempting to extend...")
+            if not self.extend_token():
+                self.logger.info("Token extension failed. Continuing with the current token")
+            
+            # Don't try again on every request if extension fails or keeps the expiry
+            self._next_refresh_attempt = time.monotonic() + 60
+    
+    def _rate_limit_delay(self, now: float, cost: int = 1) -> float:
+        """
+        Get how long to wait before the next request fits in the rate limit.
+        Callers must hold _rate_limit_lock.
+        
+        Args:
+            now: Current time.monotonic() value
+            cost: Number of requests to charge against the rate limit
+            
+        Returns:
+            float: Seconds to wait, 0 or less if a request can be made now
+        """
+        # Remove timestamps older than 1 hour
+        timestamps = self.request_timestamps
+        while timestamps and now - timestamps[0] >= 3600:
+            timestamps.popleft()
         
-        # Add the current timestamp
-        self.request_timestamps.append(now)
+        # Wait until enough of the oldest requests leave the window
+        excess = len(timestamps) + cost - self.rate_limit
+        if excess > 0 and timestamps:
+            oldest = timestamps[min(excess, len(timestamps)) - 1]
+            return 3600 - (now - oldest)
+        return 0
+    
+    def _check_rate_limit(self, cost: int = 1) -> None:
+        """Check rate limit and sleep if necessary."""
+        while True:
+            with self._rate_limit_lock:
+                now = time.monotonic()
+                sleep_time = self._rate_limit_delay(now, cost)
+                if sleep_time <= 0:
+                    # Add the current timestamp
+                    self.request_timestamps.extend([now] * cost)
+                    return
+            
+            # If we've hit the rate limit, sleep until we can make another request;
+            # other threads may take the freed slot first, so check again after
+            self.logger.info("Rate limit reached. Sleeping for %.2f seconds", sleep_time)
+            time.sleep(sleep_time)
     
     def _make_request(self, method: str, endpoint: str, 
                     params: Optional[Dict] = None, 
                     data: Optional[Dict] = None,
                     files: Optional[Dict] = None,
-                    retries: int = 3) -> Tuple[bool, Any]:
+                    retries: int = 3,
+                    cost: int = 1) -> Tuple[bool, Any]:
         """
         Make an API request with rate limiting and retry logic.
         
@@ -289,81 +536,197 @@ class FacebookAPI:
             data: Request data
             files: Files to upload
             retries: Number of retry attempts
+            cost: Number of requests to charge against the rate limit
             
         Returns:
             Tuple[bool, Any]: (Success flag, Response data or error message)
         """
         if not self.access_token:
             return False, "Not authenticated"
+        
+        self._refresh_token_if_due()
             
-        # Prepare the request
-        url = f"{self.BASE_URL}/{self.version}/{endpoint.lstrip('/')}"
+        if method.lower() not in ('get', 'post', 'delete'):
+            return False, f"Unsupported method: {method}"
+            
+        # Prepare the request, encoding the query once for all attempts.
+        # Endpoints are relative; callers strip any leading slash.
+        assert not endpoint.startswith('/'), f"Endpoint with a leading slash: {endpoint}"
+        url = self._url_prefix + endpoint
+        query = _encode_query(params) if params else ''
+        
+        cache_key = self._cache_key(method, endpoint, url, query)
+        if cache_key is not None:
+            cached = self._get_cached(cache_key)
+            if cached is not None:
+                return True, cached
+        
+        success, result = self._execute(method, url, query, data, files, retries, cost)
         
-        # Add access token to params
-        params = params or {}
-        params['access_token'] = self.access_token
+        if cache_key is not None and success:
+            self._set_cached(cache_key, result)
+        elif method.lower() != 'get':
+            self._evict_cached_object(endpoint)
+        return success, result
+    
+    def _execute(self, method: str, url: str, query: str,
+                data: Optional[Dict] = None,
+                files: Optional[Dict] = None,
+                retries: int = 3,
+                cost: int = 1) -> Tuple[bool, Any]:
+        """
+        Send a request with the current access token, handling rate limits and retries.
         
+        Args:
+            method: HTTP method
+            url: Request URL without query
+            query: Encoded query without the access token
+            data: Request data
+            files: Files to upload
+            retries: Number of retry attempts
+            cost: Number of requests to charge against the rate limit
+            
+        Returns:
+            Tuple[bool, Any]: (Success flag, Response data or error message)
+        """
         attempts = 0
         while attempts < retries:
             try:
                 # Check rate limit before making the request
-                self._check_rate_limit()
+                self._check_rate_limit(cost)
                 
-                # Make the request
-                if method.lower() == 'get':
-                    response = requests.get(url, params=params)
-                elif method.lower() == 'post':
-                    response = requests.post(url, params=params, data=data, files=files)
-                elif method.lower() == 'delete':
-                    response = requests.delete(url, params=params)
-                else:
-                    return False, f"Unsupported method: {method}"
+                # Add the access token, which changes if it is extended. requests
+                # appends an encoded query as it is, without parsing it again.
+                response = self._http.request(method.upper(), url, params=self._request_query(query),
+                                              data=data, files=files)
                 
                 # Handle response
                 if response.status_code == 200:
                     try:
-                        return True, response.json()
+                        return True, _json_loads(response.content)
                     except ValueError:
                         return True, response.text
                 elif response.status_code == 401 or response.status_code == 403:
                     # Unauthorized - try to extend token
                     self.logger.info("Token expired or insufficient permissions. Attempting to extend...")
                     if self.extend_token():
-                        # Update the access token in params
-                        params['access_token'] = self.access_token
                         attempts += 1
                         continue
                     else:
                         return False, "Authentication failed and token extension failed"
                 elif response.status_code == 429:
                     # Rate limited - wait and retry
-                    retry_after = int(response.headers.get('Retry-After', 3600))
-                    self.logger.info(f"Rate limited. Waiting for {retry_after} seconds")
-                    time.sleep(retry_after)
+                    time.sleep(self._retry_after(response.headers.get('Retry-After')))
                     attempts += 1
                     continue
                 else:
                     error_msg = f"API error: {response.status_code}"
                     try:
-                        error_data = response.json()
+                        error_data = _json_loads(response.content)
                         error_msg = f"{error_msg} - {error_data}"
                     except:
                         pass
                     return False, error_msg
                     
             except Exception as e:
-                self.logger.error(f"Request error: {str(e)}")
+                self.logger.error("Request error: %s", e)
                 attempts += 1
                 if attempts < retries:
                     # Exponential backoff
                     wait_time = 2 ** attempts
-                    self.logger.info(f"Retrying in {wait_time} seconds...")
+                    self.logger.info("Retrying in %s seconds...", wait_time)
                     time.sleep(wait_time)
                 else:
                     return False, str(e)
         
         return False, "Max retries exceeded"
     
+    def _cache_key(self, method: str, endpoint: str, url: str, query: str) -> Optional[Tuple[str, str, bytes]]:
+        """Get the cache key of a request, or None if its response isn't cached."""
+        if not self.cache_ttl or method.lower() != 'get':
+            return None
+        
+        # Only objects, such as profiles, pages and posts, are cached. Edges,
+        # such as posts, comments or insights, list content that keeps changing.
+        if '/' in endpoint or endpoint in self._UNCACHED_ENDPOINTS:
+            return None
+        
+        # Responses depend on whose token the request is made with, as for 'me'
+        token_digest = hashlib.blake2b(self.access_token.encode('utf-8'), digest_size=16).digest()
+        return url, query, token_digest
+    
+    def _get_cached(self, cache_key: Tuple[str, str, bytes]) -> Any:
+        """Get a cached response, or None if there is none or it has expired."""
+        with self._cache_lock:
+            entry = self._get_cache.get(cache_key)
+            if entry is None:
+                return None
+            
+            if entry[0] <= time.monotonic():
+                del self._get_cache[cache_key]
+                return None
+            
+            self._get_cache.move_to_end(cache_key)
+        
+        # Each caller gets its own copy, decoded from the cached JSON
+        return _json_loads(entry[1])
+    
+    def _set_cached(self, cache_key: Tuple[str, str, bytes], result: Any) -> None:
+        """Cache a response, evicting the least recently used ones over cache_size."""
+        encoded = _json_dumps(result)
+        with self._cache_lock:
+            self._get_cache[cache_key] = (time.monotonic() + self.cache_ttl, encoded)
+            self._get_cache.move_to_end(cache_key)
+            while len(self._get_cache) > self.cache_size:
+                self._get_cache.popitem(last=False)
+    
+    def _evict_cached_object(self, endpoint: str) -> None:
+        """Remove the cached GET responses of the object a write request went to."""
+        url = self._url_prefix + endpoint.lstrip('/').split('/', 1)[0].split('?', 1)[0]
+        with self._cache_lock:
+            for key in [key for key in self._get_cache if key[0] == url]:
+                del self._get_cache[key]
+    
+    def invalidate(self, endpoint_prefix: str = '') -> int:
+        """
+        Remove cached GET responses.
+        
+        Writes made through this connector evict the object they went to.
+        This is the way to see changes made elsewhere before the cached
+        responses expire.
+        
+        Args:
+            endpoint_prefix: Remove responses of endpoints starting with this, all if empty
+            
+        Returns:
+            int: Number of responses removed
+        """
+        url_prefix = self._url_prefix + endpoint_prefix.lstrip('/')
+        with self._cache_lock:
+            keys = [key for key in self._get_cache if key[0].startswith(url_prefix)]
+            for key in keys:
+                del self._get_cache[key]
+        return len(keys)
+    
+    def _retry_after(self, retry_after: Optional[str]) -> int:
+        """Get how many seconds to wait after a 429 response, logging the wait."""
+        if retry_after is None:
+            self.logger.info("Rate limited. Waiting for 3600 seconds")
+            return 3600
+        
+        self.logger.info("Rate limited. Waiting for %s seconds, as requested by Retry-After", retry_after)
+        return int(retry_after)
+    
+    def _request_query(self, query: str) -> str:
+        """Add the access token to an encoded query."""
+        if not self.access_token:
+            return query
+        
+        token_query = urllib.parse.urlencode({'access_token': self.access_token})
+        if query:
+            return f"{query}&{token_query}"
+        return token_query
+    
     def get_user_profile(self, user_id: str = "me", fields: Optional[List[str]] = None) -> Tuple[bool, Dict]:
         """
         Get profile information for a user.
@@ -375,14 +738,11 @@ class FacebookAPI:
         Returns:
             Tuple[bool, Dict]: (Success flag, Profile data or error message)
         """
-        if not fields:
-            fields = ["id", "name", "email", "picture", "link"]
-            
         return self._make_request(
             method='get',
             endpoint=f'{user_id}',
             params={
-                'fields': ','.join(fields)
+                'fields': ','.join(fields) if fields else self._DEFAULT_USER_FIELDS
             }
         )
     
@@ -397,14 +757,11 @@ class FacebookAPI:
         Returns:
             Tuple[bool, Dict]: (Success flag, Page data or error message)
         """
-        if not fields:
-            fields = ["id", "name", "about", "description", "category", "fan_count", "website", "picture"]
-            
         return self._make_request(
             method='get',
             endpoint=f'{page_id}',
             params={
-                'fields': ','.join(fields)
+                'fields': ','.join(fields) if fields else self._DEFAULT_PAGE_FIELDS
             }
         )
     
@@ -425,7 +782,7 @@ class FacebookAPI:
         """
         params = {
             'limit': limit,
-            'fields': 'id,message,created_time,attachments,permalink_url,shares,likes.summary(true),comments.summary(true)'
+            'fields': self._POST_FIELDS
         }
         
         if since:
@@ -453,10 +810,25 @@ class FacebookAPI:
             method='get',
             endpoint=f'{post_id}',
             params={
-                'fields': 'id,message,created_time,attachments,permalink_url,shares,likes.summary(true),comments.summary(true),reactions.summary(true)'
+                'fields': self._POST_DETAIL_FIELDS
             }
         )
     
+    def get_many_posts(self, post_ids: List[str]) -> List[Tuple[bool, Dict]]:
+        """
+        Get detailed information about several posts with batch requests.
+        
+        Args:
+            post_ids: Facebook post IDs
+            
+        Returns:
+            List[Tuple[bool, Dict]]: (Success flag, Post data or error message) for each post, in order
+        """
+        return self.batch_request([
+            {'method': 'get', 'endpoint': post_id, 'params': {'fields': self._POST_DETAIL_FIELDS}}
+            for post_id in post_ids
+        ])
+    
     def get_post_comments(self, post_id: str, limit: int = 25) -> Tuple[bool, Dict]:
         """
         Get comments from a post.
@@ -473,7 +845,7 @@ class FacebookAPI:
             endpoint=f'{post_id}/comments',
             params={
                 'limit': limit,
-                'fields': 'id,message,created_time,attachment,like_count,comment_count,from'
+                'fields': self._COMMENT_FIELDS
             }
         )
     
@@ -489,9 +861,6 @@ class FacebookAPI:
         Returns:
             Tuple[bool, Dict]: (Success flag, Search results or error message)
         """
-        if not fields:
-            fields = ["id", "name", "category", "link"]
-            
         return self._make_request(
             method='get',
             endpoint='search',
@@ -499,7 +868,7 @@ class FacebookAPI:
                 'q': query,
                 'type': 'page',
                 'limit': limit,
-                'fields': ','.join(fields)
+                'fields': ','.join(fields) if fields else self._DEFAULT_SEARCH_FIELDS
             }
         )
     
@@ -553,7 +922,7 @@ class FacebookAPI:
         """
         data = {
             'message': message,
-            'published': json.dumps(published)
+            'published': 'true' if published else 'false'
         }
         
         if link:
@@ -595,7 +964,7 @@ class FacebookAPI:
         """
         params = {
             'limit': limit,
-            'fields': 'id,name,description,start_time,end_time,place,attending_count,interested_count'
+            'fields': self._EVENT_FIELDS
         }
         
         if time_filter:
@@ -623,7 +992,7 @@ class FacebookAPI:
             endpoint=f'{page_id}/albums',
             params={
                 'limit': limit,
-                'fields': 'id,name,description,created_time,count,cover_photo{source}'
+                'fields': self._ALBUM_FIELDS
             }
         )
     
@@ -643,7 +1012,7 @@ class FacebookAPI:
             endpoint=f'{album_id}/photos',
             params={
                 'limit': limit,
-                'fields': 'id,name,images,created_time,place,likes.summary(true),comments.summary(true)'
+                'fields': self._PHOTO_FIELDS
             }
         )
     
@@ -663,10 +1032,101 @@ class FacebookAPI:
             endpoint=f'{page_id}/videos',
             params={
                 'limit': limit,
-                'fields': 'id,title,description,created_time,thumbnail_url,permalink_url,views,likes.summary(true),comments.summary(true)'
+                'fields': self._VIDEO_FIELDS
             }
         )
     
+    def _batch_data(self, calls: List[Dict]) -> Dict[str, str]:
+        """Build the form data of a batch request from a list of calls."""
+        batch = []
+        for call in calls:
+            relative_url = call['endpoint']
+            if call.get('params'):
+                relative_url = f"{relative_url}?{urllib.parse.urlencode(call['params'])}"
+            
+            request = {'method': call['method'].upper(), 'relative_url': relative_url}
+            if call.get('data'):
+                request['body'] = urllib.parse.urlencode(call['data'])
+            batch.append(request)
+        
+        # Sub-response headers aren't used, so don't have them sent
+        return {'batch': json.dumps(batch), 'include_headers': 'false'}
+    
+    def _evict_batch_writes(self, calls: List[Dict]) -> None:
+        """Remove the cached GET responses of the objects written to by batched calls."""
+        for call in calls:
+            if call['method'].lower() != 'get':
+                self._evict_cached_object(call['endpoint'])
+    
+    def _paging_request(self, next_url: str) -> Tuple[str, str]:
+        """
+        Split a paging URL into its URL and query for _execute.
+        
+        Paging URLs carry the access token they were requested with. It is
+        taken out, so the current one is sent, also after it is extended.
+        """
+        url, _, query = next_url.partition('?')
+        if self.access_token:
+            query = '&'.join(part for part in query.split('&')
+                             if part and not part.startswith('access_token='))
+        return url, query
+    
+    def _parse_batch_response(self, calls: List[Dict], success: bool, 
+                            response: Any) -> List[Tuple[bool, Any]]:
+        """Split the response of a batch request into one result per call."""
+        if not success:
+            return [(False, response)] * len(calls)
+        if not isinstance(response, list) or len(response) != len(calls):
+            return [(False, f"Invalid batch response: {response}")] * len(calls)
+        
+        results = []
+        for sub_response in response:
+            # Sub-requests that didn't complete come back as null
+            if not sub_response:
+                results.append((False, "No response"))
+                continue
+            
+            code = sub_response.get('code')
+            try:
+                body = _json_loads(sub_response.get('body') or 'null')
+            except ValueError:
+                body = sub_response.get('body')
+            
+            if code == 200:
+                results.append((True, body))
+            else:
+                results.append((False, f"API error: {code} - {body}"))
+        
+        return results
+    
+    def batch_request(self, calls: List[Dict]) -> List[Tuple[bool, Any]]:
+        """
+        Make several API requests in Graph API batch requests.
+        
+        Calls are sent MAX_BATCH_SIZE at a time, each batch in one HTTP round trip.
+        Every call is charged against the rate limit.
+        
+        Args:
+            calls: Requests to make, each a dict with 'method' and 'endpoint'
+                and optional 'params' and 'data'
+            
+        Returns:
+            List[Tuple[bool, Any]]: (Success flag, Response data or error message) for each call, in order
+        """
+        results = []
+        for i in range(0, len(calls), self.MAX_BATCH_SIZE):
+            chunk = calls[i:i + self.MAX_BATCH_SIZE]
+            success, response = self._make_request(
+                method='post',
+                endpoint='',
+                data=self._batch_data(chunk),
+                cost=len(chunk)
+            )
+            self._evict_batch_writes(chunk)
+            results.extend(self._parse_batch_response(chunk, success, response))
+        
+        return results
+    
     def pagination(self, response: Dict) -> Tuple[bool, Any]:
         """
         Get the next page of results using pagination.
@@ -680,21 +1140,8 @@ class FacebookAPI:
         if not response or 'paging' not in response or 'next' not in response['paging']:
             return False, "No next page available"
             
-        next_url = response['paging']['next']
-        
-        try:
-            # Check rate limit before making the request
-            self._check_rate_limit()
-            
-            # Make the request
-            response = requests.get(next_url)
-            
-            if response.status_code == 200:
-                return True, response.json()
-            else:
-                return False, f"API error: {response.status_code}"
-        except Exception as e:
-            return False, str(e)
+        url, query = self._paging_request(response['paging']['next'])
+        return self._execute('get', url, query)
     
     def get_all_results(self, endpoint: str, params: Dict, 
                       max_results: int = 100, 
@@ -717,7 +1164,7 @@ class FacebookAPI:
         # Make initial request
         success, response = self._make_request(
             method='get',
-            endpoint=endpoint,
+            endpoint=endpoint.lstrip('/'),
             params=params
         )
         
@@ -752,6 +1199,68 @@ class FacebookAPI:
             
         return True, all_data
     
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self._http.close()
+    
+    def results_to_arrow(self, results: Dict, schema: Optional[Any] = None) -> Any:
+        """
+        Convert API results to a pyarrow Table.
+        
+        Records are parsed by pyarrow's JSON reader straight into columns;
+        nested objects become struct columns and lists become list columns.
+        
+        Args:
+            results: API response data
+            schema: pyarrow.Schema for the columns; inferred if not given
+            
+        Returns:
+            pyarrow.Table: Data in columnar format
+        """
+        if pa is None:
+            raise ImportError("results_to_arrow requires the pyarrow package")
+        
+        try:
+            if not results or not results.get('data'):
+                return schema.empty_table() if schema is not None else pa.table({})
+            
+            if orjson is not None:
+                lines = [orjson.dumps(record) for record in results['data']]
+            else:
+                lines = [json.dumps(record).encode('utf-8') for record in results['data']]
+            
+            # A record may not straddle two of the blocks the reader splits the input into
+            read_options = pa_json.ReadOptions(block_size=max(1 << 20, max(map(len, lines)) + 1))
+            parse_options = pa_json.ParseOptions(explicit_schema=schema) if schema is not None else None
+            
+            return pa_json.read_json(pa.BufferReader(b'\n'.join(lines)),
+                                     read_options=read_options,
+                                     parse_options=parse_options)
+        except Exception as e:
+            self.logger.error("Error converting to Arrow: %s", e)
+            return pa.table({})
+    
+    def results_to_parquet(self, results: Dict, path: str, schema: Optional[Any] = None) -> bool:
+        """
+        Write API results to a Parquet file.
+        
+        Args:
+            results: API response data
+            path: Parquet file path
+            schema: pyarrow.Schema for the columns; inferred if not given
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        table = self.results_to_arrow(results, schema)
+        
+        try:
+            pq.write_table(table, path)
+            return True
+        except Exception as e:
+            self.logger.error("Error writing Parquet file: %s", e)
+            return False
+    
     def results_to_dataframe(self, results: Dict, 
                           flatten: bool = True) -> pd.DataFrame:
         """
@@ -772,30 +1281,377 @@ class FacebookAPI:
             
             if flatten:
                 # Flatten nested structures
-                flattened = []
-                for item in data:
-                    flat_item = {}
-                    self._flatten_dict(item, flat_item)
-                    flattened.append(flat_item)
-                return pd.DataFrame(flattened)
+                return pd.DataFrame([_flatten_record(item) for item in data])
             else:
                 return pd.DataFrame(data)
         except Exception as e:
-            self.logger.error(f"Error converting to DataFrame: {str(e)}")
+            self.logger.error("Error converting to DataFrame: %s", e)
             return pd.DataFrame()
+
+
+class AsyncFacebookAPI(FacebookAPI):
+    """
+    Asynchronous Facebook Graph API connector.
+    
+    Runs requests over one pooled aiohttp session, so many Graph calls can be in
+    flight at once with asyncio.gather. All the Graph methods inherited from
+    FacebookAPI return coroutines here; the token methods stay synchronous.
+    Use it as an async context manager or call close() when done.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        """
+        Initialize the asynchronous Facebook API connector.
+        
+        Takes the same arguments as FacebookAPI.
+        """
+        super().__init__(*args, **kwargs)
+        
+        # Created on the first request, see _get_session
+        self._session = None
+    
+    async def __aenter__(self) -> 'AsyncFacebookAPI':
+        self._get_session()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+    
+    def _get_session(self) -> Any:
+        """Get the shared aiohttp session, creating it on first use."""
+        if self._session is None:
+            if aiohttp is None:
+                raise ImportError("AsyncFacebookAPI requires the aiohttp package")
+            
+            connector = aiohttp.TCPConnector(limit=50, limit_per_host=10, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(connector=connector)
+        
+        return self._session
+    
+    async def close(self) -> None:
+        """Close the shared aiohttp session and the pooled connections of the token methods."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        
+        super().close()
+    
+    async def _check_rate_limit(self, cost: int = 1) -> None:
+        """Check rate limit and wait without blocking the event loop if necessary."""
+        while True:
+            with self._rate_limit_lock:
+                now = time.monotonic()
+                sleep_time = self._rate_limit_delay(now, cost)
+                if sleep_time <= 0:
+                    self.request_timestamps.extend([now] * cost)
+                    return
+            
+            # Other requests may take the freed slot while we sleep, so check again after
+            self.logger.info("Rate limit reached. Sleeping for %.2f seconds", sleep_time)
+            await asyncio.sleep(sleep_time)
     
-    def _flatten_dict(self, nested_dict: Dict, flat_dict: Dict, prefix: str = '') -> None:
-        """Recursively flatten a nested dictionary."""
-        for key, value in nested_dict.items():
-            if prefix:
-                new_key = f"{prefix}_{key}"
+    @staticmethod
+    def _form_data(data: Optional[Dict], files: Optional[Dict]) -> Any:
+        """Build the request body, a multipart form if files are uploaded."""
+        if not files:
+            return data
+        
+        form = aiohttp.FormData(data or {})
+        for name, value in files.items():
+            # Accept requests-style (filename, fileobj, ...) tuples
+            if isinstance(value, tuple):
+                form.add_field(name, value[1], filename=value[0])
             else:
-                new_key = key
+                form.add_field(name, value)
+        return form
+    
+    async def _make_request(self, method: str, endpoint: str, 
+                          params: Optional[Dict] = None, 
+                          data: Optional[Dict] = None,
+                          files: Optional[Dict] = None,
+                          retries: int = 3,
+                          cost: int = 1) -> Tuple[bool, Any]:
+        """
+        Make an API request with rate limiting and retry logic.
+        
+        Args:
+            method: HTTP method
+            endpoint: API endpoint
+            params: Query parameters
+            data: Request data
+            files: Files to upload
+            retries: Number of retry attempts
+            cost: Number of requests to charge against the rate limit
+            
+        Returns:
+            Tuple[bool, Any]: (Success flag, Response data or error message)
+        """
+        if not self.access_token:
+            return False, "Not authenticated"
+        
+        method = method.lower()
+        if method not in ('get', 'post', 'delete'):
+            return False, f"Unsupported method: {method}"
+        
+        if self._token_needs_refresh():
+            await asyncio.get_running_loop().run_in_executor(None, self._refresh_token_if_due)
+            
+        # Prepare the request, encoding the query once for all attempts.
+        # Endpoints are relative; callers strip any leading slash.
+        assert not endpoint.startswith('/'), f"Endpoint with a leading slash: {endpoint}"
+        url = self._url_prefix + endpoint
+        query = _encode_query(params) if params else ''
+        
+        cache_key = self._cache_key(method, endpoint, url, query)
+        if cache_key is not None:
+            cached = self._get_cached(cache_key)
+            if cached is not None:
+                return True, cached
+        
+        success, result = await self._execute(method, url, query, data, files, retries, cost)
+        
+        if cache_key is not None and success:
+            self._set_cached(cache_key, result)
+        elif method != 'get':
+            self._evict_cached_object(endpoint)
+        return success, result
+    
+    async def _execute(self, method: str, url: str, query: str,
+                      data: Optional[Dict] = None,
+                      files: Optional[Dict] = None,
+                      retries: int = 3,
+                      cost: int = 1) -> Tuple[bool, Any]:
+        """
+        Send a request with the current access token, handling rate limits and retries.
+        
+        Args:
+            method: HTTP method
+            url: Request URL without query
+            query: Encoded query without the access token
+            data: Request data
+            files: Files to upload
+            retries: Number of retry attempts
+            cost: Number of requests to charge against the rate limit
+            
+        Returns:
+            Tuple[bool, Any]: (Success flag, Response data or error message)
+        """
+        session = self._get_session()
+        
+        attempts = 0
+        while attempts < retries:
+            try:
+                # Check rate limit before making the request
+                await self._check_rate_limit(cost)
                 
-            if isinstance(value, dict):
-                self._flatten_dict(value, flat_dict, new_key)
-            elif isinstance(value, list):
-                # For lists, create a string representation
-                flat_dict[new_key] = str(value)
-            else:
-                flat_dict[new_key] = value
+                # Make the request; the form is rebuilt as aiohttp consumes it.
+                # The URL is already encoded, so yarl doesn't need to requote it.
+                request_query = self._request_query(query)
+                request_url = URL(f"{url}?{request_query}" if request_query else url, encoded=True)
+                async with session.request(method, request_url,
+                                           data=self._form_data(data, files)) as response:
+                    status = response.status
+                    retry_after = response.headers.get('Retry-After')
+                    body = await response.read()
+                    charset = response.charset
+                
+                # Handle response
+                if status == 200:
+                    try:
+                        return True, _json_loads(body)
+                    except ValueError:
+                        return True, body.decode(charset or 'utf-8', errors='replace')
+                elif status == 401 or status == 403:
+                    # Unauthorized - try to extend token, off the event loop
+                    self.logger.info("Token expired or insufficient permissions. Attempting to extend...")
+                    if await asyncio.get_running_loop().run_in_executor(None, self.extend_token):
+                        attempts += 1
+                        continue
+                    else:
+                        return False, "Authentication failed and token extension failed"
+                elif status == 429:
+                    # Rate limited - wait and retry
+                    await asyncio.sleep(self._retry_after(retry_after))
+                    attempts += 1
+                    continue
+                else:
+                    error_msg = f"API error: {status}"
+                    try:
+                        error_data = _json_loads(body)
+                        error_msg = f"{error_msg} - {error_data}"
+                    except ValueError:
+                        pass
+                    return False, error_msg
+                    
+            except Exception as e:
+                self.logger.error("Request error: %s", e)
+                attempts += 1
+                if attempts < retries:
+                    # Exponential backoff
+                    wait_time = 2 ** attempts
+                    self.logger.info("Retrying in %s seconds...", wait_time)
+                    await asyncio.sleep(wait_time)
+                else:
+                    return False, str(e)
+        
+        return False, "Max retries exceeded"
+    
+    async def batch_request(self, calls: List[Dict]) -> List[Tuple[bool, Any]]:
+        """
+        Make several API requests in Graph API batch requests.
+        
+        Calls are sent MAX_BATCH_SIZE at a time, with the batches in flight
+        concurrently. Every call is charged against the rate limit.
+        
+        Args:
+            calls: Requests to make, each a dict with 'method' and 'endpoint'
+                and optional 'params' and 'data'
+            
+        Returns:
+            List[Tuple[bool, Any]]: (Success flag, Response data or error message) for each call, in order
+        """
+        chunks = [calls[i:i + self.MAX_BATCH_SIZE] for i in range(0, len(calls), self.MAX_BATCH_SIZE)]
+        responses = await asyncio.gather(*(
+            self._make_request(method='post', endpoint='', data=self._batch_data(chunk), cost=len(chunk))
+            for chunk in chunks
+        ))
+        
+        results = []
+        for chunk, (success, response) in zip(chunks, responses):
+            self._evict_batch_writes(chunk)
+            results.extend(self._parse_batch_response(chunk, success, response))
+        return results
+    
+    async def pagination(self, response: Dict) -> Tuple[bool, Any]:
+        """
+        Get the next page of results using pagination.
+        
+        Args:
+            response: Previous API response
+            
+        Returns:
+            Tuple[bool, Any]: (Success flag, Next page data or error message)
+        """
+        if not response or 'paging' not in response or 'next' not in response['paging']:
+            return False, "No next page available"
+            
+        return await self._get_page(response['paging']['next'])
+    
+    async def _get_page(self, page_url: str) -> Tuple[bool, Any]:
+        """Get a page of results from a paging URL."""
+        url, query = self._paging_request(page_url)
+        return await self._execute('get', url, query)
+    
+    @staticmethod
+    def _prefetch_urls(next_url: str, pages: int, remaining: int) -> List[str]:
+        """
+        Get the URLs of the next pages when they can be known in advance.
+        
+        Offset-paginated next URLs are advanced by their limit. Cursors are
+        opaque, so for cursor pagination only next_url itself is returned.
+        
+        Args:
+            next_url: Next page URL from the previous response
+            pages: Most pages to return
+            remaining: Number of results still wanted
+            
+        Returns:
+            List[str]: Page URLs, starting with next_url
+        """
+        parts = urllib.parse.urlsplit(next_url)
+        query = urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+        values = dict(query)
+        
+        try:
+            offset = int(values['offset'])
+            limit = int(values['limit'])
+        except (KeyError, ValueError):
+            return [next_url]
+        
+        if limit <= 0:
+            return [next_url]
+        
+        # Don't fetch pages beyond the results still wanted
+        pages = min(pages, -(-remaining // limit))
+        
+        urls = [next_url]
+        for i in range(1, pages):
+            page_query = [(key, str(offset + i * limit) if key == 'offset' else value) for key, value in query]
+            urls.append(urllib.parse.urlunsplit(parts._replace(query=urllib.parse.urlencode(page_query))))
+        return urls
+    
+    async def get_all_results(self, endpoint: str, params: Dict, 
+                            max_results: int = 100, 
+                            max_pages: int = 10,
+                            prefetch: int = 4) -> Tuple[bool, List[Dict]]:
+        """
+        Get all paginated results from an API endpoint.
+        
+        With offset pagination, up to prefetch pages are requested concurrently.
+        Cursor pagination is followed one page at a time.
+        
+        Args:
+            endpoint: API endpoint
+            params: Query parameters
+            max_results: Maximum number of results to return
+            max_pages: Maximum number of pages to fetch
+            prefetch: Most pages to request at once
+            
+        Returns:
+            Tuple[bool, List[Dict]]: (Success flag, Combined results or error message)
+        """
+        all_data = []
+        page_count = 0
+        
+        # Make initial request
+        success, response = await self._make_request(
+            method='get',
+            endpoint=endpoint.lstrip('/'),
+            params=params
+        )
+        
+        if not success:
+            return False, response
+            
+        # Extract data
+        if 'data' in response:
+            all_data.extend(response['data'])
+            
+        # Continue pagination until we reach max_results or max_pages
+        while (len(all_data) < max_results and 
+              page_count < max_pages and 
+              'paging' in response and 
+              'next' in response['paging']):
+            
+            # Get the next pages, concurrently when their URLs are known
+            page_urls = self._prefetch_urls(response['paging']['next'],
+                                            min(prefetch, max_pages - page_count),
+                                            max_results - len(all_data))
+            pages = await asyncio.gather(*(self._get_page(page_url) for page_url in page_urls))
+            
+            done = False
+            for success, page in pages:
+                if not success:
+                    done = True
+                    break
+                
+                response = page
+                
+                # Extract data
+                if 'data' in response:
+                    all_data.extend(response['data'])
+                    
+                page_count += 1
+                
+                # Pages prefetched past the last one are dropped
+                if 'next' not in response.get('paging', {}):
+                    break
+            
+            if done:
+                break
+            
+        # Trim to max_results if needed
+        if len(all_data) > max_results:
+            all_data = all_data[:max_results]
+            
+        return True, all_data
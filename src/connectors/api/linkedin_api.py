@@ -2,14 +2,53 @@
 
 import os
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time
+import asyncio
 import logging
+import threading
+from collections import deque
 from typing import Dict, List, Any, Optional, Union, Tuple
 import pandas as pd
 from requests_oauthlib import OAuth2Session
 from oauthlib.oauth2 import BackendApplicationClient
 
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+def _flatten_nested(nested_dict: Dict, flat_dict: Dict, prefix: str) -> None:
+    """Flatten a nested dictionary into flat_dict, under keys starting with prefix."""
+    for key, value in nested_dict.items():
+        if isinstance(value, dict):
+            _flatten_nested(value, flat_dict, f"{prefix}{key}_")
+        elif isinstance(value, list):
+            # For lists, create a string representation
+            flat_dict[prefix + key] = str(value)
+        else:
+            flat_dict[prefix + key] = value
+
+
+def _flatten_element(element: Dict) -> Dict:
+    """
+    Flatten a nested API element into a single-level dictionary.
+    
+    Nested keys are joined with underscores and lists are replaced by their
+    string representation.
+    
+    Args:
+        element: API element
+        
+    Returns:
+        Dict: Flattened element
+    """
+    flat_dict = {}
+    _flatten_nested(element, flat_dict, '')
+    return flat_dict
+
 
 class LinkedInAPI:
     """
@@ -48,8 +87,14 @@ class LinkedInAPI:
         self.token = None
         self.logger = logging.getLogger(__name__)
         
-        # Rate limiting
-        self.request_timestamps = []
+        # Rate limiting; the lock makes checking the window and adding a request one step
+        self.request_timestamps = deque(maxlen=self.rate_limit)
+        self._rate_limit_lock = threading.Lock()
+        
+        # Cached token expiry, see _refresh_with_lock
+        self._token_lock = threading.Lock()
+        self._token_expiry = 0.0
+        self._next_refresh_attempt = 0.0
         
         # If token path is provided, try to load existing token
         if token_path and os.path.exists(token_path):
@@ -74,6 +119,22 @@ class LinkedInAPI:
         auth_url, state = oauth.authorization_url(self.AUTH_URL)
         return auth_url
     
+    def _install_adapter(self, session: OAuth2Session) -> OAuth2Session:
+        """
+        Mount a pooled adapter on a session so connections are kept alive between requests.
+        
+        Args:
+            session: Session to configure
+            
+        Returns:
+            OAuth2Session: The same session
+        """
+        pool_size = max(10, self.rate_limit)
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=pool_size, max_retries=0)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+    
     def get_token_from_code(self, code: str) -> bool:
         """
         Exchange authorization code for access token.
@@ -85,10 +146,10 @@ class LinkedInAPI:
             bool: True if successful, False otherwise
         """
         try:
-            oauth = OAuth2Session(
+            oauth = self._install_adapter(OAuth2Session(
                 client_id=self.client_id,
                 redirect_uri=self.redirect_uri
-            )
+            ))
             
             self.token = oauth.fetch_token(
                 token_url=self.TOKEN_URL,
@@ -98,6 +159,7 @@ class LinkedInAPI:
             
             # Create authenticated session
             self.session = oauth
+            self._update_token_expiry()
             
             # Save token if path provided
             if self.token_path:
@@ -117,7 +179,7 @@ class LinkedInAPI:
         """
         try:
             client = BackendApplicationClient(client_id=self.client_id)
-            oauth = OAuth2Session(client=client)
+            oauth = self._install_adapter(OAuth2Session(client=client))
             
             self.token = oauth.fetch_token(
                 token_url=self.TOKEN_URL,
@@ -127,6 +189,7 @@ class LinkedInAPI:
             
             # Create authenticated session
             self.session = oauth
+            self._update_token_expiry()
             
             # Save token if path provided
             if self.token_path:
@@ -174,10 +237,11 @@ class LinkedInAPI:
                 self.token = json.load(f)
                 
             # Create authenticated session
-            self.session = OAuth2Session(
+            self.session = self._install_adapter(OAuth2Session(
                 client_id=self.client_id,
                 token=self.token
-            )
+            ))
+            self._update_token_expiry()
             
             return True
         except Exception as e:
@@ -195,11 +259,13 @@ class LinkedInAPI:
             return False
             
         try:
-            # Create a new session for the refresh
-            oauth = OAuth2Session(
-                client_id=self.client_id,
-                token=self.token
-            )
+            # Refresh on the current session to keep its pooled connections
+            oauth = self.session
+            if oauth is None:
+                oauth = self._install_adapter(OAuth2Session(
+                    client_id=self.client_id,
+                    token=self.token
+                ))
             
             self.token = oauth.refresh_token(
                 token_url=self.TOKEN_URL,
@@ -210,6 +276,7 @@ class LinkedInAPI:
             
             # Update the session
             self.session = oauth
+            self._update_token_expiry()
             
             # Save the new token
             if self.token_path:
@@ -220,24 +287,88 @@ class LinkedInAPI:
             self.logger.error(f"Error refreshing token: {str(e)}")
             return False
     
-    def _check_rate_limit(self) -> None:
-        """Check rate limit and sleep if necessary."""
-        now = time.time()
+    def _update_token_expiry(self) -> None:
+        """Cache when the current access token expires, as a Unix timestamp."""
+        expires_at = self.token.get('expires_at')
+        if not expires_at:
+            expires_at = time.time() + float(self.token.get('expires_in', 3600))
+        self._token_expiry = float(expires_at)
+    
+    def _token_due(self) -> bool:
+        """Check if the cached token expiry is less than a minute away."""
+        return (self._token_expiry - time.time() < 60 and
+                time.monotonic() >= self._next_refresh_attempt)
+    
+    def _refresh_with_lock(self, stale_token: Optional[Dict] = None) -> bool:
+        """
+        Refresh the access token once, however many requests need it at the same time.
         
+        Args:
+            stale_token: Token a request was rejected with. If given, the token is
+                refreshed unless another request has already replaced it.
+                Otherwise it is refreshed only if the cached expiry is due.
+            
+        Returns:
+            bool: True if there is a current token to use, False if the refresh failed
+        """
+        with self._token_lock:
+            # Another request may have refreshed the token while we waited
+            if stale_token is not None and self.token is not stale_token:
+                return True
+            if stale_token is None and not self._token_due():
+                return True
+            
+            # Don't try again on every request if refreshing keeps failing
+            if time.monotonic() < self._next_refresh_attempt:
+                return False
+            
+            self.logger.info("Refreshing access token...")
+            if self.refresh_token():
+                return True
+            
+            self._next_refresh_attempt = time.monotonic() + 60
+            return False
+    
+    def _rate_limit_delay(self, now: float) -> float:
+        """
+        Get how long to wait before the next request fits in the rate limit.
+        Callers must hold _rate_limit_lock.
+        
+        Args:
+            now: Current time
+            
+        Returns:
+            float: Seconds to wait, 0 if a request can be made now
+        """
         # Remove timestamps older than 1 minute
-        self.request_timestamps = [ts for ts in self.request_timestamps if now - ts < 60]
-        
-        # If we've hit the rate limit, sleep until we can make another request
-        if len(self.request_timestamps) >= self.rate_limit:
-            sleep_time = 60 - (now - self.request_timestamps[0])
-            if sleep_time > 0:
-                self.logger.info(f"Rate limit reached. Sleeping for {sleep_time:.2f} seconds")
-                time.sleep(sleep_time)
-                # Update the current time after sleeping
-                now = time.time()
+        timestamps = self.request_timestamps
+        while timestamps and now - timestamps[0] >= 60:
+            timestamps.popleft()
         
-        # Add the current timestamp
-        self.request_timestamps.append(now)
+        if len(timestamps) >= self.rate_limit:
+            return 60 - (now - timestamps[0])
+        return 0
+    
+    def close(self) -> None:
+        """Close the pooled connections."""
+        if self.session is not None:
+            self.session.close()
+    
+    def _check_rate_limit(self) -> None:
+        """Check rate limit and sleep if necessary."""
+        while True:
+            with self._rate_limit_lock:
+                now = time.time()
+                sleep_time = self._rate_limit_delay(now)
+                if sleep_time <= 0:
+                    # Add the current timestamp
+                    self.request_timestamps.append(now)
+                    return
+            
+            # If we've hit the rate limit, sleep until we can make another request;
+            # other threads may take the freed slot first, so check again after
+            self.logger.info(f"Rate limit reached. Sleeping for {sleep_time:.2f} seconds")
+            time.sleep(sleep_time)
     
     def _make_request(self, method: str, endpoint: str, 
                     params: Optional[Dict] = None, 
@@ -260,6 +391,10 @@ class LinkedInAPI:
         """
         if not self.session or not self.token:
             return False, "Not authenticated"
+        
+        # Refresh ahead of expiry instead of after a request fails
+        if self._token_due():
+            self._refresh_with_lock()
             
         # Prepare the request
         url = f"{self.BASE_URL}/{endpoint.lstrip('/')}"
@@ -276,6 +411,7 @@ class LinkedInAPI:
                 self._check_rate_limit()
                 
                 # Make the request
+                token = self.token
                 if method.lower() == 'get':
                     response = self.session.get(url, params=params, headers=headers)
                 elif method.lower() == 'post':
@@ -294,9 +430,9 @@ class LinkedInAPI:
                     except ValueError:
                         return True, response.text
                 elif response.status_code == 401:
-                    # Unauthorized - try to refresh token
+                    # Unauthorized - refresh the token unless another request already has
                     self.logger.info("Token expired. Attempting to refresh...")
-                    if self.refresh_token():
+                    if self._refresh_with_lock(token):
                         attempts += 1
                         continue
                     else:
@@ -663,34 +799,13 @@ class LinkedInAPI:
             
             if flatten:
                 # Flatten nested structures
-                flattened = []
-                for element in elements:
-                    flat_element = {}
-                    self._flatten_dict(element, flat_element)
-                    flattened.append(flat_element)
-                return pd.DataFrame(flattened)
+                return pd.DataFrame([_flatten_element(element) for element in elements])
             else:
                 return pd.DataFrame(elements)
         except Exception as e:
             self.logger.error(f"Error converting to DataFrame: {str(e)}")
             return pd.DataFrame()
     
-    def _flatten_dict(self, nested_dict: Dict, flat_dict: Dict, prefix: str = '') -> None:
-        """Recursively flatten a nested dictionary."""
-        for key, value in nested_dict.items():
-            if prefix:
-                new_key = f"{prefix}_{key}"
-            else:
-                new_key = key
-                
-            if isinstance(value, dict):
-                self._flatten_dict(value, flat_dict, new_key)
-            elif isinstance(value, list):
-                # For lists, create a string representation
-                flat_dict[new_key] = str(value)
-            else:
-                flat_dict[new_key] = value
-    
     def get_company_employees(self, company_id: str, 
                            start: int = 0, 
                            count: int = 10) -> Tuple[bool, Dict]:
@@ -776,3 +891,268 @@ class LinkedInAPI:
                 break
         
         return True, all_results
+
+
+class AsyncLinkedInAPI(LinkedInAPI):
+    """
+    Asynchronous LinkedIn API connector.
+    
+    Runs requests over one pooled aiohttp session, so many API calls can be in
+    flight at once with asyncio.gather. All the endpoint methods inherited from
+    LinkedInAPI return coroutines here; the OAuth methods stay synchronous.
+    Use it as an async context manager or call close() when done.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        """
+        Initialize the asynchronous LinkedIn API connector.
+        
+        Takes the same arguments as LinkedInAPI.
+        """
+        super().__init__(*args, **kwargs)
+        
+        # Created on the first request, see _get_session
+        self._aio_session = None
+    
+    async def __aenter__(self) -> 'AsyncLinkedInAPI':
+        self._get_session()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+    
+    def _get_session(self) -> Any:
+        """Get the shared aiohttp session, creating it on first use."""
+        if self._aio_session is None:
+            if aiohttp is None:
+                raise ImportError("AsyncLinkedInAPI requires the aiohttp package")
+            
+            connector = aiohttp.TCPConnector(limit_per_host=64, ttl_dns_cache=300)
+            self._aio_session = aiohttp.ClientSession(connector=connector)
+        
+        return self._aio_session
+    
+    async def close(self) -> None:
+        """Close the shared aiohttp session and the pooled connections of the OAuth methods."""
+        if self._aio_session is not None:
+            await self._aio_session.close()
+            self._aio_session = None
+        
+        super().close()
+    
+    async def _check_rate_limit(self) -> None:
+        """Check rate limit and wait without blocking the event loop if necessary."""
+        while True:
+            with self._rate_limit_lock:
+                now = time.time()
+                sleep_time = self._rate_limit_delay(now)
+                if sleep_time <= 0:
+                    self.request_timestamps.append(now)
+                    return
+            
+            # Other requests may take the freed slot while we sleep, so check again after
+            self.logger.info(f"Rate limit reached. Sleeping for {sleep_time:.2f} seconds")
+            await asyncio.sleep(sleep_time)
+    
+    async def _make_request(self, method: str, endpoint: str, 
+                          params: Optional[Dict] = None, 
+                          data: Optional[Dict] = None,
+                          headers: Optional[Dict] = None,
+                          retries: int = 3) -> Tuple[bool, Any]:
+        """
+        Make an API request with rate limiting and retry logic.
+        
+        Args:
+            method: HTTP method
+            endpoint: API endpoint
+            params: Query parameters
+            data: Request data
+            headers: Additional headers
+            retries: Number of retry attempts
+            
+        Returns:
+            Tuple[bool, Any]: (Success flag, Response data or error message)
+        """
+        if not self.token:
+            return False, "Not authenticated"
+        
+        method = method.lower()
+        if method not in ('get', 'post', 'put', 'delete'):
+            return False, f"Unsupported method: {method}"
+        
+        # Refresh ahead of expiry, off the event loop
+        if self._token_due():
+            await asyncio.get_running_loop().run_in_executor(None, self._refresh_with_lock)
+            
+        # Prepare the request
+        url = f"{self.BASE_URL}/{endpoint.lstrip('/')}"
+        headers = headers or {}
+        
+        # Add default headers
+        if 'Content-Type' not in headers:
+            headers['Content-Type'] = 'application/json'
+        
+        session = self._get_session()
+        
+        attempts = 0
+        while attempts < retries:
+            try:
+                # Check rate limit before making the request
+                await self._check_rate_limit()
+                
+                # Make the request. The token is read on every attempt so a
+                # refreshed one is picked up.
+                token = self.token
+                request_headers = dict(headers)
+                request_headers['Authorization'] = f"Bearer {token.get('access_token', '')}"
+                async with session.request(method, url, params=params,
+                                           json=data if method in ('post', 'put') else None,
+                                           headers=request_headers) as response:
+                    status = response.status
+                    retry_after = response.headers.get('Retry-After', 60)
+                    body = await response.text()
+                
+                # Handle response
+                if status == 200:
+                    try:
+                        return True, json.loads(body)
+                    except ValueError:
+                        return True, body
+                elif status == 401:
+                    # Unauthorized - refresh the token unless another request
+                    # already has, off the event loop
+                    self.logger.info("Token expired. Attempting to refresh...")
+                    if await asyncio.get_running_loop().run_in_executor(None, self._refresh_with_lock, token):
+                        attempts += 1
+                        continue
+                    else:
+                        return False, "Authentication failed and token refresh failed"
+                elif status == 429:
+                    # Rate limited - wait and retry
+                    retry_after = int(retry_after)
+                    self.logger.info(f"Rate limited. Waiting for {retry_after} seconds")
+                    await asyncio.sleep(retry_after)
+                    attempts += 1
+                    continue
+                else:
+                    error_msg = f"API error: {status}"
+                    try:
+                        error_data = json.loads(body)
+                        error_msg = f"{error_msg} - {error_data}"
+                    except ValueError:
+                        pass
+                    return False, error_msg
+                    
+            except Exception as e:
+                self.logger.error(f"Request error: {str(e)}")
+                attempts += 1
+                if attempts < retries:
+                    # Exponential backoff
+                    wait_time = 2 ** attempts
+                    self.logger.info(f"Retrying in {wait_time} seconds...")
+                    await asyncio.sleep(wait_time)
+                else:
+                    return False, str(e)
+        
+        return False, "Max retries exceeded"
+    
+    async def share_update(self, text: str, 
+                         visibility: str = "PUBLIC") -> Tuple[bool, Dict]:
+        """
+        Share an update on LinkedIn.
+        
+        Args:
+            text: Update text
+            visibility: Post visibility ('PUBLIC', 'CONNECTIONS', or 'PRIVATE')
+            
+        Returns:
+            Tuple[bool, Dict]: (Success flag, Response data or error message)
+        """
+        success, profile = await self.get_profile()
+        if not success:
+            return False, profile
+        
+        data = {
+            'owner': f'urn:li:person:{profile.get("id")}',
+            'text': {
+                'text': text
+            },
+            'distribution': {
+                'linkedInDistributionTarget': {
+                    'visibleToGuest': visibility == 'PUBLIC',
+                    'visibleToConnections': visibility != 'PRIVATE'
+                }
+            }
+        }
+        
+        return await self._make_request(
+            method='post',
+            endpoint='/shares',
+            data=data
+        )
+    
+    async def get_pagination_results(self, endpoint: str, 
+                                  params: Dict, 
+                                  max_results: int = 100,
+                                  prefetch: int = 4) -> Tuple[bool, List[Dict]]:
+        """
+        Get paginated results from an API endpoint.
+        
+        Pages are addressed by start offset, so up to prefetch of them are
+        requested concurrently.
+        
+        Args:
+            endpoint: API endpoint
+            params: Base parameters for the request
+            max_results: Maximum number of results to return
+            prefetch: Most pages to request at once
+            
+        Returns:
+            Tuple[bool, List[Dict]]: (Success flag, Combined results or error message)
+        """
+        all_results = []
+        start = params.get('start', 0)
+        count = min(params.get('count', 10), 100)  # LinkedIn max is 100 per page
+        
+        if count <= 0:
+            return True, all_results
+        
+        while len(all_results) < max_results:
+            # Lay out the next pages up to max_results
+            pages = []
+            page_start = start
+            remaining = max_results - len(all_results)
+            while remaining > 0 and len(pages) < max(1, prefetch):
+                current_params = params.copy()
+                current_params['start'] = page_start
+                current_params['count'] = min(count, remaining)
+                pages.append(current_params)
+                page_start += current_params['count']
+                remaining -= current_params['count']
+            
+            # Make the requests
+            responses = await asyncio.gather(*(
+                self._make_request(method='get', endpoint=endpoint, params=page_params)
+                for page_params in pages
+            ))
+            
+            for success, response in responses:
+                if not success:
+                    return False, response
+                
+                # Extract and append elements
+                if 'elements' not in response:
+                    # No elements found
+                    return True, all_results
+                
+                elements = response['elements']
+                all_results.extend(elements)
+                
+                # Check if we've reached the end; prefetched pages past it are dropped
+                if len(elements) < count:
+                    return True, all_results
+                
+                # Update start for next page
+                start += len(elements)
+        
+        return True, all_results
@@ -0,0 +1,77 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+# Loaded by path: src/connectors/api is not a package
+_MODULE_PATH = (
+    Path(__file__).resolve().parents[2] / "src" / "connectors" / "api" / "auth_manager.py"
+)
+_spec = importlib.util.spec_from_file_location("auth_manager", _MODULE_PATH)
+auth_manager = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(auth_manager)
+
+
+class TestAuthenticationManager:
+    @pytest.mark.parametrize("expires_in, expected_delay", [
+        (3600, 3300),
+        (300, 150),
+        (10, 30),
+        (-60, 30),
+    ])
+    def test_schedule_refresh_delay(self, expires_in, expected_delay):
+        manager = auth_manager.AuthenticationManager()
+        try:
+            manager._process_and_store_token("s", {
+                "access_token": "access",
+                "refresh_token": "refresh",
+                "expires_in": expires_in,
+            })
+
+            timer = manager._refresh_timers["s"]
+            assert timer.interval == pytest.approx(expected_delay, abs=1)
+        finally:
+            manager.close()
+
+    def test_schedule_refresh_needs_refresh_token(self):
+        manager = auth_manager.AuthenticationManager()
+        try:
+            manager._process_and_store_token("s", {"access_token": "access", "expires_in": 300})
+
+            assert "s" not in manager._refresh_timers
+        finally:
+            manager.close()
+
+    def test_encrypted_token_round_trip(self, temp_output_dir):
+        key = auth_manager.Fernet.generate_key()
+        token = {"access_token": "access", "token_type": "bearer"}
+        manager = auth_manager.AuthenticationManager(storage_dir=str(temp_output_dir),
+                                                     encrypt_tokens=True, encryption_key=key)
+        manager._process_and_store_token("s", dict(token))
+        assert manager._save_token("s")
+
+        stored = (temp_output_dir / "s_token.json").read_text()
+        assert "access" not in stored
+
+        reloaded = auth_manager.AuthenticationManager(storage_dir=str(temp_output_dir),
+                                                      encrypt_tokens=True, encryption_key=key)
+        assert reloaded._load_token("s")
+        assert reloaded.tokens["s"] == token
+
+    def test_encrypted_token_wrong_key_not_loaded(self, temp_output_dir):
+        manager = auth_manager.AuthenticationManager(
+            storage_dir=str(temp_output_dir), encrypt_tokens=True,
+            encryption_key=auth_manager.Fernet.generate_key())
+        manager._process_and_store_token("s", {"access_token": "access"})
+        assert manager._save_token("s")
+
+        other = auth_manager.AuthenticationManager(
+            storage_dir=str(temp_output_dir), encrypt_tokens=True,
+            encryption_key=auth_manager.Fernet.generate_key())
+        assert not other._load_token("s")
+        assert "s" not in other.tokens
+
+    def test_encryption_requires_key(self, temp_output_dir):
+        with pytest.raises(ValueError):
+            auth_manager.AuthenticationManager(storage_dir=str(temp_output_dir),
+                                               encrypt_tokens=True)